@@ -0,0 +1,5 @@
+from django.contrib import admin
+from .models import PendingDeletion, Upload
+
+admin.site.register(PendingDeletion)
+admin.site.register(Upload)
@@ -0,0 +1,12 @@
+from django.apps import AppConfig
+from django.conf import settings
+
+
+class AssetsConfig(AppConfig):
+    name = "assets"
+
+    def ready(self):
+        # Bound decoding in workers to the same limit as uploads
+        from PIL import Image  # pylint: disable=C0415
+
+        Image.MAX_IMAGE_PIXELS = settings.UPLOAD_MAX_PIXELS
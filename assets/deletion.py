@@ -0,0 +1,141 @@
+"""
+Background deletion of stored files through an outbox table
+"""
+
+# stdlib
+import threading
+import time
+from datetime import timedelta
+
+# django
+from django.apps import apps
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.utils import timezone
+
+# library
+from sorl.thumbnail import default
+from sorl.thumbnail.images import ImageFile
+
+# app
+from rrc import tasks
+from .fields import HashedImageField
+from .models import PendingDeletion
+
+BATCH_SIZE = 1000
+
+_schedule_lock = threading.Lock()
+# Monotonic time the next scheduled run starts
+_next_run = 0.0
+
+
+def delete_later(*names: str):
+    """
+    Queues stored files for deletion once the current transaction commits
+
+    The queue rows are written in the current transaction, so they roll back
+    with it and are never lost after a commit. Only processing the queue
+    waits for the commit.
+    """
+    names = sorted({name for name in names if name})
+    if not names:
+        return
+    PendingDeletion.objects.bulk_create([PendingDeletion(name=name) for name in names])
+    transaction.on_commit(schedule_deletions)
+
+
+def schedule_deletions():
+    """
+    Schedules a background run for names queued now once they are old enough
+
+    Runs start twice the grace period away, so a single run covers every name
+    queued by this process until it is due
+    """
+    global _next_run  # pylint: disable=W0603
+    grace = settings.FILE_DELETION_GRACE_SECONDS
+    now = time.monotonic()
+    with _schedule_lock:
+        if _next_run > now + grace:
+            return
+        _next_run = now + 2 * grace
+    tasks.defer_later(2 * grace, process_deletions)
+
+
+def referenced_names(names: {str}) -> {str}:
+    """
+    Returns the names still used by any content-addressed image field
+    """
+    referenced = set()
+    for model in apps.get_models():
+        for field in model._meta.concrete_fields:
+            if isinstance(field, HashedImageField):
+                query = model._default_manager.filter(**{f"{field.name}__in": names})
+                referenced.update(query.values_list(field.name, flat=True))
+    return referenced
+
+
+def thumbnail_names(name: str) -> [str]:
+    """
+    Returns the stored thumbnails of a source image from sorl's key value store
+
+    sorl only deletes thumbnails one storage request at a time, so their names
+    are read from its store to be deleted with their sources
+    """
+    kvstore = default.kvstore
+    keys = kvstore._get(ImageFile(name).key, identity="thumbnails") or []
+    thumbnails = (kvstore._get(key) for key in keys)
+    return [thumbnail.name for thumbnail in thumbnails if thumbnail]
+
+
+def forget_thumbnails(name: str):
+    """
+    Removes a source image and its thumbnails from sorl's key value store
+    """
+    source = ImageFile(name)
+    kvstore = default.kvstore
+    for key in kvstore._get(source.key, identity="thumbnails") or []:
+        kvstore._delete(key)
+    kvstore._delete(source.key, identity="thumbnails")
+    kvstore._delete(source.key)
+
+
+def delete_files(names: [str]):
+    """
+    Deletes stored files with as few storage requests as possible
+    """
+    if hasattr(default_storage, "delete_many"):
+        default_storage.delete_many(names)
+        return
+    for name in names:
+        default_storage.delete(name)
+
+
+def process_deletions(batch_size: int = BATCH_SIZE) -> int:
+    """
+    Deletes queued files and their thumbnails in batches
+
+    Files that are referenced again, like a repeated upload of the same
+    content, are kept. Names queued within FILE_DELETION_GRACE_SECONDS are
+    left for a later run, so a save that reused the file before it was queued
+    has committed its reference. Returns the number of queued names processed.
+    """
+    grace = timedelta(seconds=settings.FILE_DELETION_GRACE_SECONDS)
+    count = 0
+    while True:
+        queued = PendingDeletion.objects.filter(created__lte=timezone.now() - grace)
+        batch = list(queued.order_by("pk")[:batch_size])
+        if not batch:
+            return count
+        names = {pending.name for pending in batch}
+        names -= referenced_names(names)
+        files = list(names)
+        for name in names:
+            files += thumbnail_names(name)
+        delete_files(files)
+        for name in names:
+            forget_thumbnails(name)
+        PendingDeletion.objects.filter(
+            pk__in=[pending.pk for pending in batch]
+        ).delete()
+        count += len(batch)
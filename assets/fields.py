@@ -0,0 +1,132 @@
+"""
+Content-addressed image fields
+"""
+
+# stdlib
+import hashlib
+import posixpath
+
+# django
+from django.db.models.fields.files import (
+    FieldFile,
+    ImageFieldFile,
+    ImageFileDescriptor,
+)
+from django.db.models.signals import post_delete, post_save
+
+# library
+from sorl.thumbnail import ImageField
+
+# app
+from .models import PendingDeletion
+
+
+def content_name(content, filename: str) -> str:
+    """
+    Returns a filename made from a hash of the file's content
+
+    The original extension is kept in lowercase
+    """
+    digest = hashlib.sha256()
+    for chunk in content.chunks():
+        digest.update(chunk)
+    content.seek(0)
+    ext = posixpath.splitext(filename)[1].lower()
+    return f"{digest.hexdigest()[:32]}{ext}"
+
+
+def fan_out(filename: str) -> str:
+    """
+    Nests a hashed filename in two directory levels named from its first
+    characters so no single directory grows too large
+    """
+    return posixpath.join(filename[:2], filename[2:4], filename)
+
+
+class HashedImageFieldFile(ImageFieldFile):
+    """
+    Image file saved under a name made from its content
+
+    Saving the same content again reuses the stored file, so a file can be
+    shared by several objects. Replaced and deleted files are queued for
+    background deletion, which keeps any file still in use. A file already
+    queued for deletion is not reused, since it may be deleted before this
+    object is saved.
+    """
+
+    def save(self, name: str, content, save: bool = True):
+        if self._committed:
+            self.field.record_replaced(self.instance, self.name)
+        name = content_name(content, name)
+        stored = self.field.generate_filename(self.instance, name)
+        queued = PendingDeletion.objects.filter(name=stored).exists()
+        if queued or not self.storage.exists(stored):
+            super().save(name, content, save)
+            return
+        self.name = stored
+        setattr(self.instance, self.field.name, self.name)
+        self._committed = True
+        if save:
+            self.instance.save()
+
+    def delete(self, save: bool = True):
+        if not self:
+            return
+        # Queued for deletion once the object no longer refers to it
+        self.field.record_replaced(self.instance, self.name)
+        self.close()
+        self.name = None
+        setattr(self.instance, self.field.name, self.name)
+        self._committed = False
+        if save:
+            self.instance.save()
+
+
+class HashedImageFileDescriptor(ImageFileDescriptor):
+    """
+    Remembers the stored file an assignment replaces
+    """
+
+    def __set__(self, instance, value):
+        previous = instance.__dict__.get(self.field.name)
+        super().__set__(instance, value)
+        if isinstance(previous, FieldFile):
+            previous = previous.name if previous._committed else None
+        if previous and previous != getattr(value, "name", value):
+            self.field.record_replaced(instance, previous)
+
+
+class HashedImageField(ImageField):
+    """
+    Image field storing files under content-hash names
+
+    The upload_to function is passed the hashed filename. Files are deleted in
+    the background when they are replaced or their object is deleted.
+    """
+
+    attr_class = HashedImageFieldFile
+    descriptor_class = HashedImageFileDescriptor
+
+    def contribute_to_class(self, cls, name: str, **kwargs):
+        super().contribute_to_class(cls, name, **kwargs)
+        if not cls._meta.abstract:
+            post_save.connect(self.delete_replaced, sender=cls)
+            post_delete.connect(self.delete_stored, sender=cls)
+
+    def record_replaced(self, instance, name: str):
+        """
+        Tracks a replaced file to delete once the object is saved
+        """
+        replaced = instance.__dict__.setdefault("_replaced_files", {})
+        replaced.setdefault(self.name, set()).add(name)
+
+    def delete_replaced(self, instance, **kwargs):
+        from .deletion import delete_later  # pylint: disable=C0415
+
+        replaced = instance.__dict__.get("_replaced_files", {}).pop(self.name, set())
+        delete_later(*replaced - {getattr(instance, self.attname).name})
+
+    def delete_stored(self, instance, **kwargs):
+        from .deletion import delete_later  # pylint: disable=C0415
+
+        delete_later(getattr(instance, self.attname).name)
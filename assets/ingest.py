@@ -0,0 +1,129 @@
+"""
+Normalizes uploaded photos before they are served
+"""
+
+# stdlib
+from io import BytesIO
+
+# django
+from django.apps import apps
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage, get_storage_class
+
+# library
+from PIL import Image, ImageOps
+
+# app
+from rrc import tasks
+from .deletion import delete_later
+from .similarity import dhash, duplicate_scope, find_duplicate
+from .thumbnails import generate_thumbnails, queue_thumbnails
+
+
+def webp_field(field_name: str) -> str:
+    """
+    Returns the name of the field storing an image field's WebP variant
+    """
+    return f"{field_name}_webp"
+
+
+def normalize_image(data: bytes) -> Image.Image:
+    """
+    Returns an upright RGB image no larger than INGEST_MAX_DIMENSION
+    """
+    image = Image.open(BytesIO(data))
+    icc_profile = image.info.get("icc_profile")
+    image = ImageOps.exif_transpose(image)
+    if image.mode in ("RGBA", "LA", "P"):
+        image = image.convert("RGBA")
+        background = Image.new("RGB", image.size, (255, 255, 255))
+        background.paste(image, mask=image.getchannel("A"))
+        image = background
+    elif image.mode != "RGB":
+        image = image.convert("RGB")
+    size = settings.INGEST_MAX_DIMENSION
+    image.thumbnail((size, size), Image.LANCZOS)
+    # Everything else including EXIF is dropped when re-encoding
+    image.info = {"icc_profile": icc_profile} if icc_profile else {}
+    return image
+
+
+def encode_image(image: Image.Image, fmt: str) -> ContentFile:
+    """
+    Re-encodes a normalized image without metadata other than its color profile
+    """
+    output = BytesIO()
+    options = {"icc_profile": image.info.get("icc_profile")}
+    if fmt == "JPEG":
+        options.update(
+            quality=settings.INGEST_JPEG_QUALITY, optimize=True, progressive=True
+        )
+    else:
+        options.update(quality=settings.INGEST_WEBP_QUALITY, method=4)
+    image.save(output, fmt, **{k: v for k, v in options.items() if v is not None})
+    return ContentFile(output.getvalue())
+
+
+def keep_original(name: str, data: bytes):
+    """
+    Copies an uploaded original to INGEST_ORIGINALS_STORAGE if one is set
+    """
+    if not settings.INGEST_ORIGINALS_STORAGE:
+        return
+    storage = get_storage_class(settings.INGEST_ORIGINALS_STORAGE)()
+    storage.save(name, ContentFile(data))
+
+
+def ingest_image(label: str, pk: int, field_name: str, name: str):
+    """
+    Replaces an uploaded image with a normalized JPEG and WebP variant
+
+    Both are stored under content-hash names. A perceptual hash is saved and
+    the photo is flagged if it nearly matches another in its gallery. The row
+    is only updated if the object still has the same image. Thumbnails are
+    generated from the normalized image afterwards.
+    """
+    instance = apps.get_model(label).objects.filter(pk=pk).first()
+    if instance is None or getattr(instance, field_name).name != name:
+        return
+    with default_storage.open(name) as stored:
+        data = stored.read()
+    image = normalize_image(data)
+    keep_original(name, data)
+    jpeg = getattr(instance, field_name)
+    jpeg.save("image.jpg", encode_image(image, "JPEG"), save=False)
+    webp = getattr(instance, webp_field(field_name))
+    webp.save("image.webp", encode_image(image, "WEBP"), save=False)
+    jpeg_name, webp_name = jpeg.name, webp.name
+    image_hash = dhash(image)
+    query = type(instance).objects.filter(pk=pk, **{field_name: name})
+    updated = query.update(
+        **{
+            field_name: jpeg_name,
+            webp_field(field_name): webp_name,
+            "image_hash": image_hash,
+            "duplicate_of": find_duplicate(duplicate_scope(instance), image_hash),
+        }
+    )
+    if not updated:
+        delete_later(jpeg_name, webp_name)
+        return
+    if name != jpeg_name:
+        delete_later(name)
+    generate_thumbnails(label, pk, field_name, jpeg_name)
+
+
+def queue_ingest(instance, field_name: str):
+    """
+    Queues a new upload for ingest in the process pool
+
+    Images that were already ingested only have their thumbnails checked
+    """
+    image = getattr(instance, field_name)
+    if not image or getattr(instance, webp_field(field_name)):
+        queue_thumbnails(instance, field_name)
+        return
+    tasks.defer_process(
+        ingest_image, instance._meta.label, instance.pk, field_name, image.name
+    )
@@ -0,0 +1,71 @@
+"""
+Computes perceptual hashes for photos ingested before they were stored
+"""
+
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand
+from PIL import Image
+from casts.models import CastPhoto
+from users.models import UserPhoto
+from ...similarity import HashIndex, dhash
+
+
+class Command(BaseCommand):
+    help = "Stores missing photo hashes in batches and flags near-duplicates"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500)
+
+    def handle(self, *args, **options):
+        for model in (CastPhoto, UserPhoto):
+            count = 0
+            last = 0
+            while True:
+                batch = list(
+                    model.objects.filter(pk__gt=last, image_hash=None)
+                    .exclude(image="")
+                    .order_by("pk")
+                    .only("pk", model.DUPLICATE_SCOPE, "image")[: options["batch_size"]]
+                )
+                if not batch:
+                    break
+                last = batch[-1].pk
+                for photo in batch:
+                    photo.image_hash = self.hash_image(photo.image.name)
+                model.objects.bulk_update(batch, ["image_hash"])
+                # Flag against photos hashed before this batch or earlier in it
+                indexes = self.gallery_indexes(model, batch)
+                scope = f"{model.DUPLICATE_SCOPE}_id"
+                for photo in batch:
+                    if photo.image_hash is None:
+                        continue
+                    index = indexes[getattr(photo, scope)]
+                    photo.duplicate_of_id = index.find(photo.image_hash, photo.pk)
+                model.objects.bulk_update(batch, ["duplicate_of"])
+                count += len(batch)
+            self.stdout.write(f"Hashed {count} {model._meta.verbose_name_plural}")
+
+    def gallery_indexes(self, model, batch: list) -> {int: HashIndex}:
+        """Returns hash indexes of the galleries of a batch from one query"""
+        scope = f"{model.DUPLICATE_SCOPE}_id"
+        galleries = {getattr(photo, scope) for photo in batch}
+        rows = (
+            model.objects.filter(**{f"{scope}__in": galleries}, pk__lte=batch[-1].pk)
+            .exclude(image_hash=None)
+            .values_list(scope, "pk", "image_hash")
+        )
+        indexes = {gallery: HashIndex() for gallery in galleries}
+        for gallery, pk, value in rows.iterator():
+            indexes[gallery].add(pk, value)
+        return indexes
+
+    def hash_image(self, name: str) -> int:
+        """Returns the hash of a stored image or None if it cannot be read"""
+        try:
+            with default_storage.open(name) as data, Image.open(data) as image:
+                # JPEGs can decode at a fraction of their size
+                image.draft("L", (64, 64))
+                return dhash(image)
+        except OSError:
+            self.stderr.write(f"Could not read {name}")
+            return None
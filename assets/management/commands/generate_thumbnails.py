@@ -0,0 +1,28 @@
+"""
+Queues thumbnail generation for images uploaded before they were pre-generated
+"""
+
+from django.core.management.base import BaseCommand
+from casts.models import Cast, CastPhoto
+from users.models import Profile, UserPhoto
+from ...thumbnails import queue_thumbnails, thumbnail_field
+
+IMAGE_FIELDS = (
+    (Cast, "logo"),
+    (CastPhoto, "image"),
+    (Profile, "image"),
+    (UserPhoto, "image"),
+)
+
+
+class Command(BaseCommand):
+    help = "Generates missing thumbnails for existing images"
+
+    def handle(self, *args, **options):
+        for model, field_name in IMAGE_FIELDS:
+            query = model.objects.exclude(**{field_name: ""}).only(
+                "pk", field_name, thumbnail_field(field_name)
+            )
+            for instance in query.iterator():
+                queue_thumbnails(instance, field_name)
+            self.stdout.write(f"Queued {model._meta.verbose_name_plural}")
@@ -0,0 +1,35 @@
+"""
+Queues ingest for photos that never received their WebP variant
+"""
+
+from django.core.management.base import BaseCommand
+from casts.models import CastPhoto
+from users.models import UserPhoto
+from ...ingest import queue_ingest, webp_field
+
+
+class Command(BaseCommand):
+    help = "Re-queues ingest in batches for photos missing a WebP variant"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500)
+
+    def handle(self, *args, **options):
+        webp = webp_field("image")
+        for model in (CastPhoto, UserPhoto):
+            count = 0
+            last = 0
+            while True:
+                batch = list(
+                    model.objects.filter(pk__gt=last, **{webp: ""})
+                    .exclude(image="")
+                    .order_by("pk")
+                    .only("pk", "image", webp)[: options["batch_size"]]
+                )
+                if not batch:
+                    break
+                last = batch[-1].pk
+                for photo in batch:
+                    queue_ingest(photo, "image")
+                count += len(batch)
+            self.stdout.write(f"Queued {count} {model._meta.verbose_name_plural}")
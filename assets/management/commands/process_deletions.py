@@ -0,0 +1,17 @@
+"""
+Deletes queued files left over if a background worker stopped
+"""
+
+from django.core.management.base import BaseCommand
+from ...deletion import BATCH_SIZE, process_deletions
+
+
+class Command(BaseCommand):
+    help = "Deletes files queued for deletion in batches"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        count = process_deletions(options["batch_size"])
+        self.stdout.write(f"Processed {count} queued deletions")
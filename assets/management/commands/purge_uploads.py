@@ -0,0 +1,22 @@
+"""
+Removes chunked uploads that were never finished
+"""
+
+from datetime import timedelta
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from ...models import Upload
+
+
+class Command(BaseCommand):
+    help = "Deletes unfinished uploads older than UPLOAD_EXPIRY_HOURS"
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(hours=settings.UPLOAD_EXPIRY_HOURS)
+        count = 0
+        for upload in Upload.objects.filter(created__lt=cutoff).iterator():
+            upload.delete_files()
+            upload.delete()
+            count += 1
+        self.stdout.write(f"Deleted {count} expired uploads")
@@ -0,0 +1,16 @@
+# Generated by Django 3.0.14 on 2026-10-18 01:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [("assets", "0001_upload")]
+
+    operations = [
+        migrations.AddField(
+            model_name="upload",
+            name="name",
+            field=models.CharField(blank=True, max_length=255),
+        ),
+    ]
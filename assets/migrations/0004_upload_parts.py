@@ -0,0 +1,16 @@
+# Generated by Django 3.0.14 on 2026-10-18 02:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [("assets", "0003_pendingdeletion")]
+
+    operations = [
+        migrations.AddField(
+            model_name="upload",
+            name="parts",
+            field=models.TextField(blank=True, editable=False),
+        ),
+    ]
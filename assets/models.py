@@ -0,0 +1,138 @@
+"""
+Asset upload models
+"""
+
+# stdlib
+import json
+import posixpath
+import uuid
+from shutil import copyfileobj
+from tempfile import NamedTemporaryFile
+
+# django
+from django.contrib.auth.models import User
+from django.core.files import File
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import models
+from django.utils import timezone
+
+
+class PartConflict(ValueError):
+    """
+    Raised when another request stored a part at the same offset first
+    """
+
+
+class Upload(models.Model):
+    """
+    A file being uploaded in parts which can be resumed after an interruption,
+    or directly to storage with a presigned URL
+
+    Parts are kept in the default storage until the upload is assembled
+    """
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="uploads")
+    kind = models.CharField(max_length=32)
+    target_id = models.PositiveIntegerField()
+    filename = models.CharField(max_length=255)
+    size = models.PositiveIntegerField()
+    received = models.PositiveIntegerField(default=0)
+    # JSON list of the stored part names in upload order
+    parts = models.TextField(blank=True, editable=False)
+    # Storage name of a file uploaded directly to storage instead of in parts
+    name = models.CharField(max_length=255, blank=True)
+    created = models.DateTimeField(default=timezone.now, editable=False)
+
+    def __str__(self) -> str:
+        return f"{self.filename} ({self.received}/{self.size})"
+
+    @property
+    def complete(self) -> bool:
+        return self.received == self.size
+
+    @property
+    def part_directory(self) -> str:
+        return posixpath.join("uploads", str(self.pk))
+
+    def part_names(self) -> [str]:
+        """
+        Returns the stored part names in upload order
+        """
+        return json.loads(self.parts) if self.parts else []
+
+    def stored_names(self) -> [str]:
+        """
+        Returns every file stored for the upload's parts
+
+        Includes parts stored by attempts that were never acknowledged
+        """
+        try:
+            _, files = default_storage.listdir(self.part_directory)
+        except FileNotFoundError:
+            return []
+        return [posixpath.join(self.part_directory, name) for name in files]
+
+    def add_part(self, offset: int, data: bytes):
+        """
+        Stores the next part of the upload starting at the given byte offset
+        """
+        if offset != self.received:
+            raise ValueError(f"Expected a part starting at byte {self.received}")
+        if not data:
+            raise ValueError("Upload parts cannot be empty")
+        if offset + len(data) > self.size:
+            raise ValueError(f"Upload is larger than the expected {self.size} bytes")
+        name = posixpath.join(self.part_directory, f"{offset:012d}")
+        # Storage picks another name if a retry of the part is still being sent
+        name = default_storage.save(name, ContentFile(data))
+        received = offset + len(data)
+        parts = json.dumps(self.part_names() + [name])
+        updated = Upload.objects.filter(pk=self.pk, received=offset).update(
+            received=received, parts=parts
+        )
+        if not updated:
+            default_storage.delete(name)
+            raise PartConflict("Another part was uploaded at the same offset")
+        self.received = received
+        self.parts = parts
+
+    def assemble(self) -> File:
+        """
+        Returns the complete upload in a temporary file
+
+        Parts are copied one at a time so the file is never held in memory
+        """
+        if not self.complete:
+            raise ValueError(f"Only {self.received} of {self.size} bytes uploaded")
+        output = NamedTemporaryFile(suffix=posixpath.splitext(self.filename)[1])
+        for name in self.part_names():
+            with default_storage.open(name) as part:
+                copyfileobj(part, output)
+        if output.tell() != self.size:
+            output.close()
+            raise ValueError("Uploaded parts are missing")
+        output.seek(0)
+        return File(output, name=self.filename)
+
+    def delete_files(self):
+        """
+        Removes every stored part or the directly uploaded file
+        """
+        for name in self.stored_names():
+            default_storage.delete(name)
+        if self.name:
+            default_storage.delete(self.name)
+
+
+class PendingDeletion(models.Model):
+    """
+    A stored file to delete in the background once nothing refers to it
+    """
+
+    name = models.CharField(max_length=255)
+    created = models.DateTimeField(default=timezone.now, editable=False)
+
+    def __str__(self) -> str:
+        return self.name
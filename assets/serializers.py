@@ -0,0 +1,54 @@
+"""
+Serializer fields for uploaded assets
+"""
+
+from django.conf import settings
+from rest_framework.serializers import (
+    BooleanField,
+    ModelSerializer,
+    ReadOnlyField,
+    SerializerMethodField,
+)
+from .models import Upload
+from .thumbnails import thumbnail_urls
+
+
+class ThumbnailsField(ReadOnlyField):
+    """
+    Read-only mapping of size name to thumbnail URL for an image field
+
+    Empty until the thumbnails have been generated
+    """
+
+    def get_attribute(self, instance) -> {str: str}:
+        urls = thumbnail_urls(instance, self.source)
+        request = self.context.get("request")
+        if request is not None:
+            urls = {size: request.build_absolute_uri(url) for size, url in urls.items()}
+        return urls
+
+
+class UploadSerializer(ModelSerializer):
+    """
+    A serializer for the assets.Upload model
+    """
+
+    part_size = SerializerMethodField()
+    direct = BooleanField(default=False, write_only=True)
+
+    class Meta:
+        model = Upload
+        fields = (
+            "id",
+            "filename",
+            "size",
+            "received",
+            "part_size",
+            "direct",
+            "created",
+        )
+        read_only_fields = ("id", "received", "created")
+
+    def get_part_size(self, instance: Upload) -> int:
+        """Returns the largest accepted part in bytes"""
+        return settings.UPLOAD_PART_BYTES
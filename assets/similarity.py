@@ -0,0 +1,145 @@
+"""
+Perceptual hashing to find near-duplicate photos
+"""
+
+# django
+from django.conf import settings
+from django.db.models import F, Q
+
+# library
+from PIL import Image, ImageOps
+
+HASH_SIZE = 8
+
+
+def dhash(image: Image.Image) -> int:
+    """
+    Returns a 64-bit difference hash of an image as a signed integer
+
+    Each bit records whether a pixel of a small grayscale copy is brighter than
+    its right neighbor, so re-encoded or resized copies hash alike. The EXIF
+    orientation is applied first, so originals hash like their ingested copies.
+    """
+    small = (
+        ImageOps.exif_transpose(image)
+        .convert("L")
+        .resize((HASH_SIZE + 1, HASH_SIZE), Image.BOX)
+    )
+    pixels = list(small.getdata())
+    value = 0
+    for row in range(HASH_SIZE):
+        for col in range(HASH_SIZE):
+            left = pixels[row * (HASH_SIZE + 1) + col]
+            value = value << 1 | (left > pixels[row * (HASH_SIZE + 1) + col + 1])
+    # Stored in a signed 64-bit column
+    return value - (1 << 64) if value >= 1 << 63 else value
+
+
+def hamming(first: int, second: int) -> int:
+    """
+    Returns the number of bits that differ between two hashes
+    """
+    return bin((first ^ second) & ((1 << 64) - 1)).count("1")
+
+
+def signed(value: int) -> int:
+    """
+    Returns a 64-bit hash or mask as stored in a signed 64-bit column
+    """
+    value &= (1 << 64) - 1
+    return value - (1 << 64) if value >= 1 << 63 else value
+
+
+def band_masks() -> [int]:
+    """
+    Returns masks splitting hashes into PHOTO_DUPLICATE_DISTANCE + 1 bands
+
+    Hashes within PHOTO_DUPLICATE_DISTANCE bits of each other have at least
+    one band in common
+    """
+    count = settings.PHOTO_DUPLICATE_DISTANCE + 1
+    width = -(-64 // count)
+    return [signed(((1 << width) - 1) << (i * width)) for i in range(count)]
+
+
+class HashIndex:
+    """
+    In-memory index of photo hashes by band to find near-duplicates
+
+    Only photos sharing a band with a hash are compared with it, instead of
+    every photo in the gallery
+    """
+
+    def __init__(self, rows: "Iterable[(int, int)]" = ()):
+        self.masks = band_masks()
+        self.buckets = {}
+        self.hashes = {}
+        for pk, value in rows:
+            self.add(pk, value)
+
+    def add(self, pk: int, value: int):
+        """
+        Adds a photo's hash to the index
+        """
+        self.hashes[pk] = value
+        for mask in self.masks:
+            self.buckets.setdefault((mask, value & mask), set()).add(pk)
+
+    def find(self, value: int, before: int = None) -> int:
+        """
+        Returns the pk of an exact or else the first near match or None
+
+        Only photos with a pk lower than before are matched if it's given
+        """
+        candidates = set()
+        for mask in self.masks:
+            candidates |= self.buckets.get((mask, value & mask), set())
+        if before is not None:
+            candidates = {pk for pk in candidates if pk < before}
+        limit = settings.PHOTO_DUPLICATE_DISTANCE
+        matches = sorted(
+            (self.hashes[pk] != value, pk)
+            for pk in candidates
+            if hamming(value, self.hashes[pk]) <= limit
+        )
+        return matches[0][1] if matches else None
+
+
+def find_duplicate(query: "QuerySet", value: int, field: str = "image_hash") -> int:
+    """
+    Returns the pk of a photo in the query within PHOTO_DUPLICATE_DISTANCE bits
+    of the hash or None
+
+    Exact matches are found through the hash index. Otherwise only photos
+    sharing a band with the hash are read from the database and compared.
+    """
+    exact = query.filter(**{field: value}).values_list("pk", flat=True).first()
+    if exact is not None:
+        return exact
+    limit = settings.PHOTO_DUPLICATE_DISTANCE
+    bands = {f"band_{i}": mask for i, mask in enumerate(band_masks())}
+    shared = Q()
+    for name, mask in bands.items():
+        shared |= Q(**{name: signed(value & mask)})
+    candidates = (
+        query.annotate(**{name: F(field).bitand(mask) for name, mask in bands.items()})
+        .filter(shared)
+        .values_list("pk", field)
+    )
+    for pk, other in candidates.order_by("pk").iterator():
+        if hamming(value, other) <= limit:
+            return pk
+    return None
+
+
+def duplicate_scope(instance) -> "QuerySet":
+    """
+    Returns the other photos in the same gallery as a photo
+
+    Models name their gallery foreign key in DUPLICATE_SCOPE
+    """
+    scope = type(instance).DUPLICATE_SCOPE
+    query = type(instance).objects.filter(
+        **{f"{scope}_id": getattr(instance, f"{scope}_id")}
+    )
+    return query.exclude(pk=instance.pk)
@@ -0,0 +1,210 @@
+# stdlib
+import posixpath
+from datetime import timedelta
+from io import StringIO
+from shutil import rmtree
+from unittest.mock import patch
+
+# django
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+# library
+from rest_framework import status
+from rest_framework.test import APIClient
+
+# app
+from casts.models import Cast, CastPhoto
+from users.models import UserPhoto
+from .test_ingest import make_upload
+from ..models import PartConflict, Upload
+
+
+@override_settings(UPLOAD_PART_BYTES=1000)
+class ChunkedUploadTestCase(TestCase):
+    """
+    Tests resumable chunked photo uploads
+    """
+
+    def setUp(self):
+        rmtree(settings.MEDIA_ROOT, ignore_errors=True)
+        self.user = User.objects.create_user(
+            username="test", email="test@test.io", password="testing"
+        )
+        self.profile = self.user.profile
+        self.cast = Cast.objects.create(name="Test Cast")
+        self.cast.add_member(self.profile)
+        self.cast.add_manager(self.profile)
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        self.data = make_upload((300, 300), "PNG", "RGB", compress_level=0)
+
+    def tearDown(self):
+        rmtree(settings.MEDIA_ROOT, ignore_errors=True)
+
+    def start(self, name: str = "cast-photo-uploads", pk: int = None) -> str:
+        """Starts an upload of the test image and returns its URL"""
+        pk = pk or self.cast.pk
+        response = self.client.post(
+            reverse(name, kwargs={"pk": pk}),
+            {"filename": "test.png", "size": len(self.data)},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data["received"], 0)
+        self.assertEqual(response.data["part_size"], 1000)
+        return reverse(name[:-1], kwargs={"pk": pk, "upload": response.data["id"]})
+
+    def send(self, url: str, offset: int, size: int = 1000) -> "Response":
+        """Sends the part of the test image at an offset"""
+        return self.client.put(
+            f"{url}?offset={offset}",
+            self.data[offset : offset + size],
+            content_type="application/octet-stream",
+        )
+
+    def send_all(self, url: str):
+        """Sends every part of the test image in order"""
+        for offset in range(0, len(self.data), 1000):
+            response = self.send(url, offset)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_upload(self):
+        """Tests a photo is created from uploaded parts"""
+        url = self.start()
+        self.send_all(url)
+        upload = Upload.objects.get()
+        response = self.client.post(url, {"description": "Parts"}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        photo = CastPhoto.objects.get(pk=response.data["id"])
+        self.assertEqual(photo.cast, self.cast)
+        self.assertEqual(photo.description, "Parts")
+        self.assertEqual(photo.image.width, 300)
+        self.assertFalse(Upload.objects.exists())
+        self.assertFalse(upload.stored_names())
+
+    def test_resume(self):
+        """Tests an interrupted upload continues from the received offset"""
+        url = self.start()
+        self.send(url, 0)
+        response = self.send(url, 2000)
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        response = self.client.get(url)
+        self.assertEqual(response.data["received"], 1000)
+        # Resending an acknowledged part is also rejected
+        self.assertEqual(self.send(url, 0).status_code, status.HTTP_409_CONFLICT)
+        for offset in range(response.data["received"], len(self.data), 1000):
+            self.send(url, offset)
+        response = self.client.post(url)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+    def test_retry(self):
+        """Tests a retried part only removes the files it stored"""
+        url = self.start()
+        stale = Upload.objects.get()
+        # An earlier attempt at the part is still being stored
+        first = posixpath.join(stale.part_directory, f"{0:012d}")
+        default_storage.save(first, ContentFile(b"earlier attempt"))
+        self.send(url, 0)
+        upload = Upload.objects.get()
+        name = upload.part_names()[0]
+        self.assertNotEqual(name, first)
+        with self.assertRaises(PartConflict):
+            stale.add_part(0, b"losing attempt")
+        with default_storage.open(name) as part:
+            self.assertEqual(part.read(), self.data[:1000])
+        self.assertEqual(len(upload.stored_names()), 2)
+
+    def test_race(self):
+        """Tests losing a race for an offset returns the upload to resume"""
+        url = self.start()
+        add_part = Upload.add_part
+
+        def race(upload, offset, data):
+            # Another request stores the part first
+            add_part(Upload.objects.get(pk=upload.pk), offset, data)
+            add_part(upload, offset, data)
+
+        with patch.object(Upload, "add_part", race):
+            response = self.send(url, 0)
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(response.data["received"], 1000)
+
+    def test_incomplete(self):
+        """Tests an upload cannot finish before all parts arrive"""
+        url = self.start()
+        self.send(url, 0)
+        response = self.client.post(url)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_part_limits(self):
+        """Tests parts over the size limit or past the end are rejected"""
+        url = self.start()
+        response = self.send(url, 0, 1001)
+        self.assertEqual(response.status_code, status.HTTP_413_REQUEST_ENTITY_TOO_LARGE)
+        with self.settings(UPLOAD_MAX_BYTES=100):
+            response = self.client.post(
+                reverse("cast-photo-uploads", kwargs={"pk": self.cast.pk}),
+                {"filename": "test.png", "size": 1000},
+                format="json",
+            )
+        self.assertEqual(response.status_code, status.HTTP_413_REQUEST_ENTITY_TOO_LARGE)
+
+    @override_settings(UPLOAD_HEADER_BYTES=1000)
+    def test_not_image(self):
+        """Tests non-image uploads are rejected from the first part"""
+        self.data = b"0" * 3000
+        url = self.start()
+        response = self.send(url, 0)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_permissions(self):
+        """Tests only managers and owners can upload"""
+        other = User.objects.create_user(
+            username="other", email="other@test.io", password="testing"
+        )
+        url = self.start()
+        self.client.force_authenticate(user=other)
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_404_NOT_FOUND)
+        response = self.client.post(
+            reverse("cast-photo-uploads", kwargs={"pk": self.cast.pk}),
+            {"filename": "test.png", "size": 10},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        response = self.client.post(
+            reverse("profile-photo-uploads", kwargs={"pk": self.profile.pk}),
+            {"filename": "test.png", "size": 10},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_user_photo(self):
+        """Tests user photos can be uploaded in parts"""
+        url = self.start("profile-photo-uploads", self.profile.pk)
+        self.send_all(url)
+        response = self.client.post(url)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(UserPhoto.objects.get().profile, self.profile)
+
+    def test_cancel_and_purge(self):
+        """Tests canceled and expired uploads are removed with their parts"""
+        url = self.start()
+        self.send(url, 0)
+        response = self.client.delete(url)
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertFalse(Upload.objects.exists())
+        url = self.start()
+        self.send(url, 0)
+        upload = Upload.objects.get()
+        self.assertTrue(upload.stored_names())
+        Upload.objects.update(created=timezone.now() - timedelta(days=2))
+        call_command("purge_uploads", stdout=StringIO())
+        self.assertFalse(Upload.objects.exists())
+        self.assertFalse(upload.stored_names())
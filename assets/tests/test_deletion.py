@@ -0,0 +1,101 @@
+# stdlib
+from datetime import timedelta
+from io import StringIO
+from shutil import rmtree
+from unittest.mock import patch
+
+# django
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.management import call_command
+from django.db import transaction
+from django.test import TransactionTestCase, override_settings
+from django.utils import timezone
+
+# app
+from casts.models import Cast, CastPhoto
+from ..deletion import process_deletions
+from ..models import PendingDeletion
+from ..thumbnails import generated_thumbnails
+from .test_ingest import make_upload
+
+
+class DeletionTestCase(TransactionTestCase):
+    """
+    Tests stored files are deleted in the background
+    """
+
+    def setUp(self):
+        rmtree(settings.MEDIA_ROOT, ignore_errors=True)
+        # Thumbnails of the same content may be cached from earlier tests
+        cache.clear()
+        self.cast = Cast.objects.create(name="Test Cast")
+        self.photos = []
+        for size in ((100, 100), (100, 101)):
+            photo = CastPhoto(cast=self.cast)
+            photo.image.save("test.jpg", ContentFile(make_upload(size, "JPEG")))
+            photo.refresh_from_db()
+            self.photos.append(photo)
+
+    def tearDown(self):
+        rmtree(settings.MEDIA_ROOT, ignore_errors=True)
+
+    def stored_names(self) -> [str]:
+        """Returns the photo files and thumbnails currently stored"""
+        names = []
+        for photo in self.photos:
+            names += [photo.image.name, photo.image_webp.name]
+            names += generated_thumbnails(photo, "image").values()
+        return names
+
+    def test_cascade(self):
+        """Tests a cascading delete removes every photo file"""
+        names = self.stored_names()
+        self.assertTrue(all(default_storage.exists(name) for name in names))
+        self.cast.delete()
+        self.assertFalse(any(default_storage.exists(name) for name in names))
+        self.assertFalse(PendingDeletion.objects.exists())
+
+    def test_rollback(self):
+        """Tests files are kept if the delete is rolled back"""
+        names = self.stored_names()
+        with self.assertRaises(ValueError):
+            with transaction.atomic():
+                self.cast.delete()
+                # Queued in the deleting transaction
+                self.assertEqual(PendingDeletion.objects.count(), 4)
+                raise ValueError
+        self.assertTrue(all(default_storage.exists(name) for name in names))
+        self.assertFalse(PendingDeletion.objects.exists())
+        # The connection still queues deletions after the rollback
+        self.photos[0].delete()
+        self.assertFalse(default_storage.exists(self.photos[0].image.name))
+
+    def test_command(self):
+        """Tests queued deletions are processed by the management command"""
+        names = self.stored_names()
+        # Simulates a worker that stopped before processing the queue
+        with patch("rrc.tasks.defer_later"):
+            CastPhoto.objects.filter(cast=self.cast).delete()
+        self.assertEqual(PendingDeletion.objects.count(), 4)
+        call_command("process_deletions", batch_size=3, stdout=StringIO())
+        self.assertFalse(any(default_storage.exists(name) for name in names))
+        self.assertFalse(PendingDeletion.objects.exists())
+
+    @override_settings(FILE_DELETION_GRACE_SECONDS=60)
+    def test_scheduled(self):
+        """Tests one run is scheduled for when queued names are old enough"""
+        names = self.stored_names()
+        with patch("assets.deletion._next_run", 0.0):
+            with patch("rrc.tasks.defer_later") as defer_later:
+                self.cast.delete()
+        defer_later.assert_called_once_with(120, process_deletions)
+        # Nothing is deleted until the grace period has passed
+        self.assertEqual(process_deletions(), 0)
+        self.assertTrue(all(default_storage.exists(name) for name in names))
+        created = timezone.now() - timedelta(seconds=60)
+        PendingDeletion.objects.update(created=created)
+        self.assertEqual(process_deletions(), 4)
+        self.assertFalse(any(default_storage.exists(name) for name in names))
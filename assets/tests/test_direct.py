@@ -0,0 +1,144 @@
+# stdlib
+from unittest import skipIf
+
+# django
+from django.contrib.auth.models import User
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+# library
+from rest_framework import status
+from rest_framework.test import APIClient
+
+try:
+    import boto3
+    import requests
+    from moto import mock_s3
+except ImportError:
+    mock_s3 = None
+
+# app
+from casts.models import Cast, CastPhoto
+from .test_ingest import make_upload
+from ..models import Upload
+
+
+@skipIf(mock_s3 is None, "moto is not installed")
+@override_settings(
+    DEFAULT_FILE_STORAGE="rrc.storage_backends.MediaStorage",
+    AWS_ACCESS_KEY_ID="testing",
+    AWS_SECRET_ACCESS_KEY="testing",
+    AWS_STORAGE_BUCKET_NAME="test-assets",
+    AWS_S3_REGION_NAME="us-east-1",
+    AWS_S3_OBJECT_PARAMETERS={"CacheControl": "max-age=86400"},
+    AWS_DEFAULT_ACL=None,
+    # Ingest is not run against the stand-in storage
+    TASKS_ALWAYS_EAGER=False,
+)
+class DirectUploadTestCase(TestCase):
+    """
+    Tests presigned uploads directly to S3 against a local stand-in
+    """
+
+    def setUp(self):
+        self.mock = mock_s3()
+        self.mock.start()
+        boto3.client("s3", region_name="us-east-1").create_bucket(Bucket="test-assets")
+        user = User.objects.create_user(
+            username="test", email="test@test.io", password="testing"
+        )
+        self.cast = Cast.objects.create(name="Test Cast")
+        self.cast.add_member(user.profile)
+        self.cast.add_manager(user.profile)
+        self.client = APIClient()
+        self.client.force_authenticate(user=user)
+        self.data = make_upload((100, 100), "PNG")
+
+    def tearDown(self):
+        self.mock.stop()
+
+    def start(self, size: int = None) -> dict:
+        """Starts a direct upload of the test image"""
+        response = self.client.post(
+            reverse("cast-photo-uploads", kwargs={"pk": self.cast.pk}),
+            {"filename": "test.png", "size": size or len(self.data), "direct": True},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        return response.data
+
+    def confirm(self, upload: dict) -> "Response":
+        """Confirms a direct upload"""
+        url = reverse(
+            "cast-photo-upload", kwargs={"pk": self.cast.pk, "upload": upload["id"]}
+        )
+        return self.client.post(url, {"description": "Direct"}, format="json")
+
+    def test_upload(self):
+        """Tests a photo is created from a file uploaded to its presigned URL"""
+        upload = self.start()
+        self.assertEqual(upload["upload_headers"]["Content-Type"], "image/png")
+        self.assertEqual(upload["upload_headers"]["Cache-Control"], "max-age=86400")
+        response = requests.put(
+            upload["upload_url"], data=self.data, headers=upload["upload_headers"]
+        )
+        self.assertEqual(response.status_code, 200)
+        response = self.confirm(upload)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        photo = CastPhoto.objects.get(pk=response.data["id"])
+        name = upload["id"].replace("-", "")
+        self.assertEqual(
+            photo.image.name,
+            f"casts/test-cast/photos/{name[:2]}/{name[2:4]}/{name}.png",
+        )
+        self.assertEqual(photo.description, "Direct")
+        self.assertFalse(Upload.objects.exists())
+
+    def test_missing(self):
+        """Tests a direct upload cannot be confirmed before the file is sent"""
+        response = self.confirm(self.start())
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(CastPhoto.objects.exists())
+
+    def test_invalid(self):
+        """Tests files with the wrong size or content are rejected and removed"""
+        upload = self.start(len(self.data) + 1)
+        name = Upload.objects.get().name
+        default_storage.save(name, ContentFile(self.data))
+        response = self.confirm(upload)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(default_storage.exists(name))
+
+    def test_parts_rejected(self):
+        """Tests direct uploads do not accept parts"""
+        upload = self.start()
+        url = reverse(
+            "cast-photo-upload", kwargs={"pk": self.cast.pk, "upload": upload["id"]}
+        )
+        response = self.client.put(
+            f"{url}?offset=0", self.data, content_type="application/octet-stream"
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class LocalDirectUploadTestCase(TestCase):
+    """
+    Tests direct uploads need S3 storage
+    """
+
+    def test_unsupported(self):
+        """Tests direct uploads are refused with local storage"""
+        user = User.objects.create_user(
+            username="test", email="test@test.io", password="testing"
+        )
+        client = APIClient()
+        client.force_authenticate(user=user)
+        response = client.post(
+            reverse("profile-photo-uploads", kwargs={"pk": user.profile.pk}),
+            {"filename": "test.png", "size": 100, "direct": True},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Upload.objects.exists())
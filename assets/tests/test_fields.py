@@ -0,0 +1,84 @@
+# stdlib
+from shutil import rmtree
+from unittest.mock import patch
+
+# django
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.test import TransactionTestCase, override_settings
+
+# app
+from users.models import Profile
+from ..deletion import process_deletions
+from ..models import PendingDeletion
+from .test_ingest import make_upload
+
+
+class HashedImageFieldTestCase(TransactionTestCase):
+    """
+    Tests content-addressed image storage
+    """
+
+    def setUp(self):
+        rmtree(settings.MEDIA_ROOT, ignore_errors=True)
+        self.profiles = [
+            User.objects.create_user(
+                username=name, email=f"{name}@test.io", password="testing"
+            ).profile
+            for name in ("test", "other")
+        ]
+        self.data = make_upload((100, 100), "JPEG")
+
+    def tearDown(self):
+        rmtree(settings.MEDIA_ROOT, ignore_errors=True)
+
+    def test_name(self):
+        """Tests files are named from their content"""
+        profile = self.profiles[0]
+        profile.image.save("Photo.JPG", ContentFile(self.data))
+        self.assertRegex(profile.image.name, r"^users/test/profile_image/\w{32}\.jpg$")
+        profile.image.save("other.jpg", ContentFile(self.data))
+        self.assertRegex(profile.image.name, r"^users/test/profile_image/\w{32}\.jpg$")
+        changed = make_upload((100, 101), "JPEG")
+        name = profile.image.name
+        profile.image.save("Photo.JPG", ContentFile(changed))
+        self.assertNotEqual(profile.image.name, name)
+
+    def test_deduplicate(self):
+        """Tests repeated uploads reuse the stored file until it is unused"""
+        profile = self.profiles[0]
+        profile.image.save("test.jpg", ContentFile(self.data))
+        name = profile.image.name
+        # Another row can share the same file
+        Profile.objects.filter(pk=self.profiles[1].pk).update(image=name)
+        profile.image.save("again.jpg", ContentFile(self.data))
+        self.assertEqual(profile.image.name, name)
+        _, files = default_storage.listdir("users/test/profile_image")
+        self.assertEqual(len(files), 1)
+        profile.image.delete()
+        self.assertTrue(default_storage.exists(name))
+        other = Profile.objects.get(pk=self.profiles[1].pk)
+        other.image.delete()
+        self.assertFalse(default_storage.exists(name))
+
+    @override_settings(FILE_DELETION_GRACE_SECONDS=60)
+    @patch("assets.deletion._next_run", 0.0)
+    def test_queued_file(self):
+        """Tests a file queued for deletion is not reused or deleted too soon"""
+        profile, other = self.profiles
+        profile.image.save("test.jpg", ContentFile(self.data))
+        name = profile.image.name
+        profile.image.delete()
+        self.assertTrue(PendingDeletion.objects.filter(name=name).exists())
+        # The queued file may be deleted before the new reference commits
+        other.image.save("test.jpg", ContentFile(self.data))
+        self.assertNotEqual(other.image.name, name)
+        # Recently queued names wait for the grace period
+        self.assertEqual(process_deletions(), 0)
+        self.assertTrue(default_storage.exists(name))
+        with self.settings(FILE_DELETION_GRACE_SECONDS=0):
+            self.assertEqual(process_deletions(), 1)
+        self.assertFalse(default_storage.exists(name))
+        self.assertTrue(default_storage.exists(other.image.name))
@@ -0,0 +1,118 @@
+# stdlib
+from io import BytesIO, StringIO
+from shutil import rmtree
+
+# django
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.files.base import ContentFile
+from django.core.files.storage import FileSystemStorage, default_storage
+from django.core.management import call_command
+from django.test import TransactionTestCase, override_settings
+
+# library
+from PIL import Image
+
+# app
+from casts.models import Cast, CastPhoto
+from users.models import UserPhoto
+from ..thumbnails import generated_thumbnails
+
+
+class OriginalsStorage(FileSystemStorage):
+    """Test storage for uploaded originals"""
+
+    def __init__(self):
+        super().__init__(location=settings.MEDIA_ROOT / "originals")
+
+
+def make_upload(size: (int, int), fmt: str, mode: str = "RGB", **options) -> bytes:
+    """Returns an encoded test image"""
+    output = BytesIO()
+    Image.new(mode, size).save(output, fmt, **options)
+    return output.getvalue()
+
+
+@override_settings(INGEST_MAX_DIMENSION=200)
+class IngestTestCase(TransactionTestCase):
+    """
+    Tests photos are normalized after upload
+    """
+
+    def setUp(self):
+        rmtree(settings.MEDIA_ROOT, ignore_errors=True)
+        self.cast = Cast.objects.create(name="Test Cast")
+
+    def tearDown(self):
+        rmtree(settings.MEDIA_ROOT, ignore_errors=True)
+
+    def upload(self, name: str, data: bytes) -> CastPhoto:
+        """Uploads a cast photo and returns it after ingest"""
+        photo = CastPhoto(cast=self.cast)
+        photo.image.save(name, ContentFile(data))
+        photo.refresh_from_db()
+        return photo
+
+    def test_normalize(self):
+        """Tests EXIF orientation is applied, metadata removed, and size capped"""
+        exif = Image.Exif()
+        exif[0x0112] = 6  # Rotated 90 degrees
+        exif[0x010F] = "Test Camera"
+        photo = self.upload("test.jpg", make_upload((800, 400), "JPEG", exif=exif))
+        self.assertRegex(photo.image.name, r"^casts/test-cast/photos/[\w/]+\.jpg$")
+        with Image.open(photo.image.path) as image:
+            self.assertEqual(image.format, "JPEG")
+            self.assertEqual(image.size, (100, 200))
+            self.assertFalse(image.getexif())
+        with Image.open(photo.image_webp.path) as image:
+            self.assertEqual(image.format, "WEBP")
+            self.assertEqual(image.size, (100, 200))
+
+    def test_backfill(self):
+        """Tests the command ingests photos missing their WebP variant"""
+        photo = self.upload("test.png", make_upload((100, 50), "PNG"))
+        CastPhoto.objects.update(image_webp="", image_hash=None)
+        call_command("ingest_images", stdout=StringIO())
+        photo.refresh_from_db()
+        self.assertTrue(photo.image_webp)
+        self.assertIsNotNone(photo.image_hash)
+
+    def test_transparent(self):
+        """Tests images with transparency are re-encoded as JPEG"""
+        photo = CastPhoto(cast=self.cast)
+        photo.image.save("test.png", ContentFile(make_upload((100, 50), "PNG", "RGBA")))
+        original = photo.image.name
+        photo.refresh_from_db()
+        self.assertTrue(photo.image.name.endswith(".jpg"))
+        self.assertFalse(default_storage.exists(original))
+        with Image.open(photo.image.path) as image:
+            self.assertEqual(image.size, (100, 50))
+
+    def test_thumbnails(self):
+        """Tests thumbnails are generated from the ingested image"""
+        photo = self.upload("test.png", make_upload((100, 50), "PNG"))
+        self.assertTrue(generated_thumbnails(photo, "image"))
+
+    def test_user_photo(self):
+        """Tests user photos are ingested"""
+        profile = User.objects.create_user(
+            username="test", email="test@test.io", password="testing"
+        ).profile
+        photo = UserPhoto(profile=profile)
+        photo.image.save("test.png", ContentFile(make_upload((300, 300), "PNG")))
+        photo.refresh_from_db()
+        self.assertTrue(photo.image_webp)
+        self.assertEqual(photo.image.width, 200)
+
+    @override_settings(
+        INGEST_ORIGINALS_STORAGE="assets.tests.test_ingest.OriginalsStorage"
+    )
+    def test_keep_original(self):
+        """Tests originals are copied to the originals storage"""
+        data = make_upload((300, 300), "PNG")
+        photo = CastPhoto(cast=self.cast)
+        photo.image.save("test.png", ContentFile(data))
+        self.assertTrue(photo.image.name.endswith(".png"))
+        self.assertFalse(default_storage.exists(photo.image.name))
+        with OriginalsStorage().open(photo.image.name) as kept:
+            self.assertEqual(kept.read(), data)
@@ -0,0 +1,114 @@
+# stdlib
+from io import BytesIO, StringIO
+from shutil import rmtree
+
+# django
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.management import call_command
+from django.test import TestCase
+
+# library
+from PIL import Image, ImageFilter
+
+# app
+from casts.models import Cast, CastPhoto
+from ..similarity import HashIndex, dhash, find_duplicate, hamming, signed
+
+
+def make_picture(size: (int, int), flip: bool = False, fmt: str = "JPEG") -> bytes:
+    """Returns an encoded detailed test image, optionally mirrored"""
+    image = Image.effect_mandelbrot((600, 400), (-2, -1.5, 1, 1.5), 100)
+    image = image.filter(ImageFilter.GaussianBlur(10)).resize(size).convert("RGB")
+    if flip:
+        image = image.transpose(Image.FLIP_LEFT_RIGHT)
+    output = BytesIO()
+    image.save(output, fmt)
+    return output.getvalue()
+
+
+class SimilarityTestCase(TestCase):
+    """
+    Tests near-duplicate photo detection
+    """
+
+    def setUp(self):
+        rmtree(settings.MEDIA_ROOT, ignore_errors=True)
+        self.cast = Cast.objects.create(name="Test Cast")
+        self.other = Cast.objects.create(name="Other Cast")
+
+    def tearDown(self):
+        rmtree(settings.MEDIA_ROOT, ignore_errors=True)
+
+    def upload(self, data: bytes, cast: Cast = None) -> CastPhoto:
+        """Uploads and ingests a cast photo"""
+        photo = CastPhoto(cast=cast or self.cast)
+        photo.image.save("test.jpg", ContentFile(data))
+        photo.refresh_from_db()
+        return photo
+
+    def test_hash(self):
+        """Tests resized and re-encoded copies hash alike"""
+        first = dhash(Image.open(BytesIO(make_picture((300, 200)))))
+        second = dhash(Image.open(BytesIO(make_picture((150, 100), fmt="PNG"))))
+        rotated = dhash(Image.open(BytesIO(make_picture((300, 200), True))))
+        self.assertLessEqual(hamming(first, second), settings.PHOTO_DUPLICATE_DISTANCE)
+        self.assertGreater(hamming(first, rotated), 16)
+        self.assertTrue(-(1 << 63) <= first < 1 << 63)
+
+    def test_orientation(self):
+        """Tests the EXIF orientation is applied before hashing"""
+        exif = Image.Exif()
+        exif[0x0112] = 6  # Rotated 90 degrees
+        output = BytesIO()
+        Image.open(BytesIO(make_picture((300, 200)))).save(output, "JPEG", exif=exif)
+        original = dhash(Image.open(output))
+        upright = Image.open(BytesIO(make_picture((300, 200)))).transpose(
+            Image.ROTATE_270
+        )
+        self.assertLessEqual(
+            hamming(original, dhash(upright)), settings.PHOTO_DUPLICATE_DISTANCE
+        )
+
+    def test_bands(self):
+        """Tests near matches are found through shared hash bands"""
+        base = signed(0xF0E1D2C3B4A59687)
+        # Changes one bit in each of four bands
+        near = signed(base ^ (1 | 1 << 13 | 1 << 26 | 1 << 63))
+        far = signed(base ^ (1 | 1 << 13 | 1 << 26 | 1 << 39 | 1 << 63))
+        self.assertEqual(hamming(base, near), settings.PHOTO_DUPLICATE_DISTANCE)
+        index = HashIndex([(1, far), (2, near), (3, base)])
+        self.assertEqual(index.find(base), 3)
+        self.assertEqual(index.find(base, before=3), 2)
+        self.assertIsNone(index.find(base, before=2))
+        CastPhoto.objects.bulk_create(
+            CastPhoto(cast=self.cast, image=f"{i}.jpg", image_hash=value)
+            for i, value in enumerate((far, near))
+        )
+        photos = CastPhoto.objects.filter(cast=self.cast)
+        self.assertEqual(find_duplicate(photos, base), photos.get(image_hash=near).pk)
+        self.assertIsNone(find_duplicate(photos.filter(image_hash=far), base))
+
+    def test_flag_duplicate(self):
+        """Tests near-duplicates are flagged within a cast only"""
+        original = self.upload(make_picture((300, 200)))
+        self.assertIsNotNone(original.image_hash)
+        self.assertIsNone(original.duplicate_of)
+        copy = self.upload(make_picture((240, 160)))
+        self.assertEqual(copy.duplicate_of, original)
+        different = self.upload(make_picture((300, 200), True))
+        self.assertIsNone(different.duplicate_of)
+        elsewhere = self.upload(make_picture((300, 200)), self.other)
+        self.assertIsNone(elsewhere.duplicate_of)
+
+    def test_backfill(self):
+        """Tests the command hashes existing photos and flags duplicates"""
+        original = self.upload(make_picture((300, 200)))
+        copy = self.upload(make_picture((240, 160)))
+        CastPhoto.objects.update(image_hash=None, duplicate_of=None)
+        call_command("backfill_image_hashes", batch_size=1, stdout=StringIO())
+        original.refresh_from_db()
+        copy.refresh_from_db()
+        self.assertIsNotNone(original.image_hash)
+        self.assertIsNone(original.duplicate_of)
+        self.assertEqual(copy.duplicate_of, original)
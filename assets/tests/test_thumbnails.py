@@ -0,0 +1,81 @@
+# stdlib
+from io import StringIO
+from shutil import rmtree
+
+# django
+from django.conf import settings
+from django.core.files.images import ImageFile
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+
+# app
+from casts.models import Cast, CastPhoto
+from casts.serializers import CastPhotoSerializer, CastSerializer
+from users.tests.test_user_photo import make_image
+from ..thumbnails import generate_thumbnails, generated_thumbnails
+
+
+class ThumbnailTestCase(TestCase):
+    """
+    Tests thumbnail generation after upload
+    """
+
+    def setUp(self):
+        rmtree(settings.MEDIA_ROOT, ignore_errors=True)
+        self.cast = Cast.objects.create(name="Test Cast")
+
+    def tearDown(self):
+        rmtree(settings.MEDIA_ROOT, ignore_errors=True)
+
+    def upload(self, instance, field_name: str):
+        """Saves a new image to an object's image field"""
+        tmpim = make_image()
+        with open(tmpim.name, "rb") as data:
+            getattr(instance, field_name).save("test.jpg", ImageFile(data))
+
+    def test_photo_thumbnails(self):
+        """Tests all sizes are generated and serialized for a new photo"""
+        photo = CastPhoto(cast=self.cast)
+        self.upload(photo, "image")
+        photo.refresh_from_db()
+        thumbnails = generated_thumbnails(photo, "image")
+        self.assertEqual(set(thumbnails), set(settings.THUMBNAIL_SIZES))
+        data = CastPhotoSerializer(photo).data
+        self.assertEqual(set(data["thumbnails"]), set(settings.THUMBNAIL_SIZES))
+        self.assertTrue(data["thumbnails"]["small"].endswith(".jpg"))
+
+    def test_changed_image(self):
+        """Tests thumbnails of a replaced image are not served"""
+        self.upload(self.cast, "logo")
+        self.cast.refresh_from_db()
+        old = generated_thumbnails(self.cast, "logo")
+        self.assertTrue(old)
+        self.cast.logo.name = "casts/test-cast/other.jpg"
+        self.assertEqual(generated_thumbnails(self.cast, "logo"), {})
+        self.assertEqual(CastSerializer(self.cast).data["logo_thumbnails"], {})
+
+    def test_no_image(self):
+        """Tests objects without an image have no thumbnails"""
+        self.assertEqual(CastSerializer(self.cast).data["logo_thumbnails"], {})
+
+    def test_backfill(self):
+        """Tests the command generates thumbnails for existing images"""
+        self.upload(self.cast, "logo")
+        Cast.objects.filter(pk=self.cast.pk).update(logo_thumbnails="")
+        call_command("generate_thumbnails", stdout=StringIO())
+        self.cast.refresh_from_db()
+        self.assertTrue(generated_thumbnails(self.cast, "logo"))
+
+    def test_revalidated(self):
+        """Tests generating thumbnails changes the object's ETag"""
+        self.upload(self.cast, "logo")
+        Cast.objects.filter(pk=self.cast.pk).update(logo_thumbnails="")
+        url = reverse("cast", kwargs={"pk": self.cast.pk})
+        etag = self.client.get(url)["ETag"]
+        generate_thumbnails("casts.Cast", self.cast.pk, "logo", self.cast.logo.name)
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            set(response.data["logo_thumbnails"]), set(settings.THUMBNAIL_SIZES)
+        )
@@ -0,0 +1,98 @@
+# stdlib
+import struct
+import zlib
+from io import BytesIO
+from shutil import rmtree
+
+# django
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+# library
+from rest_framework import status
+from rest_framework.test import APIClient
+
+# app
+from users.models import UserPhoto
+from .test_ingest import make_upload
+from ..uploads import UploadTooLarge, check_image_header
+
+
+def make_png_header(width: int, height: int) -> bytes:
+    """Returns the start of a PNG declaring the given dimensions"""
+    ihdr = b"IHDR" + struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)
+    chunk = struct.pack(">I", 13) + ihdr + struct.pack(">I", zlib.crc32(ihdr))
+    # Pillow reads the header up to the first image data chunk
+    return b"\x89PNG\r\n\x1a\n" + chunk + struct.pack(">I", 0) + b"IDAT"
+
+
+class ImageUploadTestCase(TestCase):
+    """
+    Tests image uploads are validated while streaming
+    """
+
+    def setUp(self):
+        rmtree(settings.MEDIA_ROOT, ignore_errors=True)
+        user = User.objects.create_user(
+            username="test", email="test@test.io", password="testing"
+        )
+        self.profile = user.profile
+        self.client = APIClient()
+        self.client.force_authenticate(user=user)
+
+    def tearDown(self):
+        rmtree(settings.MEDIA_ROOT, ignore_errors=True)
+
+    def upload(self, name: str, data: bytes) -> "Response":
+        """Uploads a user photo"""
+        return self.client.post(
+            reverse("profile-photos", kwargs={"pk": self.profile.pk}),
+            {"image": SimpleUploadedFile(name, data)},
+            format="multipart",
+        )
+
+    def test_upload(self):
+        """Tests valid images are accepted"""
+        response = self.upload("test.png", make_upload((100, 100), "PNG"))
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+    @override_settings(UPLOAD_MAX_BYTES=1000)
+    def test_too_many_bytes(self):
+        """Tests files over the byte limit are rejected"""
+        response = self.upload("test.png", BytesIO(b"0" * 2000).getvalue())
+        self.assertEqual(response.status_code, status.HTTP_413_REQUEST_ENTITY_TOO_LARGE)
+
+    @override_settings(UPLOAD_MAX_PIXELS=100 * 100 - 1)
+    def test_too_many_pixels(self):
+        """Tests images over the pixel limit are rejected from the header"""
+        response = self.upload("test.png", make_upload((100, 100), "PNG"))
+        self.assertEqual(response.status_code, status.HTTP_413_REQUEST_ENTITY_TOO_LARGE)
+        self.assertFalse(UserPhoto.objects.exists())
+
+    def test_decompression_bomb(self):
+        """Tests a header declaring huge dimensions is rejected at once"""
+        header = make_png_header(100000, 100000)
+        with self.assertRaises(UploadTooLarge):
+            check_image_header(header, final=False)
+        response = self.upload("test.png", header + b"\0" * 1000)
+        self.assertEqual(response.status_code, status.HTTP_413_REQUEST_ENTITY_TOO_LARGE)
+
+    @override_settings(UPLOAD_IMAGE_FORMATS=("JPEG",))
+    def test_format(self):
+        """Tests unsupported image formats are rejected"""
+        response = self.upload("test.png", make_upload((100, 100), "PNG"))
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_not_image(self):
+        """Tests non-image files are rejected"""
+        response = self.upload("test.jpg", b"not an image")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_partial_header(self):
+        """Tests a truncated header waits for more data"""
+        data = make_upload((100, 100), "JPEG")
+        self.assertFalse(check_image_header(data[:10], final=False))
+        self.assertTrue(check_image_header(data, final=False))
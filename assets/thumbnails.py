@@ -0,0 +1,85 @@
+"""
+Named thumbnail sizes generated in the background after upload
+"""
+
+# stdlib
+import json
+
+# django
+from django.apps import apps
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models.fields.files import FieldFile
+from django.utils import timezone
+
+# library
+from sorl.thumbnail import get_thumbnail
+from sorl.thumbnail.images import ImageFile
+
+# app
+from rrc import tasks
+
+
+def thumbnail_field(field_name: str) -> str:
+    """
+    Returns the name of the column storing an image field's thumbnails
+    """
+    return f"{field_name}_thumbnails"
+
+
+def generated_thumbnails(instance, field_name: str) -> {str: str}:
+    """
+    Returns the stored thumbnail names of an image field by size
+
+    Empty until thumbnails have been generated for the current image
+    """
+    image = getattr(instance, field_name)
+    stored = getattr(instance, thumbnail_field(field_name))
+    if not (image and stored):
+        return {}
+    thumbnails = json.loads(stored)
+    if thumbnails.pop("source", None) != image.name:
+        return {}
+    return thumbnails
+
+
+def thumbnail_urls(instance, field_name: str) -> {str: str}:
+    """
+    Returns the thumbnail URLs of an image field by size without generating them
+    """
+    return {
+        size: ImageFile(name).url
+        for size, name in generated_thumbnails(instance, field_name).items()
+    }
+
+
+def generate_thumbnails(label: str, pk: int, field_name: str, name: str):
+    """
+    Creates every named thumbnail size for a stored image
+
+    The names are only saved if the object still has the same image. Objects
+    with a modified time are touched so cached responses are revalidated.
+    """
+    model = apps.get_model(label)
+    thumbnails = {"source": name}
+    for size, (geometry, options) in settings.THUMBNAIL_SIZES.items():
+        thumbnails[size] = get_thumbnail(name, geometry, **options).name
+    values = {thumbnail_field(field_name): json.dumps(thumbnails)}
+    try:
+        model._meta.get_field("modified")
+        values["modified"] = timezone.now()
+    except FieldDoesNotExist:
+        pass
+    model.objects.filter(pk=pk, **{field_name: name}).update(**values)
+
+
+def queue_thumbnails(instance, field_name: str):
+    """
+    Queues thumbnail generation in the process pool if the image has changed
+    """
+    image: FieldFile = getattr(instance, field_name)
+    if not image or generated_thumbnails(instance, field_name):
+        return
+    tasks.defer_process(
+        generate_thumbnails, instance._meta.label, instance.pk, field_name, image.name,
+    )
@@ -0,0 +1,95 @@
+"""
+Streaming validation of image uploads
+"""
+
+# stdlib
+from io import BytesIO
+
+# django
+from django.conf import settings
+from django.core.files.uploadhandler import FileUploadHandler
+
+# library
+from PIL import Image
+from rest_framework import status
+from rest_framework.exceptions import APIException, ParseError
+
+
+class UploadTooLarge(APIException):
+    status_code = status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+    default_detail = "Upload is too large"
+    default_code = "upload_too_large"
+
+
+def check_image_header(header: bytes, final: bool) -> bool:
+    """
+    Validates an image's format and pixel count from the start of its data
+
+    Returns False if more data is needed to read the header. Raises an API
+    exception if the image is rejected.
+    """
+    try:
+        image = Image.open(BytesIO(header))
+    except Image.DecompressionBombError as exc:
+        # Pillow refuses headers declaring far more than the pixel limit
+        raise UploadTooLarge(str(exc))
+    except OSError:
+        if final or len(header) >= settings.UPLOAD_HEADER_BYTES:
+            raise ParseError("Upload is not a supported image")
+        return False
+    if image.format not in settings.UPLOAD_IMAGE_FORMATS:
+        raise ParseError(f"Unsupported image format {image.format}")
+    width, height = image.size
+    if width * height > settings.UPLOAD_MAX_PIXELS:
+        raise UploadTooLarge(
+            f"Image is {width}x{height}. Uploads are limited to "
+            f"{settings.UPLOAD_MAX_PIXELS} pixels"
+        )
+    return True
+
+
+class ImageUploadHandler(FileUploadHandler):
+    """
+    Rejects oversized or invalid image uploads as the request body streams in
+
+    Chunks are passed through unchanged to the default handlers, so rejected
+    uploads are never fully buffered or decoded.
+    """
+
+    def handle_raw_input(
+        self, input_data, META, content_length, boundary, encoding=None
+    ):
+        if content_length > settings.UPLOAD_MAX_BYTES + settings.UPLOAD_FORM_BYTES:
+            raise UploadTooLarge()
+
+    def new_file(self, *args, **kwargs):
+        super().new_file(*args, **kwargs)
+        self.received = 0
+        self.header = b""
+        self.checked = False
+
+    def receive_data_chunk(self, raw_data: bytes, start: int) -> bytes:
+        self.received += len(raw_data)
+        if self.received > settings.UPLOAD_MAX_BYTES:
+            raise UploadTooLarge()
+        if not self.checked:
+            self.header += raw_data
+            self.checked = check_image_header(self.header, final=False)
+            if self.checked:
+                self.header = b""
+        return raw_data
+
+    def file_complete(self, file_size: int):
+        if not self.checked:
+            check_image_header(self.header, final=True)
+        self.header = b""
+
+
+class ImageUploadMixin:
+    """
+    Validates image uploads to a view while they are received
+    """
+
+    def initialize_request(self, request, *args, **kwargs):
+        request.upload_handlers.insert(0, ImageUploadHandler(request))
+        return super().initialize_request(request, *args, **kwargs)
@@ -0,0 +1,188 @@
+"""
+Chunked upload views
+"""
+
+# stdlib
+import posixpath
+import uuid
+
+# django
+from django.conf import settings
+from django.core.files import File
+from django.core.files.storage import default_storage
+from django.shortcuts import get_object_or_404
+
+# library
+from rest_framework import status, views
+from rest_framework.exceptions import APIException, ParseError
+from rest_framework.response import Response
+
+# app
+from .models import PartConflict, Upload
+from .serializers import UploadSerializer
+from .uploads import UploadTooLarge, check_image_header
+
+
+class UploadTargetMixin:
+    """
+    Connects chunked uploads to the object they create
+
+    Views set a kind name for the target and implement get_target, which returns
+    the parent object after checking permissions, get_upload_name, and
+    create_object
+    """
+
+    kind: str = None
+
+    def get_target(self):
+        raise NotImplementedError
+
+    def get_upload_name(self, target, filename: str) -> str:
+        """
+        Returns the storage name the object's image would be saved to
+        """
+        raise NotImplementedError
+
+    def create_object(self, target, image: "File or str") -> dict:
+        """
+        Creates the uploaded object and returns its serialized data
+
+        The image is either the assembled file or the name of a file already
+        in storage
+        """
+        raise NotImplementedError
+
+
+class UploadCreateView(UploadTargetMixin, views.APIView):
+    """
+    Start a chunked upload or a direct upload to storage
+
+    Direct uploads return a presigned URL and the headers to PUT the file with
+    """
+
+    def post(self, request, pk: int):
+        target = self.get_target()
+        serializer = UploadSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        if serializer.validated_data["size"] > settings.UPLOAD_MAX_BYTES:
+            raise UploadTooLarge()
+        if not serializer.validated_data.pop("direct"):
+            serializer.save(user=request.user, kind=self.kind, target_id=pk)
+            return Response(serializer.data, status=status.HTTP_201_CREATED)
+        if not hasattr(default_storage, "presigned_put"):
+            raise ParseError("Direct uploads are not supported by this storage")
+        upload_id = uuid.uuid4()
+        # The file is renamed from its content once it is ingested
+        ext = posixpath.splitext(serializer.validated_data["filename"])[1].lower()
+        name = self.get_upload_name(target, f"{upload_id.hex}{ext}")
+        serializer.save(
+            id=upload_id, user=request.user, kind=self.kind, target_id=pk, name=name
+        )
+        url, headers = default_storage.presigned_put(name, settings.UPLOAD_URL_EXPIRY)
+        data = dict(serializer.data, upload_url=url, upload_headers=headers)
+        return Response(data, status=status.HTTP_201_CREATED)
+
+
+class UploadView(UploadTargetMixin, views.APIView):
+    """
+    Check the progress of, add a part to, finish, or cancel a chunked upload
+
+    Parts are sent as the raw request body to PUT with the byte offset they
+    start at in an "offset" query param. An interrupted upload is resumed by
+    sending the next part from the received offset returned by GET.
+
+    Direct uploads skip the parts. POST confirms the file was uploaded.
+    """
+
+    def get_upload(self) -> Upload:
+        return get_object_or_404(
+            Upload,
+            pk=self.kwargs["upload"],
+            user=self.request.user,
+            kind=self.kind,
+            target_id=self.kwargs["pk"],
+        )
+
+    def get(self, request, pk: int, upload):
+        return Response(UploadSerializer(self.get_upload()).data)
+
+    def put(self, request, pk: int, upload):
+        upload = self.get_upload()
+        if upload.name:
+            raise ParseError("Direct uploads are sent to their upload URL")
+        try:
+            offset = int(request.query_params["offset"])
+        except (KeyError, ValueError):
+            raise ParseError("An integer 'offset' query param is required")
+        if offset != upload.received:
+            return self.conflict(upload)
+        limit = settings.UPLOAD_PART_BYTES
+        if int(request.META.get("CONTENT_LENGTH") or 0) > limit:
+            raise UploadTooLarge(f"Upload parts are limited to {limit} bytes")
+        data = request.stream.read(limit + 1) if request.stream else b""
+        if len(data) > limit:
+            raise UploadTooLarge(f"Upload parts are limited to {limit} bytes")
+        if offset == 0:
+            check_image_header(data, final=len(data) == upload.size)
+        try:
+            upload.add_part(offset, data)
+        except PartConflict:
+            upload.refresh_from_db()
+            return self.conflict(upload)
+        except ValueError as exc:
+            raise ParseError(str(exc))
+        return Response(UploadSerializer(upload).data)
+
+    @staticmethod
+    def conflict(upload: Upload) -> Response:
+        """
+        Returns the upload's state for a client to resume from its offset
+        """
+        return Response(UploadSerializer(upload).data, status=status.HTTP_409_CONFLICT)
+
+    def post(self, request, pk: int, upload):
+        upload = self.get_upload()
+        target = self.get_target()
+        if upload.name:
+            self.check_direct_upload(upload)
+            data = self.create_object(target, upload.name)
+            upload.delete()
+            return Response(data, status=status.HTTP_201_CREATED)
+        try:
+            image = upload.assemble()
+        except ValueError as exc:
+            raise ParseError(str(exc))
+        with image:
+            check_image_header(image.read(settings.UPLOAD_HEADER_BYTES), final=True)
+            image.seek(0)
+            data = self.create_object(target, image)
+        upload.delete_files()
+        upload.delete()
+        return Response(data, status=status.HTTP_201_CREATED)
+
+    @staticmethod
+    def check_direct_upload(upload: Upload):
+        """
+        Verifies a direct upload's size and image header in storage
+
+        Rejected files are removed from storage
+        """
+        if not default_storage.exists(upload.name):
+            raise ParseError("The file has not been uploaded")
+        size = default_storage.size(upload.name)
+        try:
+            if size != upload.size:
+                raise ParseError(f"Expected {upload.size} bytes but got {size}")
+            header = default_storage.read_head(
+                upload.name, settings.UPLOAD_HEADER_BYTES
+            )
+            check_image_header(header, final=True)
+        except APIException:
+            default_storage.delete(upload.name)
+            raise
+
+    def delete(self, request, pk: int, upload):
+        upload = self.get_upload()
+        upload.delete_files()
+        upload.delete()
+        return Response(status=status.HTTP_204_NO_CONTENT)
@@ -1,6 +1,7 @@
 from django.contrib import admin
-from .models import Cast, CastPhoto, PageSection
+from .models import Cast, CastMembership, CastPhoto, PageSection
 
 admin.site.register(Cast)
+admin.site.register(CastMembership)
 admin.site.register(CastPhoto)
 admin.site.register(PageSection)
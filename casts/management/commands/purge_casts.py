@@ -0,0 +1,21 @@
+"""
+Purges deleted casts left over if a background worker stopped
+"""
+
+from django.core.management.base import BaseCommand
+from ...models import PURGE_BATCH_SIZE, Cast, purge_cast
+
+
+class Command(BaseCommand):
+    help = "Deletes the content of deleted casts in batches"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=PURGE_BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        pks = list(
+            Cast.all_objects.filter(deleted__isnull=False).values_list("pk", flat=True)
+        )
+        for pk in pks:
+            purge_cast(pk, options["batch_size"])
+        self.stdout.write(f"Purged {len(pks)} deleted casts")
@@ -0,0 +1,20 @@
+"""
+Renders page sections whose background render was lost
+"""
+
+from django.core.management.base import BaseCommand
+from ...models import PageSection, render_page_section
+
+
+class Command(BaseCommand):
+    help = "Renders page sections with text but no rendered HTML"
+
+    def handle(self, *args, **options):
+        pks = list(
+            PageSection.objects.filter(html="")
+            .exclude(text="")
+            .values_list("pk", flat=True)
+        )
+        for pk in pks:
+            render_page_section(pk)
+        self.stdout.write(f"Rendered {len(pks)} page sections")
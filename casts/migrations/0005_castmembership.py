@@ -0,0 +1,76 @@
+# Generated by Django 3.0.14 on 2026-10-18 01:22
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0005_auto_20190408_0023"),
+        ("casts", "0004_auto_20190408_0023"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CastMembership",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "state",
+                    models.PositiveSmallIntegerField(
+                        choices=[
+                            (1, "Requested"),
+                            (2, "Member"),
+                            (3, "Manager"),
+                            (4, "Blocked"),
+                        ]
+                    ),
+                ),
+                (
+                    "created",
+                    models.DateTimeField(
+                        default=django.utils.timezone.now, editable=False
+                    ),
+                ),
+                ("modified", models.DateTimeField(default=django.utils.timezone.now)),
+                (
+                    "cast",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="memberships",
+                        to="casts.Cast",
+                    ),
+                ),
+                (
+                    "profile",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="cast_memberships",
+                        to="users.Profile",
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name="castmembership",
+            index=models.Index(
+                fields=["cast", "state"], name="casts_castm_cast_id_c59bb8_idx"
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="castmembership",
+            constraint=models.UniqueConstraint(
+                fields=("cast", "profile"), name="unique_cast_membership"
+            ),
+        ),
+    ]
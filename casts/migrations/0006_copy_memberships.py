@@ -0,0 +1,59 @@
+from django.db import migrations
+
+# Mirrors casts.models.CastMembership states
+REQUESTED, MEMBER, MANAGER, BLOCKED = 1, 2, 3, 4
+
+# Later lists take precedence when a profile appears in more than one
+LIST_STATES = (
+    ("member_requests", REQUESTED),
+    ("blocked", BLOCKED),
+    ("members", MEMBER),
+    ("managers", MANAGER),
+)
+
+
+def copy_to_memberships(apps, schema_editor):
+    """
+    Copies the separate profile lists into the single membership table
+    """
+    Cast = apps.get_model("casts", "Cast")
+    CastMembership = apps.get_model("casts", "CastMembership")
+    states = {}
+    for key, state in LIST_STATES:
+        through = getattr(Cast, key).through
+        for cast, profile in through.objects.values_list("cast_id", "profile_id"):
+            states[(cast, profile)] = state
+    CastMembership.objects.bulk_create(
+        (
+            CastMembership(cast_id=cast, profile_id=profile, state=state)
+            for (cast, profile), state in states.items()
+        ),
+        batch_size=500,
+    )
+
+
+def copy_to_lists(apps, schema_editor):
+    """
+    Copies memberships back into the separate profile lists
+    """
+    Cast = apps.get_model("casts", "Cast")
+    CastMembership = apps.get_model("casts", "CastMembership")
+    for key, state in LIST_STATES:
+        states = (MEMBER, MANAGER) if key == "members" else (state,)
+        through = getattr(Cast, key).through
+        through.objects.bulk_create(
+            (
+                through(cast_id=cast, profile_id=profile)
+                for cast, profile in CastMembership.objects.filter(
+                    state__in=states
+                ).values_list("cast_id", "profile_id")
+            ),
+            batch_size=500,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [("casts", "0005_castmembership")]
+
+    operations = [migrations.RunPython(copy_to_memberships, copy_to_lists)]
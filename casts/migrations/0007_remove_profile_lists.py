@@ -0,0 +1,15 @@
+# Generated by Django 3.0.14 on 2026-10-18 01:22
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [("casts", "0006_copy_memberships")]
+
+    operations = [
+        migrations.RemoveField(model_name="cast", name="blocked"),
+        migrations.RemoveField(model_name="cast", name="managers"),
+        migrations.RemoveField(model_name="cast", name="member_requests"),
+        migrations.RemoveField(model_name="cast", name="members"),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 3.0.14 on 2026-10-18 01:35
+
+from django.db import migrations, models
+from casts.rendering import render_html, render_summary
+
+
+def render_sections(apps, schema_editor):
+    """
+    Renders the text of existing page sections
+    """
+    PageSection = apps.get_model("casts", "PageSection")
+    sections = PageSection.objects.only("text").iterator(chunk_size=500)
+    for section in sections:
+        section.html = render_html(section.text)
+        section.summary = render_summary(section.text)
+        section.save(update_fields=["html", "summary"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [("casts", "0007_remove_profile_lists")]
+
+    operations = [
+        migrations.AddField(
+            model_name="pagesection",
+            name="html",
+            field=models.TextField(blank=True, editable=False),
+        ),
+        migrations.AddField(
+            model_name="pagesection",
+            name="summary",
+            field=models.CharField(blank=True, editable=False, max_length=256),
+        ),
+        migrations.RunPython(render_sections, migrations.RunPython.noop),
+    ]
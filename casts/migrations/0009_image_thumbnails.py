@@ -0,0 +1,21 @@
+# Generated by Django 3.0.14 on 2026-10-18 01:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [("casts", "0008_pagesection_rendered")]
+
+    operations = [
+        migrations.AddField(
+            model_name="cast",
+            name="logo_thumbnails",
+            field=models.TextField(blank=True, editable=False),
+        ),
+        migrations.AddField(
+            model_name="castphoto",
+            name="image_thumbnails",
+            field=models.TextField(blank=True, editable=False),
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 3.0.14 on 2026-10-18 01:54
+
+import assets.fields
+import casts.models
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [("casts", "0010_image_webp")]
+
+    operations = [
+        migrations.AlterField(
+            model_name="cast",
+            name="logo",
+            field=assets.fields.HashedImageField(
+                blank=True, upload_to=casts.models.cast_logo
+            ),
+        ),
+        migrations.AlterField(
+            model_name="castphoto",
+            name="image",
+            field=assets.fields.HashedImageField(upload_to=casts.models.cast_photo),
+        ),
+        migrations.AlterField(
+            model_name="castphoto",
+            name="image_webp",
+            field=assets.fields.HashedImageField(
+                blank=True, editable=False, upload_to=casts.models.cast_photo
+            ),
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 3.0.14 on 2026-10-18 01:56
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [("casts", "0011_hashed_images")]
+
+    operations = [
+        migrations.AddField(
+            model_name="castphoto",
+            name="duplicate_of",
+            field=models.ForeignKey(
+                editable=False,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="duplicates",
+                to="casts.CastPhoto",
+            ),
+        ),
+        migrations.AddField(
+            model_name="castphoto",
+            name="image_hash",
+            field=models.BigIntegerField(editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name="castphoto",
+            index=models.Index(
+                fields=["cast", "image_hash"], name="casts_castp_cast_id_1424e0_idx"
+            ),
+        ),
+    ]
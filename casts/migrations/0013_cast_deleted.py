@@ -0,0 +1,16 @@
+# Generated by Django 3.0.14 on 2026-10-18 02:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [("casts", "0012_image_hash")]
+
+    operations = [
+        migrations.AddField(
+            model_name="cast",
+            name="deleted",
+            field=models.DateTimeField(db_index=True, editable=False, null=True),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 3.0.14 on 2026-10-18 02:18
+
+import casts.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [("casts", "0013_cast_deleted")]
+
+    operations = [
+        migrations.AddField(
+            model_name="cast",
+            name="timezone",
+            field=models.CharField(
+                default=casts.models.default_timezone,
+                max_length=64,
+                validators=[casts.models.validate_timezone],
+            ),
+        ),
+    ]
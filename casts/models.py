@@ -2,24 +2,161 @@
 Models to build and manage User profiles and settings
 """
 
+# stdlib
+from typing import NamedTuple
+from uuid import uuid4
+
 # django
-from django.db import models
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db import IntegrityError, models, transaction
+from django.db.models import Count, OuterRef, Prefetch, Q, Subquery
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
 from django.utils import text, timezone
-from sorl.thumbnail import ImageField
+
+# library
+import pytz
+
+# app
+from assets.fields import HashedImageField, fan_out
+from assets.ingest import queue_ingest
+from assets.thumbnails import queue_thumbnails
+from events.models import (
+    ArchivedCasting,
+    ArchivedEvent,
+    Casting,
+    Event,
+    invalidate_calendars,
+)
+from rrc import tasks
+from users.models import Profile
+from .rendering import render_html, render_summary
+
+UPCOMING_EVENT_COUNT = 3
+PURGE_BATCH_SIZE = 500
 
 
 def cast_logo(instance, filename: str) -> str:
     """
-    Generate cast logo filename from cast slug
+    Generate cast logo filename from cast slug and content hash
     """
-    return f"casts/{instance.slug}/logo.{filename.split('.')[-1]}"
+    return f"casts/{instance.slug}/logo/{filename}"
 
 
 def cast_photo(instance, filename: str) -> str:
     """
-    Generate cast photo filename from cast slug
+    Generate cast photo filename from cast slug and content hash
+    """
+    return f"casts/{instance.cast.slug}/photos/{fan_out(filename)}"
+
+
+def validate_timezone(value: str):
+    """
+    Raises an error if the value is not a known time zone name
+    """
+    if value not in pytz.all_timezones_set:
+        raise ValidationError(f"{value} is not a known time zone")
+
+
+def default_timezone() -> str:
+    """
+    Returns the site's time zone for casts that haven't set their own
+    """
+    return settings.TIME_ZONE
+
+
+class Membership(NamedTuple):
+    """
+    A profile's full relationship to a cast
+    """
+
+    manager: bool = False
+    member: bool = False
+    requested: bool = False
+    blocked: bool = False
+
+    @classmethod
+    def from_state(cls, state: int = None) -> "Membership":
+        """
+        Returns the relationship for a CastMembership state
+        """
+        return cls(
+            manager=state == CastMembership.MANAGER,
+            member=state in (CastMembership.MEMBER, CastMembership.MANAGER),
+            requested=state == CastMembership.REQUESTED,
+            blocked=state == CastMembership.BLOCKED,
+        )
+
+
+class CastQuerySet(models.QuerySet):
+    """
+    Cast queryset with bulk loading helpers
     """
-    return f"casts/{instance.cast.slug}/photos/{filename}"
+
+    def with_related(self, fields: [str] = None) -> "CastQuerySet":
+        """
+        Prefetches the profile id lists and upcoming events of every cast
+
+        Serializing the result takes the same number of queries regardless of
+        how many casts are returned. If serialized fields are given, only the
+        columns, related data, and profile counts they need are loaded.
+        """
+        query = self
+        if fields is not None:
+            columns = [f.name for f in Cast._meta.concrete_fields if f.name in fields]
+            if "logo_thumbnails" in fields:
+                columns.append("logo")
+            query = query.only("pk", *columns)
+            for key, count in Cast.PROFILE_COUNTS.items():
+                if count in fields:
+                    states = CastMembership.LISTS[key]
+                    query = query.annotate(
+                        **{
+                            count: Count(
+                                "memberships", filter=Q(memberships__state__in=states),
+                            )
+                        }
+                    )
+        if fields is None or set(fields) & set(CastMembership.LISTS):
+            memberships = CastMembership.objects.only("cast", "profile", "state")
+            query = query.prefetch_related(
+                Prefetch("memberships", queryset=memberships.order_by("profile"))
+            )
+        if fields is None or "upcoming_events" in fields:
+            now = timezone.now()
+            # Top-N per cast is resolved in the database with a correlated subquery
+            next_events = Event.objects.filter(
+                cast=OuterRef("cast"), start__gte=now
+            ).order_by("start", "pk")
+            upcoming = Event.objects.filter(
+                start__gte=now,
+                pk__in=Subquery(next_events.values("pk")[:UPCOMING_EVENT_COUNT]),
+            ).order_by("start", "pk")
+            query = query.prefetch_related(
+                Prefetch(
+                    "events", queryset=upcoming, to_attr="prefetched_upcoming_events"
+                )
+            )
+        return query
+
+
+class CastManager(models.Manager):
+    """
+    Manager hiding deleted casts
+    """
+
+    def get_queryset(self) -> models.QuerySet:
+        return super().get_queryset().filter(deleted__isnull=True)
+
+
+class CastContentManager(models.Manager):
+    """
+    Manager hiding the content of deleted casts
+    """
+
+    def get_queryset(self) -> models.QuerySet:
+        return super().get_queryset().filter(cast__deleted__isnull=True)
 
 
 class Cast(models.Model):
@@ -30,17 +167,13 @@ class Cast(models.Model):
     name = models.CharField(max_length=128, unique=True)
     slug = models.SlugField(max_length=200, unique=True, blank=True)
     description = models.TextField()
-    logo = ImageField(blank=True, upload_to=cast_logo)
+    logo = HashedImageField(blank=True, upload_to=cast_logo)
+    logo_thumbnails = models.TextField(blank=True, editable=False)
     email = models.EmailField(max_length=128)
     created = models.DateTimeField(default=timezone.now, editable=False)
     modified = models.DateTimeField(default=timezone.now)
-
-    managers = models.ManyToManyField("users.Profile", related_name="managed_casts")
-    members = models.ManyToManyField("users.Profile", related_name="member_casts")
-    member_requests = models.ManyToManyField(
-        "users.Profile", related_name="requested_casts"
-    )
-    blocked = models.ManyToManyField("users.Profile", related_name="blocked_casts")
+    # Set when the cast is deleted until its content is purged
+    deleted = models.DateTimeField(null=True, editable=False, db_index=True)
 
     # Social Links
     external_url = models.URLField(blank=True)
@@ -48,6 +181,18 @@ class Cast(models.Model):
     twitter_user = models.CharField(max_length=15, blank=True)
     instagram_user = models.CharField(max_length=30, blank=True)
 
+    # Event dates are shown in the cast's local time. Named last so it doesn't
+    # shadow the timezone module in the fields above
+    timezone = models.CharField(
+        max_length=64, default=default_timezone, validators=[validate_timezone]
+    )
+
+    objects = CastManager.from_queryset(CastQuerySet)()
+    all_objects = CastQuerySet.as_manager()
+
+    # Annotated counts of some profile lists
+    PROFILE_COUNTS = {"members": "member_count", "managers": "manager_count"}
+
     def save(self, *args, **kwargs):
         """
         Add computed values and save model
@@ -57,29 +202,212 @@ class Cast(models.Model):
         self.modified = timezone.now()
         super(Cast, self).save(*args, **kwargs)
 
+    def touch(self):
+        """
+        Bumps the modified time to mark a change in related data
+        """
+        self.modified = timezone.now()
+        Cast.objects.filter(pk=self.pk).update(modified=self.modified)
+
+    def soft_delete(self):
+        """
+        Hides the cast at once and queues its content to be purged
+
+        The name and slug are freed for new casts
+        """
+        self.deleted = timezone.now()
+        self.name = self.slug = f"deleted-{uuid4().hex}"
+        Cast.all_objects.filter(pk=self.pk).update(
+            deleted=self.deleted, name=self.name, slug=self.slug
+        )
+        invalidate_calendars(self.pk)
+        tasks.defer(purge_cast, self.pk)
+
+    def profile_ids(self, key: str) -> [int]:
+        """
+        Returns the profile ids in one of the cast's profile lists
+
+        Uses prefetched memberships when available
+        """
+        states = CastMembership.LISTS[key]
+        prefetched = getattr(self, "_prefetched_objects_cache", {})
+        if "memberships" in prefetched:
+            return [
+                m.profile_id for m in prefetched["memberships"] if m.state in states
+            ]
+        return list(
+            self.memberships.filter(state__in=states)
+            .order_by("profile")
+            .values_list("profile", flat=True)
+        )
+
+    def _profiles(self, key: str) -> "QuerySet[users.Profile]":
+        """
+        Returns the profiles in one of the cast's profile lists
+        """
+        return Profile.objects.filter(
+            cast_memberships__cast=self,
+            cast_memberships__state__in=CastMembership.LISTS[key],
+        )
+
+    @property
+    def managers(self) -> "QuerySet[users.Profile]":
+        """
+        Returns the cast's manager profiles
+        """
+        return self._profiles("managers")
+
+    @property
+    def members(self) -> "QuerySet[users.Profile]":
+        """
+        Returns the cast's member profiles, including managers
+        """
+        return self._profiles("members")
+
+    @property
+    def member_requests(self) -> "QuerySet[users.Profile]":
+        """
+        Returns the profiles requesting cast membership
+        """
+        return self._profiles("member_requests")
+
+    @property
+    def blocked(self) -> "QuerySet[users.Profile]":
+        """
+        Returns the profiles blocked from the cast
+        """
+        return self._profiles("blocked")
+
+    def membership(self, profile: "users.Profile", refresh: bool = False) -> Membership:
+        """
+        Returns a profile's relationship to the cast
+
+        Resolved with a single query, or none if memberships were prefetched,
+        and memoized on the instance until refreshed
+        """
+        cache = self.__dict__.setdefault("_membership_cache", {})
+        if refresh or profile.pk not in cache:
+            cache[profile.pk] = self._resolve_membership(profile)
+        return cache[profile.pk]
+
+    def _resolve_membership(self, profile: "users.Profile") -> Membership:
+        """
+        Looks up a profile's relationship to the cast
+        """
+        prefetched = getattr(self, "_prefetched_objects_cache", {})
+        if "memberships" in prefetched:
+            states = [
+                m.state for m in prefetched["memberships"] if m.profile_id == profile.pk
+            ]
+            state = states[0] if states else None
+        else:
+            state = (
+                self.memberships.filter(profile=profile.pk)
+                .values_list("state", flat=True)
+                .first()
+            )
+        return Membership.from_state(state)
+
+    def _transition(
+        self, profile: "users.Profile", source: (int,), target: int = None
+    ) -> bool:
+        """
+        Atomically moves a profile between membership states
+
+        Only a membership currently in a source state is changed. A None source
+        inserts a new membership and a None target deletes it. Returns False if
+        nothing matched, in which case the memoized state is refreshed.
+        """
+        states = [state for state in source if state is not None]
+        query = self.memberships.filter(profile=profile.pk, state__in=states)
+        with transaction.atomic():
+            if target is None:
+                changed = query.delete()[0]
+            else:
+                changed = query.update(state=target, modified=timezone.now())
+            if not changed and None in source:
+                try:
+                    with transaction.atomic():
+                        self.memberships.create(profile=profile, state=target)
+                    changed = 1
+                except IntegrityError:
+                    pass
+        cache = self.__dict__.setdefault("_membership_cache", {})
+        if changed:
+            self.touch()
+            cache[profile.pk] = Membership.from_state(target)
+        else:
+            cache[profile.pk] = self._resolve_membership(profile)
+        return bool(changed)
+
+    def bulk_transition(self, action: str, profile_ids: [int]) -> {int: str}:
+        """
+        Applies a bulk membership action to many profiles at once
+
+        Profiles are validated with set-based queries and the changes written
+        with one insert, update, and delete in a single transaction. Returns a
+        mapping of profile id to an error message, or None if it succeeded.
+        """
+        source, target = CastMembership.BULK_ACTIONS[action]
+        profile_ids = list(dict.fromkeys(profile_ids))
+        results = dict.fromkeys(profile_ids, "Profile does not exist")
+        with transaction.atomic():
+            found = Profile.objects.filter(pk__in=profile_ids).values_list(
+                "pk", flat=True
+            )
+            states = dict.fromkeys(found)
+            states.update(
+                self.memberships.select_for_update()
+                .filter(profile__in=list(states))
+                .values_list("profile", "state")
+            )
+            new, existing = [], []
+            for pid, state in states.items():
+                if state not in source:
+                    desc = CastMembership.DESCRIPTIONS[state]
+                    results[pid] = f"Cannot {action} a profile that is {desc}"
+                    continue
+                results[pid] = None
+                (new if state is None else existing).append(pid)
+            query = self.memberships.filter(profile__in=existing)
+            if target is None:
+                query.delete()
+            else:
+                query.update(state=target, modified=timezone.now())
+                CastMembership.objects.bulk_create(
+                    CastMembership(cast=self, profile_id=pid, state=target)
+                    for pid in new
+                )
+            if new or existing:
+                self.touch()
+        self.__dict__.pop("_membership_cache", None)
+        getattr(self, "_prefetched_objects_cache", {}).pop("memberships", None)
+        return results
+
     def add_manager(self, profile: "users.Profile"):
         """
         Adds a new profile to managers or raises an error
         """
-        if self.is_manager(profile):
+        if self._transition(profile, (CastMembership.MEMBER,), CastMembership.MANAGER):
+            return
+        if self.membership(profile).manager:
             raise ValueError(f"{profile} is already a manager of {self}")
-        if not self.is_member(profile):
-            raise ValueError(f"{profile} is not a member of {self}")
-        self.managers.add(profile)
+        raise ValueError(f"{profile} is not a member of {self}")
 
     def remove_manager(self, profile: "users.Profile"):
         """
         Remove a profile from managers
         """
-        if not self.is_manager(profile):
+        if not self._transition(
+            profile, (CastMembership.MANAGER,), CastMembership.MEMBER
+        ):
             raise ValueError(f"{profile} is not a manager or {self}")
-        self.managers.remove(profile)  # pylint: disable=E1101
 
     def is_manager(self, profile: "users.Profile") -> bool:
         """
         Returns True if a profile is a cast manager
         """
-        return bool(self.managers.filter(pk=profile.pk))
+        return self.membership(profile, refresh=True).manager
 
     def add_member(self, profile: "users.Profile"):
         """
@@ -87,87 +415,106 @@ class Cast(models.Model):
 
         Removes membership request if applicable
         """
-        if self.is_member(profile):
-            raise ValueError(f"{profile} is already a member of {self}")
-        if self.is_blocked(profile):
+        if self._transition(
+            profile, (CastMembership.REQUESTED, None), CastMembership.MEMBER
+        ):
+            return
+        if self.membership(profile).blocked:
             raise ValueError(f"{profile} is blocked from joining {self}")
-        self.members.add(profile)
-        if self.has_requested_membership(profile):
-            self.remove_member_request(profile)
+        raise ValueError(f"{profile} is already a member of {self}")
 
     def remove_member(self, profile: "users.Profile"):
         """
         Remove a profile from members
         """
-        if self.is_manager(profile):
+        if self._transition(profile, (CastMembership.MEMBER,)):
+            return
+        if self.membership(profile).manager:
             raise ValueError(
                 f"{profile} cannot be removed because they are a manager of {self}"
             )
-        if not self.is_member(profile):
-            raise ValueError(f"{profile} is not a member or {self}")
-        self.members.remove(profile)  # pylint: disable=E1101
+        raise ValueError(f"{profile} is not a member or {self}")
 
     def is_member(self, profile: "users.Profile") -> bool:
         """
         Returns True if a profile is a member of the cast
         """
-        return bool(self.members.filter(pk=profile.pk))
+        return self.membership(profile, refresh=True).member
 
     def add_member_request(self, profile: "users.Profile"):
         """
         Adds a new profile to membership requests or raises an error
         """
-        if self.is_member(profile):
+        if self._transition(profile, (None,), CastMembership.REQUESTED):
+            return
+        state = self.membership(profile)
+        if state.member:
             raise ValueError(f"{profile} is already a member of {self}")
-        if self.has_requested_membership(profile):
+        if state.requested:
             raise ValueError(f"{profile} has already requested to join {self}")
-        if self.is_blocked(profile):
-            raise ValueError(f"{profile} is blocked from joining {self}")
-        self.member_requests.add(profile)
+        raise ValueError(f"{profile} is blocked from joining {self}")
 
     def remove_member_request(self, profile: "users.Profile"):
         """
         Removes a profile from membership requests
         """
-        if not self.has_requested_membership(profile):
+        if not self._transition(profile, (CastMembership.REQUESTED,)):
             raise ValueError(f"{profile} has not requested to join {self}")
-        self.member_requests.remove(profile)  # pylint: disable=E1101
 
     def has_requested_membership(self, profile: "users.Profile") -> bool:
         """
         Returns True if a profile has requested cast membership
         """
-        return bool(self.member_requests.filter(pk=profile.pk))
+        return self.membership(profile, refresh=True).requested
 
     def block_user(self, profile: "users.Profile"):
         """
         Adds a new profile to blocked users or raises an error
 
-        Removes membership if applicable
+        Removes membership or membership request if applicable
         """
-        if self.is_manager(profile):
+        source = (CastMembership.REQUESTED, CastMembership.MEMBER, None)
+        if self._transition(profile, source, CastMembership.BLOCKED):
+            return
+        if self.membership(profile).manager:
             raise ValueError(
                 f"{profile} cannot be blocked because they are a manager of {self}"
             )
-        if self.is_blocked(profile):
-            raise ValueError(f"{profile} is already blocked from {self}")
-        if self.is_member(profile):
-            self.remove_member(profile)
-        self.blocked.add(profile)
+        raise ValueError(f"{profile} is already blocked from {self}")
 
     def unblock_user(self, profile: "users.Profile"):
         """
         Remove a profile from blocked users
         """
-        if not self.is_blocked(profile):
+        if not self._transition(profile, (CastMembership.BLOCKED,)):
             raise ValueError(f"{profile} is not blocked from {self}")
-        self.blocked.remove(profile)  # pylint: disable=E1101
 
     def is_blocked(self, profile: "users.Profile") -> bool:
         """
         Returns True if a profile is blocked from the cast
         """
-        return bool(self.blocked.filter(pk=profile.pk))
+        return self.membership(profile, refresh=True).blocked
+
+    def reorder_sections(self, section_ids: [int]):
+        """
+        Sets the order of all page sections from a list of their ids
+
+        Raises an error unless every section of the cast is listed once
+        """
+        sections = {
+            section.pk: section for section in self.page_sections.only("cast", "order")
+        }
+        if len(section_ids) != len(sections) or set(section_ids) != set(sections):
+            raise ValueError(f"Every page section of {self} must be listed once")
+        changed = []
+        for order, pk in enumerate(section_ids, start=1):
+            if sections[pk].order != order:
+                sections[pk].order = order
+                changed.append(sections[pk])
+        if changed:
+            with transaction.atomic():
+                PageSection.objects.bulk_update(changed, ["order"])
+                self.touch()
 
     @property
     def future_events(self) -> ["Event"]:
@@ -181,12 +528,78 @@ class Cast(models.Model):
         """
         Returns the first few future events
         """
-        return self.future_events[:3]
+        if hasattr(self, "prefetched_upcoming_events"):
+            return self.prefetched_upcoming_events
+        return self.future_events[:UPCOMING_EVENT_COUNT]
 
     def __str__(self) -> str:
         return self.name
 
 
+class CastMembership(models.Model):
+    """
+    A profile's membership state in a cast
+
+    Managers are always members, so each profile has at most one state per cast
+    """
+
+    REQUESTED = 1
+    MEMBER = 2
+    MANAGER = 3
+    BLOCKED = 4
+
+    STATES = (
+        (REQUESTED, "Requested"),
+        (MEMBER, "Member"),
+        (MANAGER, "Manager"),
+        (BLOCKED, "Blocked"),
+    )
+
+    # States included in each of the cast profile lists
+    LISTS = {
+        "managers": (MANAGER,),
+        "members": (MEMBER, MANAGER),
+        "member_requests": (REQUESTED,),
+        "blocked": (BLOCKED,),
+    }
+
+    # Bulk actions as (source states, target state) where None is no membership
+    BULK_ACTIONS = {
+        "add": ((None, REQUESTED), MEMBER),
+        "approve": ((REQUESTED,), MEMBER),
+        "remove": ((MEMBER,), None),
+        "block": ((None, REQUESTED, MEMBER), BLOCKED),
+    }
+
+    # Describes a profile in each state for error messages
+    DESCRIPTIONS = {
+        None: "not a member",
+        REQUESTED: "requesting membership",
+        MEMBER: "already a member",
+        MANAGER: "a manager",
+        BLOCKED: "blocked",
+    }
+
+    cast = models.ForeignKey(Cast, on_delete=models.CASCADE, related_name="memberships")
+    profile = models.ForeignKey(
+        "users.Profile", on_delete=models.CASCADE, related_name="cast_memberships"
+    )
+    state = models.PositiveSmallIntegerField(choices=STATES)
+    created = models.DateTimeField(default=timezone.now, editable=False)
+    modified = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["cast", "profile"], name="unique_cast_membership"
+            )
+        ]
+        indexes = [models.Index(fields=["cast", "state"])]
+
+    def __str__(self) -> str:
+        return f"{self.cast.name} | {self.profile} | {self.get_state_display()}"
+
+
 class PageSection(models.Model):
     """
     Additional content sections beyond the built-ins
@@ -200,22 +613,153 @@ class PageSection(models.Model):
     order = models.PositiveSmallIntegerField(default=1)
     created = models.DateTimeField(default=timezone.now, editable=False)
 
+    # Rendered from text in the background after it changes
+    html = models.TextField(blank=True, editable=False)
+    summary = models.CharField(max_length=256, blank=True, editable=False)
+
+    objects = CastContentManager()
+
     class Meta:
         ordering = ["order"]
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._rendered_text = instance.__dict__.get("text")
+        return instance
+
+    def save(self, *args, **kwargs):
+        """
+        Save model and queue rendering if the text changed
+        """
+        changed = "text" in self.__dict__ and self.text != getattr(
+            self, "_rendered_text", None
+        )
+        if changed:
+            self.html = self.summary = ""
+        elif not self._state.adding and kwargs.get("update_fields") is None:
+            # Leave rendered content to the renderer so it is never overwritten
+            skip = {"html", "summary", *self.get_deferred_fields()}
+            kwargs["update_fields"] = [
+                field.name
+                for field in self._meta.concrete_fields
+                if not field.primary_key and field.attname not in skip
+            ]
+        super().save(*args, **kwargs)
+        if changed:
+            self._rendered_text = self.text
+            tasks.defer(render_page_section, self.pk)
+
     def __str__(self) -> str:
         return f"{self.cast.name} | {self.title}"
 
 
+def render_page_section(pk: int):
+    """
+    Stores the rendered HTML and summary of a page section's current text
+    """
+    section = PageSection.objects.filter(pk=pk).only("cast", "text").first()
+    if section is None:
+        return
+    rendered = PageSection.objects.filter(pk=pk, text=section.text).update(
+        html=render_html(section.text), summary=render_summary(section.text)
+    )
+    if rendered:
+        Cast.objects.filter(pk=section.cast_id).update(modified=timezone.now())
+
+
 class CastPhoto(models.Model):
     """
     Photos associated with a cast profile
     """
 
     cast = models.ForeignKey(Cast, on_delete=models.CASCADE, related_name="photos")
-    image = ImageField(upload_to=cast_photo)
+    image = HashedImageField(upload_to=cast_photo)
+    image_webp = HashedImageField(blank=True, editable=False, upload_to=cast_photo)
+    image_thumbnails = models.TextField(blank=True, editable=False)
+    image_hash = models.BigIntegerField(null=True, editable=False)
+    duplicate_of = models.ForeignKey(
+        "self",
+        null=True,
+        editable=False,
+        on_delete=models.SET_NULL,
+        related_name="duplicates",
+    )
     description = models.TextField(blank=True)
     created = models.DateTimeField(default=timezone.now, editable=False)
 
+    objects = CastContentManager()
+
+    # Near-duplicates are looked for among photos of the same cast
+    DUPLICATE_SCOPE = "cast"
+
     class Meta:
         ordering = ["-pk"]
+        indexes = [models.Index(fields=["cast", "image_hash"])]
+
+
+def purge_cast(pk: int, batch_size: int = PURGE_BATCH_SIZE):
+    """
+    Deletes a deleted cast and all of its content
+
+    Rows are deleted in batches, each in its own short transaction, so a large
+    cast never locks its tables for long. An interrupted purge continues where
+    it stopped when run again.
+    """
+    content = (
+        (Casting, "event__cast"),
+        (Event, "cast"),
+        (ArchivedCasting, "event__cast"),
+        (ArchivedEvent, "cast"),
+        (CastPhoto, "cast"),
+        (PageSection, "cast"),
+        (CastMembership, "cast"),
+    )
+    if not Cast.all_objects.filter(pk=pk, deleted__isnull=False).exists():
+        return
+    for model, lookup in content:
+        query = model._base_manager.filter(**{lookup: pk})
+        while True:
+            with transaction.atomic():
+                batch = list(query.values_list("pk", flat=True)[:batch_size])
+                if not batch:
+                    break
+                model._base_manager.filter(pk__in=batch).delete()
+    Cast.all_objects.filter(pk=pk).delete()
+
+
+@receiver(post_save, sender=Event)
+@receiver(post_delete, sender=Event)
+@receiver(post_save, sender=PageSection)
+@receiver(post_delete, sender=PageSection)
+@receiver(post_save, sender=CastPhoto)
+@receiver(post_delete, sender=CastPhoto)
+def touch_cast(sender, instance, **kwargs):
+    """
+    Bumps the owning cast's modified time when its content changes
+    """
+    Cast.objects.filter(pk=instance.cast_id).update(modified=timezone.now())
+
+
+@receiver(post_save, sender=Cast)
+def invalidate_cast_calendars(sender, instance, **kwargs):
+    """
+    Expires cached calendars in case the cast's time zone changed
+    """
+    invalidate_calendars(instance.pk)
+
+
+@receiver(post_save, sender=Cast)
+def generate_logo_thumbnails(sender, instance, **kwargs):
+    """
+    Queues thumbnail generation for a new or changed cast logo
+    """
+    queue_thumbnails(instance, "logo")
+
+
+@receiver(post_save, sender=CastPhoto)
+def ingest_photo(sender, instance, **kwargs):
+    """
+    Queues a new cast photo for ingest and thumbnail generation
+    """
+    queue_ingest(instance, "image")
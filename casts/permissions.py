@@ -16,7 +16,7 @@ def check_manager(obj, profile) -> bool:
             break
     if hasattr(obj, "cast"):
         obj = obj.cast
-    return obj.is_manager(profile)
+    return obj.membership(profile).manager
 
 
 class IsManager(permissions.BasePermission):
@@ -0,0 +1,25 @@
+"""
+Render page section text for display
+"""
+
+# django
+from django.utils.html import linebreaks, strip_tags, urlize
+from django.utils.text import Truncator
+
+SUMMARY_LENGTH = 200
+
+
+def render_html(text: str) -> str:
+    """
+    Returns text as sanitized HTML paragraphs with links
+
+    All user input is escaped, so the only markup is generated here
+    """
+    return linebreaks(urlize(text, nofollow=True, autoescape=True))
+
+
+def render_summary(text: str) -> str:
+    """
+    Returns a short single-line plain-text summary without any markup
+    """
+    return Truncator(" ".join(strip_tags(text).split())).chars(SUMMARY_LENGTH)
@@ -1,17 +1,51 @@
 """
 """
 
-from rest_framework.serializers import ModelSerializer
+from rest_framework.serializers import ModelSerializer, ReadOnlyField
+from assets.serializers import ThumbnailsField
 from events.serializers import EventSerializer
-from .models import Cast, CastPhoto, PageSection
+from .models import Cast, CastMembership, CastPhoto, PageSection
+
+
+class ProfileListField(ReadOnlyField):
+    """
+    Read-only list of the profile ids in one of a cast's profile lists
+    """
+
+    def get_attribute(self, instance: Cast) -> [int]:
+        return instance.profile_ids(self.source)
+
+
+class ProfileCountField(ReadOnlyField):
+    """
+    Read-only count of the profiles in one of a cast's profile lists
+
+    Uses the queryset annotation of the same name when available
+    """
+
+    def get_attribute(self, instance: Cast) -> int:
+        count = getattr(instance, self.field_name, None)
+        if count is None:
+            count = len(instance.profile_ids(self.source))
+        return count
 
 
 class CastSerializer(ModelSerializer):
     """
     Serializer for the casts.Cast model
+
+    A "fields" list in the context limits the serialized fields. Otherwise the
+    profile counts are left out.
     """
 
+    managers = ProfileListField()
+    members = ProfileListField()
+    member_requests = ProfileListField()
+    blocked = ProfileListField()
+    member_count = ProfileCountField(source="members")
+    manager_count = ProfileCountField(source="managers")
     upcoming_events = EventSerializer(many=True, read_only=True)
+    logo_thumbnails = ThumbnailsField(source="logo")
 
     class Meta:
         model = Cast
@@ -21,7 +55,9 @@ class CastSerializer(ModelSerializer):
             "slug",
             "description",
             "logo",
+            "logo_thumbnails",
             "email",
+            "timezone",
             "created",
             "external_url",
             "facebook_url",
@@ -31,6 +67,8 @@ class CastSerializer(ModelSerializer):
             "members",
             "member_requests",
             "blocked",
+            "member_count",
+            "manager_count",
             # "future_events",
             "upcoming_events",
         )
@@ -45,6 +83,44 @@ class CastSerializer(ModelSerializer):
             "upcoming_events",
         )
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        fields = self.context.get("fields")
+        if fields is None:
+            fields = self.default_fields()
+        for name in set(self.fields) - set(fields):
+            self.fields.pop(name)
+
+    @classmethod
+    def default_fields(cls) -> (str,):
+        """
+        Returns the fields serialized when no selection is made
+        """
+        counts = Cast.PROFILE_COUNTS.values()
+        return tuple(name for name in cls.Meta.fields if name not in counts)
+
+    @classmethod
+    def select_fields(cls, params: "QueryDict") -> (str,):
+        """
+        Returns the fields selected by request query params or None by default
+
+        Supports comma-separated "fields" and "omit" lists and a "compact" flag
+        which replaces the profile id lists with counts
+        """
+        if not any(key in params for key in ("fields", "omit", "compact")):
+            return None
+        if "fields" in params:
+            fields = params["fields"].split(",")
+        elif params.get("compact", "").lower() in ("1", "true"):
+            lists = CastMembership.LISTS
+            fields = [name for name in cls.Meta.fields if name not in lists]
+        else:
+            fields = cls.default_fields()
+        omit = params.get("omit", "").split(",")
+        return tuple(
+            name for name in cls.Meta.fields if name in fields and name not in omit
+        )
+
 
 class PageSectionSerializer(ModelSerializer):
     """
@@ -53,8 +129,8 @@ class PageSectionSerializer(ModelSerializer):
 
     class Meta:
         model = PageSection
-        fields = ("id", "cast", "title", "text", "order", "created")
-        read_only_fields = ("cast", "created")
+        fields = ("id", "cast", "title", "text", "html", "summary", "order", "created")
+        read_only_fields = ("cast", "html", "summary", "created")
 
 
 class CastPhotoSerializer(ModelSerializer):
@@ -62,7 +138,18 @@ class CastPhotoSerializer(ModelSerializer):
     A serializer for the casts.CastPhoto model
     """
 
+    thumbnails = ThumbnailsField(source="image")
+
     class Meta:
         model = CastPhoto
-        fields = ("id", "cast", "image", "description", "created")
-        read_only_fields = ("cast", "image", "created")
+        fields = (
+            "id",
+            "cast",
+            "image",
+            "image_webp",
+            "thumbnails",
+            "duplicate_of",
+            "description",
+            "created",
+        )
+        read_only_fields = ("cast", "image", "image_webp", "duplicate_of", "created")
@@ -1,20 +1,27 @@
 # stdlib
-from datetime import datetime
+from datetime import datetime, timedelta
+from io import StringIO
 from shutil import rmtree
+from unittest.mock import patch
 
 # django
 from django.conf import settings
 from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
+from django.utils import timezone
 
 # library
 from rest_framework import status
 from rest_framework.test import APIClient
 
 # app
+from events.models import Casting, Event
 from users.tests.test_user_photo import make_image
-from ..models import Cast
+from ..models import Cast, CastMembership, CastPhoto, Membership, PageSection
 
 
 class CastModelTestCase(TestCase):
@@ -34,6 +41,32 @@ class CastModelTestCase(TestCase):
         self.assertIsInstance(self.cast.created, datetime)
         self.assertIsInstance(self.cast.modified, datetime)
 
+    def test_soft_delete(self):
+        """Tests a deleted cast is hidden at once and purged later"""
+        self.cast.add_member(self.profile)
+        event = Event.objects.create(
+            name="Test Event",
+            description="Test",
+            venue="Test",
+            start=timezone.now(),
+            cast=self.cast,
+        )
+        Casting.objects.create(event=event, role=Casting.FRANK, writein="Test")
+        PageSection.objects.create(cast=self.cast, title="Test", text="Test")
+        # Simulates a worker that has not run the purge yet
+        with patch("rrc.tasks.defer"):
+            self.cast.soft_delete()
+        self.assertFalse(Cast.objects.filter(pk=self.cast.pk).exists())
+        for model in (Event, Casting, PageSection):
+            self.assertFalse(model.objects.exists())
+            self.assertTrue(model._base_manager.exists())
+        # The name is free for a new cast
+        Cast.objects.create(name="Test Cast")
+        call_command("purge_casts", batch_size=1, stdout=StringIO())
+        self.assertFalse(Cast.all_objects.filter(pk=self.cast.pk).exists())
+        for model in (Event, Casting, PageSection, CastMembership):
+            self.assertFalse(model._base_manager.exists())
+
     def _add_check_remove(self, fadd, fcheck, fremv):
         """Runs lifecycle checks on a user"""
         self.assertFalse(fcheck(self.profile))
@@ -145,6 +178,54 @@ class CastModelTestCase(TestCase):
         self.assertTrue(self.cast.is_blocked(self.profile))
         self.assertFalse(self.cast.is_member(self.profile))
 
+    def test_membership(self):
+        """Tests the full membership state is resolved in one query"""
+        with self.assertNumQueries(1):
+            self.assertEqual(self.cast.membership(self.profile), Membership())
+        self.cast.add_member(self.profile)
+        self.cast.add_manager(self.profile)
+        with self.assertNumQueries(0):
+            state = self.cast.membership(self.profile)
+        self.assertEqual(state, Membership(manager=True, member=True))
+        cast = Cast.objects.get(pk=self.cast.pk)
+        with self.assertNumQueries(1):
+            self.assertEqual(cast.membership(self.profile), state)
+        cast = Cast.objects.with_related().get(pk=self.cast.pk)
+        with self.assertNumQueries(0):
+            self.assertEqual(cast.membership(self.profile), state)
+
+    def test_single_membership_row(self):
+        """Each profile has at most one membership state per cast"""
+        self.cast.add_member_request(self.profile)
+        self.cast.add_member(self.profile)
+        self.cast.add_manager(self.profile)
+        membership = CastMembership.objects.get(cast=self.cast, profile=self.profile)
+        self.assertEqual(membership.state, CastMembership.MANAGER)
+        self.assertEqual(self.cast.profile_ids("members"), [self.profile.pk])
+        self.assertEqual(self.cast.profile_ids("managers"), [self.profile.pk])
+        self.assertEqual(self.cast.profile_ids("member_requests"), [])
+
+    def test_stale_approval(self):
+        """Approving a request already approved elsewhere should fail"""
+        self.cast.add_member_request(self.profile)
+        other = Cast.objects.get(pk=self.cast.pk)
+        self.assertTrue(other.membership(self.profile).requested)
+        self.cast.add_member(self.profile)
+        with self.assertRaises(ValueError):
+            other.add_member(self.profile)
+        self.assertTrue(other.membership(self.profile).member)
+        self.assertEqual(
+            CastMembership.objects.filter(cast=self.cast, profile=self.profile).count(),
+            1,
+        )
+
+    def test_block_removes_request(self):
+        """Blocking a profile should replace its membership request"""
+        self.cast.add_member_request(self.profile)
+        self.cast.block_user(self.profile)
+        self.assertTrue(self.cast.is_blocked(self.profile))
+        self.assertFalse(self.cast.has_requested_membership(self.profile))
+
 
 class CastAPITestCase(TestCase):
     """
@@ -173,6 +254,59 @@ class CastAPITestCase(TestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(len(response.data), 2)
 
+    def test_list_paginated(self):
+        """Tests walking the cast list with cursors"""
+        response = self.client.get(reverse("casts"), {"page_size": 1})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIsNone(response.data["previous"])
+        self.assertEqual(len(response.data["results"]), 1)
+        self.assertEqual(response.data["results"][0]["id"], self.cast2.pk)
+        response = self.client.get(response.data["next"])
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data["results"]), 1)
+        self.assertEqual(response.data["results"][0]["id"], self.cast1.pk)
+        self.assertIsNone(response.data["next"])
+        response = self.client.get(reverse("casts"), {"cursor": "bad"})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_list_fields(self):
+        """Tests selecting and omitting serialized fields"""
+        response = self.client.get(reverse("casts"), {"fields": "id,name,bad"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(set(response.data[0]), {"id", "name"})
+        response = self.client.get(reverse("casts"), {"omit": "members,blocked"})
+        self.assertNotIn("members", response.data[0])
+        self.assertNotIn("blocked", response.data[0])
+        self.assertNotIn("member_count", response.data[0])
+        self.assertIn("managers", response.data[0])
+
+    def test_list_compact(self):
+        """Tests compact mode replaces profile lists with counts"""
+        profile = User.objects.create_user(username="mctest").profile
+        self.cast1.add_member(profile)
+        response = self.client.get(
+            reverse("casts"), {"compact": "1", "omit": "upcoming_events"}
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        data = {cast["id"]: cast for cast in response.data}
+        for key in ("managers", "members", "member_requests", "blocked"):
+            self.assertNotIn(key, data[self.cast1.pk])
+        self.assertEqual(data[self.cast1.pk]["member_count"], 2)
+        self.assertEqual(data[self.cast1.pk]["manager_count"], 1)
+        self.assertEqual(data[self.cast2.pk]["member_count"], 0)
+        self.assertNotIn("upcoming_events", data[self.cast1.pk])
+
+    def test_retrieve_fields(self):
+        """Tests narrowed detail requests load only the selected data"""
+        url = reverse("cast", kwargs={"pk": self.cast1.pk})
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url, {"fields": "name,member_count"})
+        self.assertEqual(response.data, {"name": self.cast1.name, "member_count": 1})
+        queries = [query["sql"] for query in context.captured_queries]
+        self.assertFalse(any('FROM "events_event"' in sql for sql in queries))
+        cast_query = next(sql for sql in queries if "member_count" in sql)
+        self.assertNotIn('"description"', cast_query)
+
     def test_create(self):
         """Tests creating a new cast"""
         name, desc, email = "New Cast", "A new cast", "test@cast.io"
@@ -199,6 +333,43 @@ class CastAPITestCase(TestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertIn("name", response.data)
 
+    def test_conditional_retrieve(self):
+        """Tests cast detail validators and not modified responses"""
+        url = reverse("cast", kwargs={"pk": self.cast1.pk})
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        etag = response["ETag"]
+        self.assertIn("Last-Modified", response)
+        with self.assertNumQueries(1):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response["ETag"], etag)
+        response = self.client.get(
+            reverse("cast-slug", kwargs={"slug": self.cast1.slug}),
+            HTTP_IF_NONE_MATCH=etag,
+        )
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        # Related changes should bump the cast version
+        profile = User.objects.create_user(username="mctest").profile
+        self.cast1.add_member_request(profile)
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        etag = response["ETag"]
+        Event.objects.create(
+            name="Test Event",
+            cast=self.cast1,
+            description="A test event",
+            venue="A place",
+            start=timezone.now() + timedelta(days=1),
+        )
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data["upcoming_events"]), 1)
+        response = self.client.get(
+            reverse("cast", kwargs={"pk": 0}), HTTP_IF_NONE_MATCH=etag
+        )
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
     def test_update(self):
         """"Tests updating cast details"""
         self.assertEqual(self.cast1.name, "Test Cast")
@@ -253,6 +424,7 @@ class CastAPITestCase(TestCase):
         self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
         response = self.client.delete(reverse("cast", kwargs={"pk": self.cast1.pk}))
         self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertFalse(Cast.all_objects.filter(pk=self.cast1.pk).exists())
 
 
 class CastListAPITestCase(TestCase):
@@ -332,3 +504,225 @@ class CastListAPITestCase(TestCase):
     def test_blocked_list(self):
         """Tests blocked user add/remove endpoint"""
         self._list_add_check_remove("cast-blocked", "is_blocked")
+
+
+class CastQueryCountTestCase(TestCase):
+    """
+    Test that cast serialization doesn't scale queries with the number of casts
+    """
+
+    def setUp(self):
+        self.client = APIClient()
+        self.users = 0
+
+    def _make_casts(self, count: int):
+        """Creates casts with members, managers, requests, and events"""
+        start = timezone.now()
+        for _ in range(count):
+            self.users += 1
+            profile = User.objects.create_user(
+                username=f"test{self.users}", password="testing"
+            ).profile
+            cast = Cast.objects.create(name=f"Test Cast {self.users}")
+            cast.add_member(profile)
+            cast.add_manager(profile)
+            cast.add_member_request(
+                User.objects.create_user(username=f"req{self.users}").profile
+            )
+            cast.block_user(
+                User.objects.create_user(username=f"block{self.users}").profile
+            )
+            for day in range(-1, 5):
+                Event.objects.create(
+                    name="Test Event",
+                    cast=cast,
+                    description="A test event",
+                    venue="A place",
+                    start=start + timedelta(days=day, hours=1),
+                )
+
+    def _count_list_queries(self, url: str = None, **params) -> int:
+        """Returns the number of queries run by the cast list endpoint"""
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url or reverse("casts"), params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return len(context.captured_queries)
+
+    def test_constant_list_queries(self):
+        """Listing more casts should not run more queries"""
+        self._make_casts(2)
+        small = self._count_list_queries()
+        self._make_casts(8)
+        self.assertEqual(self._count_list_queries(), small)
+
+    def test_constant_page_queries(self):
+        """Later cursor pages should not run more queries than the first"""
+        self._make_casts(6)
+        first = self._count_list_queries(page_size=2)
+        url = self.client.get(reverse("casts"), {"page_size": 2}).data["next"]
+        url = self.client.get(url).data["next"]
+        self.assertEqual(self._count_list_queries(url), first)
+
+    def test_page_fields(self):
+        """Pages of unordered fields should not load the ordering per cast"""
+        self._make_casts(6)
+        full = self._count_list_queries(page_size=2, fields="id,name")
+        self.assertEqual(self._count_list_queries(page_size=2, fields="id"), full)
+
+    def test_prefetched_values(self):
+        """Prefetched values should match the per-cast lookups"""
+        self._make_casts(3)
+        response = self.client.get(reverse("casts"))
+        self.assertEqual(len(response.data), 3)
+        for data in response.data:
+            cast = Cast.objects.get(pk=data["id"])
+            for key in ("managers", "members", "member_requests", "blocked"):
+                self.assertEqual(
+                    data[key], list(getattr(cast, key).values_list("pk", flat=True))
+                )
+            self.assertEqual(len(data["upcoming_events"]), 3)
+            self.assertEqual(
+                [event["id"] for event in data["upcoming_events"]],
+                [event.pk for event in cast.future_events[:3]],
+            )
+
+
+class CastMembershipBulkAPITestCase(TestCase):
+    """
+    Test the bulk cast membership API
+    """
+
+    def setUp(self):
+        user = User.objects.create_user(
+            username="test", email="test@test.io", password="testing"
+        )
+        self.manager = user.profile
+        self.profiles = [
+            User.objects.create_user(username=f"test{i}").profile for i in range(4)
+        ]
+        self.cast1 = Cast.objects.create(name="Test Cast")
+        self.cast2 = Cast.objects.create(name="Another Cast")
+        self.cast1.add_member(self.manager)
+        self.cast1.add_manager(self.manager)
+        self.url = reverse("cast-memberships", kwargs={"pk": self.cast1.pk})
+        self.client = APIClient()
+        self.client.force_authenticate(user=user)
+
+    def _post(self, action: str, profiles: [int], status_code: int = 200) -> dict:
+        """Posts a bulk action and returns the results by profile id"""
+        response = self.client.post(
+            self.url, {"action": action, "profiles": profiles}, format="json"
+        )
+        self.assertEqual(response.status_code, status_code)
+        if status_code != status.HTTP_200_OK:
+            return response.data
+        return {item["profile"]: item for item in response.data}
+
+    def test_add_members(self):
+        """Tests adding many members with per-profile results"""
+        requester, blocked, *others = self.profiles
+        self.cast1.add_member_request(requester)
+        self.cast1.block_user(blocked)
+        pids = [p.pk for p in self.profiles] + [self.manager.pk, 0]
+        with self.assertNumQueries(9):
+            results = self._post("add", pids)
+        self.assertEqual(len(results), 6)
+        for profile in (requester, *others):
+            self.assertTrue(results[profile.pk]["success"])
+            self.assertTrue(self.cast1.is_member(profile))
+        self.assertFalse(self.cast1.has_requested_membership(requester))
+        for pid in (blocked.pk, self.manager.pk, 0):
+            self.assertFalse(results[pid]["success"])
+            self.assertTrue(results[pid]["error"])
+        self.assertFalse(self.cast1.is_member(blocked))
+
+    def test_approve_remove_block(self):
+        """Tests the remaining bulk actions"""
+        first, second, third, _ = self.profiles
+        self.cast1.add_member_request(first)
+        self.cast1.add_member(second)
+        results = self._post("approve", [first.pk, second.pk])
+        self.assertTrue(results[first.pk]["success"])
+        self.assertFalse(results[second.pk]["success"])
+        results = self._post("remove", [first.pk, third.pk, self.manager.pk])
+        self.assertTrue(results[first.pk]["success"])
+        self.assertFalse(results[third.pk]["success"])
+        self.assertFalse(results[self.manager.pk]["success"])
+        self.assertFalse(self.cast1.is_member(first))
+        self.assertTrue(self.cast1.is_manager(self.manager))
+        results = self._post("block", [second.pk, third.pk, self.manager.pk])
+        self.assertTrue(results[second.pk]["success"])
+        self.assertTrue(results[third.pk]["success"])
+        self.assertFalse(results[self.manager.pk]["success"])
+        self.assertEqual(self.cast1.profile_ids("blocked"), [second.pk, third.pk])
+
+    def test_bad_requests(self):
+        """Tests invalid actions, profile lists, and casts"""
+        self._post("promote", [self.profiles[0].pk], status.HTTP_400_BAD_REQUEST)
+        self._post("add", "1,2", status.HTTP_400_BAD_REQUEST)
+        self._post("add", [True], status.HTTP_400_BAD_REQUEST)
+        self.url = reverse("cast-memberships", kwargs={"pk": self.cast2.pk})
+        self._post("add", [self.profiles[0].pk], status.HTTP_403_FORBIDDEN)
+        self.url = reverse("cast-memberships", kwargs={"pk": 0})
+        self._post("add", [self.profiles[0].pk], status.HTTP_404_NOT_FOUND)
+
+
+class CastPageAPITestCase(TestCase):
+    """
+    Test the composite cast page API
+    """
+
+    def setUp(self):
+        self.cast = Cast.objects.create(name="Test Cast")
+        self.profile = User.objects.create_user(username="test").profile
+        self.cast.add_member(self.profile)
+        self.client = APIClient()
+        self.url = reverse("cast-page", kwargs={"slug": self.cast.slug})
+
+    def _add_content(self, count: int):
+        """Adds sections, photos, and cast events to the cast"""
+        start = timezone.now()
+        for i in range(count):
+            PageSection.objects.create(
+                cast=self.cast, title=f"Section {i}", text="Test", order=i
+            )
+            # Skips ingest since there is no image file
+            CastPhoto.objects.bulk_create([CastPhoto(cast=self.cast, image="test.jpg")])
+            event = Event.objects.create(
+                name="Test Event",
+                cast=self.cast,
+                description="A test event",
+                venue="A place",
+                start=start + timedelta(days=i + 1),
+            )
+            Casting.objects.create(event=event, profile=self.profile, role=1)
+            Casting.objects.create(event=event, writein="Test", role=2)
+
+    def test_page(self):
+        """Tests the page contents"""
+        self._add_content(3)
+        response = self.client.get(self.url, {"photos": 2})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["cast"]["id"], self.cast.pk)
+        self.assertEqual(
+            [section["order"] for section in response.data["sections"]], [0, 1, 2]
+        )
+        photos = [photo["id"] for photo in response.data["photos"]]
+        self.assertEqual(
+            photos, list(self.cast.photos.values_list("pk", flat=True))[:2]
+        )
+        events = response.data["events"]
+        self.assertEqual(len(events), 3)
+        self.assertEqual(len(events[0]["castings"]), 2)
+        response = self.client.get(reverse("cast-page", kwargs={"slug": "nope"}))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_constant_queries(self):
+        """Page queries should not grow with the amount of content"""
+        self._add_content(1)
+        with CaptureQueriesContext(connection) as context:
+            self.client.get(self.url)
+        small = len(context.captured_queries)
+        self._add_content(5)
+        with self.assertNumQueries(small):
+            self.client.get(self.url)
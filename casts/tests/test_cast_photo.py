@@ -92,9 +92,9 @@ class CastPhotoAPITestCase(TestCase):
             )
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
         photo = CastPhoto.objects.get(pk=response.data["id"])
-        fname = tmpim.name.split("/")[-1]
-        self.assertIn(fname, photo.image.path)
-        self.assertIn(self.cast1.slug, photo.image.path)
+        self.assertRegex(
+            photo.image.name, r"^casts/test-cast/photos/(\w\w)/(\w\w)/\1\2\w{28}\.jpg$"
+        )
 
     def test_forbidden_create(self):
         """Prevent non-managers from adding photos"""
@@ -1,5 +1,7 @@
 from datetime import datetime
+from io import StringIO
 from django.contrib.auth.models import User
+from django.core.management import call_command
 from django.test import TestCase
 from django.urls import reverse
 from rest_framework import status
@@ -39,6 +41,45 @@ class PageSectionModelTestCase(TestCase):
         self.ps1.save()
         self.assertEqual(list(self.cast.page_sections.all()), [self.ps2, self.ps1])
 
+    def test_rendering(self):
+        """Tests text is rendered to escaped HTML and a summary"""
+        section = PageSection.objects.create(
+            cast=self.cast,
+            title="Rendered",
+            text="<b>Hi</b> see https://example.com\n\nSecond   paragraph",
+        )
+        section.refresh_from_db()
+        self.assertNotIn("<b>", section.html)
+        self.assertIn("&lt;b&gt;", section.html)
+        self.assertIn('<a href="https://example.com" rel="nofollow">', section.html)
+        self.assertEqual(section.html.count("<p>"), 2)
+        self.assertEqual(section.summary, "Hi see https://example.com Second paragraph")
+
+    def test_render_invalidation(self):
+        """Tests rendered content only changes with the text"""
+        stale = PageSection.objects.get(pk=self.ps1.pk)
+        self.assertIn("This is a test", stale.html)
+        stale.html = ""
+        stale.title = "New Title"
+        stale.save()
+        section = PageSection.objects.get(pk=self.ps1.pk)
+        self.assertIn("This is a test", section.html)
+        section.text = "Changed"
+        section.save()
+        section.refresh_from_db()
+        self.assertEqual(section.html, "<p>Changed</p>")
+        self.assertEqual(section.summary, "Changed")
+
+    def test_render_command(self):
+        """Tests sections whose render was lost are rendered by the command"""
+        PageSection.objects.filter(pk=self.ps1.pk).update(html="", summary="")
+        output = StringIO()
+        call_command("render_page_sections", stdout=output)
+        self.assertIn("Rendered 1 page sections", output.getvalue())
+        section = PageSection.objects.get(pk=self.ps1.pk)
+        self.assertIn("This is a test", section.html)
+        self.assertTrue(section.summary)
+
 
 class PageSectionAPITestCase(TestCase):
     """
@@ -102,6 +143,8 @@ class PageSectionAPITestCase(TestCase):
         )
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertIn("text", response.data)
+        self.assertEqual(response.data["html"], "<p>This is a test</p>")
+        self.assertEqual(response.data["summary"], "This is a test")
 
     def test_update(self):
         """"Tests updating page section details"""
@@ -140,3 +183,23 @@ class PageSectionAPITestCase(TestCase):
             reverse("cast-page-section", kwargs={"pk": self.ps2.pk})
         )
         self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_reorder(self):
+        """Tests reordering all page sections at once"""
+        ps3 = PageSection.objects.create(cast=self.cast1, title="Third", text="Test")
+        url = reverse("cast-page-section-order", kwargs={"pk": self.cast1.pk})
+        with self.assertNumQueries(8):
+            response = self.client.put(url, {"sections": [ps3.pk, self.ps1.pk]})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([item["id"] for item in response.data], [ps3.pk, self.ps1.pk])
+        self.assertEqual(list(self.cast1.page_sections.all()), [ps3, self.ps1])
+
+    def test_bad_reorder(self):
+        """Tests reorders must list exactly the cast's sections"""
+        url = reverse("cast-page-section-order", kwargs={"pk": self.cast1.pk})
+        for sections in ([], [self.ps1.pk, self.ps1.pk], [self.ps2.pk], "1", [True]):
+            response = self.client.put(url, {"sections": sections})
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        url = reverse("cast-page-section-order", kwargs={"pk": self.cast2.pk})
+        response = self.client.put(url, {"sections": [self.ps2.pk]})
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
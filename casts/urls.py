@@ -1,20 +1,28 @@
 from django.urls import path
+from events.feeds import CastEventFeed
 from .views import (
+    CastPage,
     CastRetrieveUpdateDestroy,
     CastSlugRetrieveUpdateDestroy,
     CastMemberManager,
     CastManagerManager,
     CastMemberRequestManager,
     CastBlockedManager,
+    CastMembershipBulkManager,
     CastPhotoListCreate,
+    CastPhotoUploadCreate,
+    CastPhotoUpload,
     CastPhotoRetrieveUpdateDestroy,
     PageSectionListCreate,
+    PageSectionOrder,
     PageSectionRetrieveUpdateDestroy,
 )
 
 urlpatterns = [
     path("<int:pk>", CastRetrieveUpdateDestroy.as_view(), name="cast"),
     path("<slug>", CastSlugRetrieveUpdateDestroy.as_view(), name="cast-slug"),
+    path("<slug>/page", CastPage.as_view(), name="cast-page"),
+    path("<int:pk>/events.ics", CastEventFeed.as_view(), name="cast-feed"),
     path("<int:pk>/members/<int:pid>", CastMemberManager.as_view(), name="cast-member"),
     path(
         "<int:pk>/managers/<int:pid>", CastManagerManager.as_view(), name="cast-manager"
@@ -27,15 +35,35 @@ urlpatterns = [
     path(
         "<int:pk>/blocked/<int:pid>", CastBlockedManager.as_view(), name="cast-blocked"
     ),
+    path(
+        "<int:pk>/memberships",
+        CastMembershipBulkManager.as_view(),
+        name="cast-memberships",
+    ),
     path(
         "<int:pk>/sections", PageSectionListCreate.as_view(), name="cast-page-sections"
     ),
+    path(
+        "<int:pk>/sections/order",
+        PageSectionOrder.as_view(),
+        name="cast-page-section-order",
+    ),
     path(
         "sections/<int:pk>",
         PageSectionRetrieveUpdateDestroy.as_view(),
         name="cast-page-section",
     ),
     path("<int:pk>/photos", CastPhotoListCreate.as_view(), name="cast-photos"),
+    path(
+        "<int:pk>/photos/uploads",
+        CastPhotoUploadCreate.as_view(),
+        name="cast-photo-uploads",
+    ),
+    path(
+        "<int:pk>/photos/uploads/<uuid:upload>",
+        CastPhotoUpload.as_view(),
+        name="cast-photo-upload",
+    ),
     path(
         "photos/<int:pk>", CastPhotoRetrieveUpdateDestroy.as_view(), name="cast-photo"
     ),
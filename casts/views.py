@@ -3,7 +3,10 @@ Cast API Views
 """
 
 # django
+from django.db import IntegrityError
+from django.db.models import Max, Q
 from django.shortcuts import get_object_or_404
+from django.utils import timezone
 
 # library
 from rest_framework import generics, permissions, views
@@ -11,17 +14,51 @@ from rest_framework.exceptions import ParseError, ValidationError
 from rest_framework.response import Response
 
 # app
+from assets.uploads import ImageUploadMixin
+from assets.views import UploadCreateView, UploadView
+from events.serializers import EventCastingsSerializer
+from rrc.conditional import ConditionalRetrieveMixin
+from rrc.pagination import OptionalCursorPagination
 from users.models import Profile
-from .models import Cast, CastPhoto, PageSection
+from .models import Cast, CastMembership, CastPhoto, PageSection
 from .permissions import IsManager, IsManagerOrReadOnly
 from .serializers import CastSerializer, CastPhotoSerializer, PageSectionSerializer
 
 
-class CastListCreate(generics.ListCreateAPIView):
+class CastPagination(OptionalCursorPagination):
+    """Cursor pagination for the cast directory by unique name"""
+
+    ordering = ("name",)
+
+
+class CastFieldsMixin:
+    """Limits cast queries and serialization to the requested fields"""
+
+    def get_fields(self) -> (str,):
+        """Returns the cast fields selected by the request or None by default"""
+        return CastSerializer.select_fields(self.request.query_params)
+
+    def get_queryset(self):
+        fields = None
+        if self.request.method in permissions.SAFE_METHODS:
+            fields = self.get_fields()
+        if fields is not None:
+            # Pages are ordered and positioned on columns that may not be shown
+            ordering = getattr(self.pagination_class, "ordering", ())
+            fields = (*fields, *(field.lstrip("-") for field in ordering))
+        return Cast.objects.with_related(fields)
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context["fields"] = self.get_fields()
+        return context
+
+
+class CastListCreate(ImageUploadMixin, CastFieldsMixin, generics.ListCreateAPIView):
     """List available casts or create a new one"""
 
-    queryset = Cast.objects.all()
     serializer_class = CastSerializer
+    pagination_class = CastPagination
     permission_classes = (permissions.IsAuthenticatedOrReadOnly,)
 
     def perform_create(self, serializer):
@@ -30,17 +67,38 @@ class CastListCreate(generics.ListCreateAPIView):
         cast.add_manager(self.request.user.profile)
 
 
-class CastRetrieveUpdateDestroy(generics.RetrieveUpdateDestroyAPIView):
+class CastRetrieveUpdateDestroy(
+    ImageUploadMixin,
+    CastFieldsMixin,
+    ConditionalRetrieveMixin,
+    generics.RetrieveUpdateDestroyAPIView,
+):
     """Retrieve, update, or delete a cast"""
 
-    queryset = Cast.objects.all()
     serializer_class = CastSerializer
     permission_classes = (IsManagerOrReadOnly,)
 
+    def get_version_queryset(self):
+        return Cast.objects.filter(**self.get_lookup())
+
+    def get_last_modified(self):
+        # Upcoming events also change whenever the next event starts
+        versions = (
+            self.get_version_queryset()
+            .annotate(
+                started=Max("events__start", filter=Q(events__start__lt=timezone.now()))
+            )
+            .values_list("modified", "started")
+            .first()
+        )
+        if versions is None:
+            return None
+        return max(version for version in versions if version is not None)
+
     def perform_destroy(self, instance: Cast):
-        if instance.managers.count() > 1:
+        if len(instance.profile_ids("managers")) > 1:
             raise ValidationError("User must be the sole manager to delete")
-        instance.delete()
+        instance.soft_delete()
 
 
 class CastSlugRetrieveUpdateDestroy(CastRetrieveUpdateDestroy):
@@ -49,6 +107,39 @@ class CastSlugRetrieveUpdateDestroy(CastRetrieveUpdateDestroy):
     lookup_field = "slug"
 
 
+class CastPage(views.APIView):
+    """Retrieve everything needed to render a cast's public page"""
+
+    permission_classes = (permissions.AllowAny,)
+    photo_count = 12
+    max_photo_count = 50
+    event_count = 10
+
+    def get(self, request, slug: str) -> Response:
+        try:
+            photo_count = int(request.query_params.get("photos", self.photo_count))
+        except ValueError:
+            raise ParseError("'photos' must be a number")
+        photo_count = max(0, min(photo_count, self.max_photo_count))
+        cast = get_object_or_404(Cast.objects.with_related(), slug=slug)
+        sections = cast.page_sections.all()
+        photos = cast.photos.all()[:photo_count]
+        events = cast.future_events.prefetch_related("castings")[: self.event_count]
+        context = {"request": request, "view": self}
+        return Response(
+            {
+                "cast": CastSerializer(cast, context=context).data,
+                "sections": PageSectionSerializer(
+                    sections, many=True, context=context
+                ).data,
+                "photos": CastPhotoSerializer(photos, many=True, context=context).data,
+                "events": EventCastingsSerializer(
+                    events, many=True, context=context
+                ).data,
+            }
+        )
+
+
 class ListManageView(views.APIView):
     """Add and remove objects from a list"""
 
@@ -108,6 +199,38 @@ class CastBlockedManager(ListManageView):
     remove_method = "unblock_user"
 
 
+class CastMembershipBulkManager(views.APIView):
+    """Apply a membership action to many profiles at once"""
+
+    permission_classes = (IsManager,)
+    max_profiles = 500
+
+    def post(self, request, pk: int) -> Response:
+        cast = get_object_or_404(Cast, pk=pk)
+        self.check_object_permissions(request, cast)
+        action = request.data.get("action")
+        if action not in CastMembership.BULK_ACTIONS:
+            actions = ", ".join(CastMembership.BULK_ACTIONS)
+            raise ParseError(f"'action' must be one of: {actions}")
+        profiles = request.data.get("profiles")
+        if not isinstance(profiles, list) or not all(
+            isinstance(pid, int) and not isinstance(pid, bool) for pid in profiles
+        ):
+            raise ParseError("'profiles' must be a list of profile ids")
+        if len(profiles) > self.max_profiles:
+            raise ParseError(f"Cannot update more than {self.max_profiles} profiles")
+        try:
+            results = cast.bulk_transition(action, profiles)
+        except IntegrityError:
+            raise ValidationError("Memberships changed during the update, try again")
+        return Response(
+            [
+                {"profile": pid, "success": error is None, "error": error}
+                for pid, error in results.items()
+            ]
+        )
+
+
 class PageSectionListCreate(generics.ListCreateAPIView):
     """List all cast page sections or create a new one"""
 
@@ -118,11 +241,32 @@ class PageSectionListCreate(generics.ListCreateAPIView):
         return PageSection.objects.filter(cast=self.kwargs["pk"])
 
     def perform_create(self, serializer):
-        cast = Cast.objects.get(pk=self.kwargs["pk"])
+        cast = get_object_or_404(Cast, pk=self.kwargs["pk"])
         self.check_object_permissions(self.request, cast)
         serializer.save(cast=cast)
 
 
+class PageSectionOrder(views.APIView):
+    """Reorder all of a cast's page sections at once"""
+
+    permission_classes = (IsManager,)
+
+    def put(self, request, pk: int) -> Response:
+        cast = get_object_or_404(Cast, pk=pk)
+        self.check_object_permissions(request, cast)
+        sections = request.data.get("sections")
+        if not isinstance(sections, list) or not all(
+            isinstance(pid, int) and not isinstance(pid, bool) for pid in sections
+        ):
+            raise ParseError("'sections' must be a list of page section ids")
+        try:
+            cast.reorder_sections(sections)
+        except ValueError as exc:
+            raise ParseError(exc)
+        serializer = PageSectionSerializer(cast.page_sections.all(), many=True)
+        return Response(serializer.data)
+
+
 class PageSectionRetrieveUpdateDestroy(generics.RetrieveUpdateDestroyAPIView):
     """Retrieve, update, or delete a cast photo"""
 
@@ -131,7 +275,7 @@ class PageSectionRetrieveUpdateDestroy(generics.RetrieveUpdateDestroyAPIView):
     permission_classes = (IsManagerOrReadOnly,)
 
 
-class CastPhotoListCreate(generics.ListCreateAPIView):
+class CastPhotoListCreate(ImageUploadMixin, generics.ListCreateAPIView):
     """List all cast photos or create a new one"""
 
     serializer_class = CastPhotoSerializer
@@ -141,7 +285,7 @@ class CastPhotoListCreate(generics.ListCreateAPIView):
         return CastPhoto.objects.filter(cast=self.kwargs["pk"])
 
     def perform_create(self, serializer):
-        cast = Cast.objects.get(pk=self.kwargs["pk"])
+        cast = get_object_or_404(Cast, pk=self.kwargs["pk"])
         self.check_object_permissions(self.request, cast)
         image = self.request.data.get("image")
         if image is None:
@@ -149,6 +293,38 @@ class CastPhotoListCreate(generics.ListCreateAPIView):
         serializer.save(image=image, cast=cast)
 
 
+class CastPhotoUploadMixin:
+    """Creates cast photos from chunked uploads"""
+
+    kind = "cast-photo"
+    permission_classes = (IsManager,)
+
+    def get_target(self) -> Cast:
+        cast = get_object_or_404(Cast, pk=self.kwargs["pk"])
+        self.check_object_permissions(self.request, cast)
+        return cast
+
+    def get_upload_name(self, target: Cast, filename: str) -> str:
+        photo = CastPhoto(cast=target)
+        return photo.image.field.generate_filename(photo, filename)
+
+    def create_object(self, target: Cast, image: "File") -> dict:
+        serializer = CastPhotoSerializer(
+            data=self.request.data, context={"request": self.request, "view": self}
+        )
+        serializer.is_valid(raise_exception=True)
+        serializer.save(image=image, cast=target)
+        return serializer.data
+
+
+class CastPhotoUploadCreate(CastPhotoUploadMixin, UploadCreateView):
+    """Start a chunked cast photo upload"""
+
+
+class CastPhotoUpload(CastPhotoUploadMixin, UploadView):
+    """Continue, finish, or cancel a chunked cast photo upload"""
+
+
 class CastPhotoRetrieveUpdateDestroy(generics.RetrieveUpdateDestroyAPIView):
     """Retrieve, update, or delete a cast photo"""
 
@@ -0,0 +1,201 @@
+"""
+iCalendar feeds of cast events and profile castings
+"""
+
+# stdlib
+from calendar import timegm
+from datetime import datetime, timedelta
+
+# django
+from django.db.models import Count, Max
+from django.http import Http404, StreamingHttpResponse
+from django.shortcuts import get_object_or_404
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils import timezone
+from django.utils.http import http_date
+from django.views import View
+
+# app
+from casts.models import Cast
+from users.models import Profile
+from .models import ArchivedCasting, Casting, Event, event_history
+
+# Events only have a start, so shows are given a typical running time
+EVENT_DURATION = timedelta(hours=2)
+
+
+def escape_text(value: str) -> str:
+    """
+    Escapes a value for an iCalendar text property
+    """
+    for char in ("\\", ";", ","):
+        value = value.replace(char, f"\\{char}")
+    return value.replace("\r\n", "\\n").replace("\n", "\\n")
+
+
+def format_time(value: datetime) -> str:
+    """
+    Returns a UTC iCalendar date-time
+    """
+    return value.astimezone(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+
+
+def content_line(name: str, value: str) -> str:
+    """
+    Returns a property line folded to 75 octets with CRLF endings
+    """
+    line = f"{name}:{value}".encode()
+    chunks = []
+    # Continuation lines start with a space
+    limit = 75
+    while len(line) > limit:
+        cut = limit
+        # Never split a multi-byte character
+        while (line[cut] & 0xC0) == 0x80:
+            cut -= 1
+        chunks.append(line[:cut])
+        line = line[cut:]
+        limit = 74
+    chunks.append(line)
+    return "\r\n ".join(chunk.decode() for chunk in chunks) + "\r\n"
+
+
+class ICalendarFeed(View):
+    """
+    Streams an iCalendar feed one event at a time
+
+    Subclasses return the feed's version and an iterator of events. Polling
+    clients are answered with a 304 from the version lookup alone.
+    """
+
+    def get_version(self, pk: int) -> (str, datetime):
+        """
+        Returns the feed's ETag and last modified time or raises Http404
+        """
+        raise NotImplementedError
+
+    def get_properties(self, pk: int) -> {str: str}:
+        """
+        Returns the calendar properties of the feed
+        """
+        return {}
+
+    def get_events(self, pk: int) -> "Iterator[{str: str}]":
+        """
+        Returns an iterator of the properties of each event in the feed
+        """
+        raise NotImplementedError
+
+    def render(self, pk: int) -> "Iterator[str]":
+        """
+        Yields the lines of the feed
+        """
+        yield content_line("BEGIN", "VCALENDAR")
+        yield content_line("VERSION", "2.0")
+        yield content_line("PRODID", "-//Rocky Roll Call//Events//EN")
+        for name, value in self.get_properties(pk).items():
+            yield content_line(name, value)
+        for event in self.get_events(pk):
+            yield content_line("BEGIN", "VEVENT")
+            for name, value in event.items():
+                yield content_line(name, value)
+            yield content_line("END", "VEVENT")
+        yield content_line("END", "VCALENDAR")
+
+    def event_properties(self, uid: str, summary: str, event: Event) -> {str: str}:
+        """
+        Returns the properties of a calendar event
+        """
+        return {
+            "UID": f"{uid}@{self.request.get_host()}",
+            "DTSTAMP": format_time(event.modified),
+            "DTSTART": format_time(event.start),
+            "DTEND": format_time(event.start + EVENT_DURATION),
+            "SUMMARY": escape_text(summary),
+            "LOCATION": escape_text(event.venue),
+            "DESCRIPTION": escape_text(event.description),
+        }
+
+    def get(self, request, pk: int):
+        etag, modified = self.get_version(pk)
+        timestamp = timegm(modified.utctimetuple()) if modified else None
+        response = get_conditional_response(request, etag=etag, last_modified=timestamp)
+        if response is None:
+            response = StreamingHttpResponse(
+                self.render(pk), content_type="text/calendar; charset=utf-8"
+            )
+        response["ETag"] = etag
+        if timestamp is not None:
+            response["Last-Modified"] = http_date(timestamp)
+        patch_cache_control(response, no_cache=True)
+        return response
+
+
+class CastEventFeed(ICalendarFeed):
+    """
+    Feed of every event of a cast
+
+    The cast's modified time is bumped whenever one of its events changes
+    """
+
+    def get_version(self, pk: int) -> (str, datetime):
+        modified = Cast.objects.filter(pk=pk).values_list("modified", flat=True)
+        modified = modified.first()
+        if modified is None:
+            raise Http404
+        return f'"cast-events-{modified.timestamp()}"', modified
+
+    def get_properties(self, pk: int) -> {str: str}:
+        cast = Cast.objects.only("name", "timezone").get(pk=pk)
+        return {"X-WR-CALNAME": escape_text(cast.name), "X-WR-TIMEZONE": cast.timezone}
+
+    def get_events(self, pk: int) -> "Iterator[{str: str}]":
+        events = event_history(cast=pk).order_by("start")
+        for event in events.iterator(chunk_size=500):
+            yield self.event_properties(f"event-{event.pk}", event.name, event)
+
+
+class ProfileCastingFeed(ICalendarFeed):
+    """
+    Feed of every event a profile is cast in
+    """
+
+    def get_version(self, pk: int) -> (str, datetime):
+        get_object_or_404(Profile.objects.only("pk"), pk=pk)
+        version = Casting.objects.filter(profile=pk).aggregate(
+            count=Count("pk"), casting=Max("modified"), event=Max("event__modified")
+        )
+        # Archived castings only change when they are deleted
+        archived = ArchivedCasting.objects.filter(profile=pk).count()
+        times = [version["casting"], version["event"]]
+        stamps = "-".join(str(time.timestamp()) if time else "" for time in times)
+        etag = f'"profile-castings-{version["count"]}-{archived}-{stamps}"'
+        return etag, max((time for time in times if time), default=None)
+
+    def get_events(self, pk: int) -> "Iterator[{str: str}]":
+        columns = (
+            "pk",
+            "role",
+            "event__name",
+            "event__description",
+            "event__venue",
+            "event__start",
+            "event__modified",
+        )
+        # Castings and their events are read from the hot and archive tables
+        hot = Casting.objects.filter(profile=pk).order_by().values_list(*columns)
+        archived = ArchivedCasting.objects.filter(profile=pk).order_by()
+        castings = hot.union(archived.values_list(*columns), all=True)
+        castings = castings.order_by("event__start", "pk")
+        roles = dict(Casting.ROLES)
+        for row in castings.iterator(chunk_size=500):
+            casting_id, role, name, description, venue, start, modified = row
+            event = Event(
+                name=name,
+                description=description,
+                venue=venue,
+                start=start,
+                modified=modified,
+            )
+            summary = f"{roles[role]} | {name}"
+            yield self.event_properties(f"casting-{casting_id}", summary, event)
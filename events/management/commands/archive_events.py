@@ -0,0 +1,35 @@
+"""
+Moves old events to the archive tables
+"""
+
+# stdlib
+import time
+
+# django
+from django.core.management.base import BaseCommand
+
+# app
+from ...models import PURGE_BATCH_SIZE, archive_events
+
+
+class Command(BaseCommand):
+    help = "Moves events older than EVENT_ARCHIVE_DAYS to the archive in batches"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=PURGE_BATCH_SIZE)
+        parser.add_argument(
+            "--pause", type=float, default=0.1, help="Seconds to wait between batches",
+        )
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+
+        def report(archived: int):
+            elapsed = time.monotonic() - started
+            self.stdout.write(
+                f"Archived {archived} events ({archived / elapsed:.0f}/s)"
+            )
+
+        archived = archive_events(options["batch_size"], options["pause"], report)
+        elapsed = time.monotonic() - started
+        self.stdout.write(f"Archived {archived} events in {elapsed:.1f}s")
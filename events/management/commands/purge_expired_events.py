@@ -0,0 +1,35 @@
+"""
+Deletes events older than EXPIRES_AFTER days
+"""
+
+# stdlib
+import time
+
+# django
+from django.core.management.base import BaseCommand
+
+# app
+from ...models import EXPIRES_AFTER, PURGE_BATCH_SIZE, purge_expired_events
+
+
+class Command(BaseCommand):
+    help = f"Deletes events that started over {EXPIRES_AFTER} days ago in batches"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=PURGE_BATCH_SIZE)
+        parser.add_argument(
+            "--pause", type=float, default=0.1, help="Seconds to wait between batches",
+        )
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+
+        def report(deleted: int):
+            elapsed = time.monotonic() - started
+            self.stdout.write(
+                f"Deleted {deleted} expired events ({deleted / elapsed:.0f}/s)"
+            )
+
+        deleted = purge_expired_events(options["batch_size"], options["pause"], report)
+        elapsed = time.monotonic() - started
+        self.stdout.write(f"Deleted {deleted} expired events in {elapsed:.1f}s")
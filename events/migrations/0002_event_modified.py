@@ -0,0 +1,17 @@
+# Generated by Django 3.0.14 on 2026-10-18 01:26
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [("events", "0001_initial")]
+
+    operations = [
+        migrations.AddField(
+            model_name="event",
+            name="modified",
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 3.0.14 on 2026-10-18 02:15
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("casts", "0013_cast_deleted"),
+        ("events", "0002_event_modified"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="event",
+            name="cast",
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="events",
+                to="casts.Cast",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="event",
+            index=models.Index(
+                fields=["cast", "start"], name="events_even_cast_id_3d2b85_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="event",
+            index=models.Index(fields=["start"], name="events_even_start_df0a74_idx"),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 3.0.14 on 2026-10-18 02:20
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [("events", "0003_event_start_indexes")]
+
+    operations = [
+        migrations.AddField(
+            model_name="casting",
+            name="modified",
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+    ]
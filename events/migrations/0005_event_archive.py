@@ -0,0 +1,91 @@
+# Generated by Django 3.0.14 on 2026-10-18 02:24
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("casts", "0014_cast_timezone"),
+        ("users", "0010_image_hash"),
+        ("events", "0004_casting_modified"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ArchivedEvent",
+            fields=[
+                ("id", models.IntegerField(primary_key=True, serialize=False)),
+                ("name", models.CharField(max_length=128)),
+                ("description", models.TextField()),
+                ("venue", models.CharField(max_length=256)),
+                ("start", models.DateTimeField()),
+                ("created", models.DateTimeField()),
+                ("modified", models.DateTimeField()),
+                (
+                    "cast",
+                    models.ForeignKey(
+                        db_index=False,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="archived_events",
+                        to="casts.Cast",
+                    ),
+                ),
+            ],
+        ),
+        migrations.CreateModel(
+            name="ArchivedCasting",
+            fields=[
+                ("id", models.IntegerField(primary_key=True, serialize=False)),
+                (
+                    "role",
+                    models.IntegerField(
+                        choices=[
+                            (1, "Dr. Frank-N-Furter"),
+                            (2, "Janet Weiss"),
+                            (3, "Brad Majors"),
+                            (4, "Riff Raff"),
+                            (5, "Magenta"),
+                            (6, "Columbia"),
+                            (7, "Dr. Everett V. Scott"),
+                            (8, "Rocky Horror"),
+                            (9, "Eddie"),
+                            (10, "The Criminologist"),
+                            (11, "Transylvanian"),
+                            (20, "Emcee"),
+                            (21, "Trixie"),
+                            (30, "Tech"),
+                            (31, "Lights"),
+                            (32, "Photographer"),
+                        ]
+                    ),
+                ),
+                ("writein", models.CharField(max_length=64, null=True)),
+                ("modified", models.DateTimeField()),
+                (
+                    "event",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="castings",
+                        to="events.ArchivedEvent",
+                    ),
+                ),
+                (
+                    "profile",
+                    models.ForeignKey(
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="archived_castings",
+                        to="users.Profile",
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name="archivedevent",
+            index=models.Index(
+                fields=["cast", "start"], name="events_arch_cast_id_f30666_idx"
+            ),
+        ),
+    ]
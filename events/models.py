@@ -3,14 +3,40 @@ Models to manage calendar events
 """
 
 # stdlib
+import time
 from datetime import timedelta
 
 # django
-from django.db import models
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import cache
+from django.db import NotSupportedError, models, transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import Signal, receiver
 from rest_framework.exceptions import ValidationError
 from django.utils import timezone
 
 EXPIRES_AFTER = 365 * 2  # days
+PURGE_BATCH_SIZE = 200
+
+# Sent with the ids of events deleted in bulk without per-row signals
+events_purged = Signal()
+
+
+def expiry_cutoff() -> "datetime":
+    """
+    Returns the start time before which events are expired
+    """
+    return timezone.now() - timedelta(days=EXPIRES_AFTER)
+
+
+class EventManager(models.Manager):
+    """
+    Manager hiding the events of deleted casts
+    """
+
+    def get_queryset(self) -> models.QuerySet:
+        return super().get_queryset().filter(cast__deleted__isnull=True)
 
 
 class Event(models.Model):
@@ -23,46 +49,145 @@ class Event(models.Model):
     venue = models.CharField(max_length=256)
     start = models.DateTimeField()
 
+    # Cast lookups use the (cast, start) index
     cast = models.ForeignKey(
-        "casts.Cast", on_delete=models.CASCADE, related_name="events"
+        "casts.Cast", on_delete=models.CASCADE, related_name="events", db_index=False
     )
     created = models.DateTimeField(default=timezone.now)
+    modified = models.DateTimeField(default=timezone.now)
+
+    objects = EventManager()
 
     class Meta:
         ordering = ["start"]
+        indexes = [
+            models.Index(fields=["cast", "start"]),
+            models.Index(fields=["start"]),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_start = instance.__dict__.get("start")
+        return instance
+
+    def save(self, *args, **kwargs):
+        self.modified = timezone.now()
+        super().save(*args, **kwargs)
 
     @property
     def is_expired(self) -> bool:
         """
         Returns if an event is ready for deletion
         """
-        return timezone.now() > self.start + timedelta(days=EXPIRES_AFTER)
+        return self.start < expiry_cutoff()
 
     def __str__(self) -> str:
         return f"{self.cast.name} | {self.start}"
 
 
+class LocalDate(models.Func):
+    """
+    The date of a datetime in the time zone named by a second expression
+
+    Unlike TruncDate, each row can be converted to a different time zone
+    """
+
+    arity = 2
+    output_field = models.DateField()
+
+    def as_sql(self, compiler, connection, **extra_context):
+        raise NotSupportedError(f"LocalDate is not supported on {connection.vendor}")
+
+    def as_sqlite(self, compiler, connection, **extra_context):
+        # Converts with the function Django registers for TruncDate
+        return super().as_sql(
+            compiler,
+            connection,
+            template="django_datetime_cast_date(%(expressions)s, NULL)",
+            **extra_context,
+        )
+
+    def as_postgresql(self, compiler, connection, **extra_context):
+        return super().as_sql(
+            compiler,
+            connection,
+            template="(%(expressions)s)::date",
+            arg_joiner=" AT TIME ZONE ",
+            **extra_context,
+        )
+
+    def as_mysql(self, compiler, connection, **extra_context):
+        return super().as_sql(
+            compiler,
+            connection,
+            template="DATE(CONVERT_TZ(%(expressions)s))",
+            arg_joiner=", 'UTC', ",
+            **extra_context,
+        )
+
+
 def get_upcoming_events(days: int = 14, limit: int = 12, cast: int = None) -> dict:
     """
     Returns upcoming events as a calendar dictionary
+
+    Events are keyed by their ISO date in their cast's time zone, which is
+    found by the database
     """
-    search = {
-        "start__gte": timezone.now(),
-        "start__lte": timezone.now() + timedelta(days=days),
-    }
+    now = timezone.now()
+    events = Event.objects.filter(start__gte=now, start__lte=now + timedelta(days=days))
     if cast:
-        search["cast__pk"] = cast
-    events = Event.objects.filter(**search)[:limit]
+        events = events.filter(cast=cast)
+    events = events.annotate(day=LocalDate("start", "cast__timezone"))[:limit]
     calendar = {}
     for event in events:
-        day = event.start.strftime(r"%Y-%m-%d")
-        if day in calendar:
-            calendar[day].append(event)
-        else:
-            calendar[day] = [event]
+        calendar.setdefault(event.day.isoformat(), []).append(event)
     return calendar
 
 
+def calendar_cache_key(days: int, limit: int, cast: int = None) -> str:
+    """
+    Returns the cache key of a calendar for the current version of its events
+    """
+    scope = cast or "all"
+    generation = cache.get_or_set(f"calendar-generation:{scope}", time.time_ns(), None)
+    return f"calendar:{scope}:{generation}:{days}:{limit}"
+
+
+def invalidate_calendars(cast: int):
+    """
+    Expires the cached calendars of a cast and of all casts
+    """
+    for scope in (cast, "all"):
+        cache.set(f"calendar-generation:{scope}", time.time_ns(), None)
+
+
+@receiver(post_save, sender=Event)
+@receiver(post_delete, sender=Event)
+def invalidate_event_calendars(sender, instance, **kwargs):
+    """
+    Expires cached calendars when an event in or moved out of their window
+    changes
+    """
+    now = timezone.now()
+    # Cached calendars may still include events that started since
+    earliest = now - timedelta(seconds=settings.CALENDAR_CACHE_SECONDS)
+    latest = now + timedelta(days=settings.CALENDAR_MAX_DAYS)
+    starts = (instance.start, getattr(instance, "_loaded_start", None))
+    if any(start and earliest <= start <= latest for start in starts):
+        invalidate_calendars(instance.cast_id)
+    instance._loaded_start = instance.start
+
+
+class CastingManager(models.Manager):
+    """
+    Manager hiding the castings of deleted casts
+    """
+
+    def get_queryset(self) -> models.QuerySet:
+        return super().get_queryset().filter(event__cast__deleted__isnull=True)
+
+
 class Casting(models.Model):
     """
     Represents a User being cast in a role at an Event
@@ -119,6 +244,9 @@ class Casting(models.Model):
     )
     role = models.IntegerField(choices=ROLES)
     writein = models.CharField(max_length=64, blank=True, null=True)
+    modified = models.DateTimeField(default=timezone.now)
+
+    objects = CastingManager()
 
     class Meta:
         ordering = ["role"]
@@ -135,7 +263,7 @@ class Casting(models.Model):
         """
         Returns True if the casting is a non-tech role with profile
         """
-        return self.profile and self.role < 30
+        return self.profile_id is not None and self.role < 30
 
     def clean(self):
         """
@@ -150,4 +278,178 @@ class Casting(models.Model):
 
     def save(self, *args, **kwargs):
         self.full_clean()
+        self.modified = timezone.now()
         super().save(*args, **kwargs)
+
+
+def bulk_delete(query: models.QuerySet) -> int:
+    """
+    Deletes a queryset's rows in one statement and returns the count
+
+    Related rows are not collected and no per-row signals are sent, so the
+    caller deletes dependent rows first.
+    """
+    # QuerySet.delete() loads and signals every row while a model has
+    # receivers. _raw_delete is the single DELETE it runs when none do.
+    return query._raw_delete(query.db)
+
+
+def purge_expired_events(
+    batch_size: int = PURGE_BATCH_SIZE, pause: float = 0, report: "callable" = None
+) -> int:
+    """
+    Deletes expired events and their castings in batches
+
+    Expired events are purged from both the hot and archive tables. Batches are
+    the oldest events by start, read from the start index, and each is deleted
+    in its own short transaction. Rows are deleted in bulk without per-row
+    signals, and the batch's casts are touched with a single update so their
+    feeds are revalidated. The pause in seconds between
+    batches leaves room for other queries. The report function is called after
+    each batch with the number of events deleted so far. Returns that total.
+    """
+    cutoff = expiry_cutoff()
+    deleted = 0
+    for event_model, casting_model in (
+        (Event, Casting),
+        (ArchivedEvent, ArchivedCasting),
+    ):
+        query = event_model._base_manager.filter(start__lt=cutoff).order_by("start")
+        while True:
+            with transaction.atomic():
+                rows = list(query.values_list("pk", "cast")[:batch_size])
+                if not rows:
+                    break
+                batch, casts = zip(*rows)
+                bulk_delete(casting_model._base_manager.filter(event_id__in=batch))
+                bulk_delete(event_model._base_manager.filter(pk__in=batch))
+                events_purged.send(sender=Event, pks=batch)
+                Cast = apps.get_model("casts", "Cast")
+                Cast.all_objects.filter(pk__in=set(casts)).update(
+                    modified=timezone.now()
+                )
+            deleted += len(batch)
+            if report:
+                report(deleted)
+            time.sleep(pause)
+    return deleted
+
+
+class ArchivedEvent(models.Model):
+    """
+    An event moved out of the hot events table once it is old
+
+    Has the same columns in the same order as Event, so both tables can be read
+    together with a UNION. Events keep their ids when archived.
+    """
+
+    id = models.IntegerField(primary_key=True)
+    name = models.CharField(max_length=128)
+    description = models.TextField()
+    venue = models.CharField(max_length=256)
+    start = models.DateTimeField()
+    cast = models.ForeignKey(
+        "casts.Cast",
+        on_delete=models.CASCADE,
+        related_name="archived_events",
+        db_index=False,
+    )
+    created = models.DateTimeField()
+    modified = models.DateTimeField()
+
+    objects = EventManager()
+
+    class Meta:
+        indexes = [models.Index(fields=["cast", "start"])]
+
+
+class ArchivedCasting(models.Model):
+    """
+    A casting moved to the archive with its event
+
+    Has the same columns in the same order as Casting
+    """
+
+    id = models.IntegerField(primary_key=True)
+    event = models.ForeignKey(
+        ArchivedEvent, on_delete=models.CASCADE, related_name="castings"
+    )
+    profile = models.ForeignKey(
+        "users.Profile",
+        null=True,
+        on_delete=models.CASCADE,
+        related_name="archived_castings",
+    )
+    role = models.IntegerField(choices=Casting.ROLES)
+    writein = models.CharField(max_length=64, null=True)
+    modified = models.DateTimeField()
+
+    objects = CastingManager()
+
+
+def archived_copy(model, instance: models.Model) -> models.Model:
+    """
+    Returns an unsaved archive model copy of an instance
+    """
+    fields = model._meta.concrete_fields
+    return model(
+        **{field.attname: getattr(instance, field.attname) for field in fields}
+    )
+
+
+def archive_events(
+    batch_size: int = PURGE_BATCH_SIZE, pause: float = 0, report: "callable" = None
+) -> int:
+    """
+    Moves events older than EVENT_ARCHIVE_DAYS and their castings to the archive
+
+    Works in batches of the oldest events like purge_expired_events, copying
+    and bulk deleting each batch in one short transaction. Archived events are
+    out of every calendar window and served only as history, so their casts
+    aren't touched. Returns the number of events archived.
+    """
+    cutoff = timezone.now() - timedelta(days=settings.EVENT_ARCHIVE_DAYS)
+    query = Event._base_manager.filter(start__lt=cutoff).order_by("start")
+    archived = 0
+    while True:
+        with transaction.atomic():
+            events = list(query[:batch_size])
+            if not events:
+                return archived
+            castings = list(Casting._base_manager.filter(event__in=events))
+            ArchivedEvent.objects.bulk_create(
+                archived_copy(ArchivedEvent, event) for event in events
+            )
+            ArchivedCasting.objects.bulk_create(
+                archived_copy(ArchivedCasting, casting) for casting in castings
+            )
+            pks = [event.pk for event in events]
+            bulk_delete(Casting._base_manager.filter(event_id__in=pks))
+            bulk_delete(Event._base_manager.filter(pk__in=pks))
+            events_purged.send(sender=Event, pks=pks)
+        archived += len(events)
+        if report:
+            report(archived)
+        time.sleep(pause)
+
+
+def event_history(**filters) -> "QuerySet[Event]":
+    """
+    Returns the events matching filters from both the hot and archive tables
+
+    Archived events are returned as Event objects. Only history views should
+    read the archive, so everything else stays on the smaller hot table. The
+    result can be ordered, sliced, and counted but not filtered further.
+    """
+    hot = Event.objects.filter(**filters).order_by()
+    archived = ArchivedEvent.objects.filter(**filters).order_by()
+    return hot.union(archived, all=True)
+
+
+def casting_history(**filters) -> "QuerySet[Casting]":
+    """
+    Returns the castings matching filters from both the hot and archive tables
+    """
+    hot = Casting.objects.filter(**filters).order_by()
+    archived = ArchivedCasting.objects.filter(**filters).order_by()
+    return hot.union(archived, all=True)
@@ -33,3 +33,25 @@ class CastingSerializer(ModelSerializer):
             "writein",
         )
         read_only_fields = ("id", "event", "role_name", "show_picture")
+
+
+class EventCastingsSerializer(EventSerializer):
+    """
+    Serializer for the events.Event model including its castings
+    """
+
+    castings = CastingSerializer(many=True, read_only=True)
+
+    class Meta(EventSerializer.Meta):
+        fields = EventSerializer.Meta.fields + ("castings",)
+
+
+class EventHistorySerializer(EventSerializer):
+    """
+    Serializer for events read from the history, including their castings
+    """
+
+    castings = CastingSerializer(many=True, read_only=True, source="history_castings")
+
+    class Meta(EventSerializer.Meta):
+        fields = EventSerializer.Meta.fields + ("castings",)
@@ -0,0 +1,132 @@
+# stdlib
+from datetime import timedelta
+from io import StringIO
+
+# django
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+# library
+from rest_framework import status
+
+# app
+from casts.models import Cast
+from events.models import (
+    EXPIRES_AFTER,
+    ArchivedCasting,
+    ArchivedEvent,
+    Casting,
+    Event,
+)
+
+
+class ArchiveTestCase(TestCase):
+    """
+    Tests moving old events to the archive and reading them back as history
+    """
+
+    def setUp(self):
+        self.profile = User.objects.create_user(
+            username="test", email="test@test.io", password="testing"
+        ).profile
+        self.cast = Cast.objects.create(name="Test Cast")
+        old = timezone.now() - timedelta(days=settings.EVENT_ARCHIVE_DAYS + 1)
+        self.events = []
+        for i, start in enumerate((old - timedelta(days=7), old, timezone.now())):
+            event = Event.objects.create(
+                name=f"Event {i}",
+                cast=self.cast,
+                description="A show",
+                venue="A place",
+                start=start,
+            )
+            Casting.objects.create(event=event, profile=self.profile, role=i + 1)
+            self.events.append(event)
+        self.modified = Cast.objects.get(pk=self.cast.pk).modified
+        output = StringIO()
+        call_command("archive_events", batch_size=1, pause=0, stdout=output)
+        self.assertIn("Archived 2 events in", output.getvalue())
+
+    def test_archive(self):
+        """Tests old events and castings leave the hot tables with their ids"""
+        self.assertEqual(list(Event.objects.all()), [self.events[2]])
+        self.assertEqual(Casting.objects.count(), 1)
+        archived = ArchivedEvent.objects.order_by("start")
+        self.assertEqual(
+            [event.pk for event in archived], [e.pk for e in self.events[:2]]
+        )
+        self.assertEqual(ArchivedCasting.objects.count(), 2)
+        # Archiving doesn't change the cast
+        self.assertEqual(Cast.objects.get(pk=self.cast.pk).modified, self.modified)
+        # Nothing is left to archive
+        output = StringIO()
+        call_command("archive_events", stdout=output)
+        self.assertIn("Archived 0 events", output.getvalue())
+
+    def test_history(self):
+        """Tests the history combines hot and archived events and castings"""
+        upcoming = Event.objects.create(
+            name="Upcoming Event",
+            cast=self.cast,
+            description="A show",
+            venue="A place",
+            start=timezone.now() + timedelta(days=1),
+        )
+        response = self.client.get(reverse("event-history"), {"limit": 2})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["count"], 3)
+        results = response.data["results"]
+        self.assertEqual(
+            [event["id"] for event in results], [e.pk for e in self.events[:0:-1]]
+        )
+        self.assertEqual(results[1]["castings"][0]["role_name"], "Janet Weiss")
+        response = self.client.get(
+            reverse("event-history"), {"to": self.events[1].start.isoformat()}
+        )
+        castings = response.data["results"][0]["castings"]
+        self.assertEqual(castings[0]["role_name"], "Dr. Frank-N-Furter")
+        self.assertEqual(castings[0]["profile"], self.profile.pk)
+        # Upcoming events are only listed up to an explicit bound
+        response = self.client.get(
+            reverse("event-history"),
+            {"to": (upcoming.start + timedelta(hours=1)).isoformat()},
+        )
+        self.assertEqual(response.data["count"], 4)
+        self.assertEqual(response.data["results"][0]["id"], upcoming.pk)
+
+    def test_feeds(self):
+        """Tests feeds include archived events"""
+        for name, pk in (
+            ("cast-feed", self.cast.pk),
+            ("profile-feed", self.profile.pk),
+        ):
+            response = self.client.get(reverse(name, kwargs={"pk": pk}))
+            text = b"".join(response.streaming_content).decode()
+            self.assertEqual(text.count("BEGIN:VEVENT"), 3)
+            # Events are listed in start order across both tables
+            starts = [line for line in text.split("\r\n") if line.startswith("DTSTART")]
+            self.assertEqual(starts, sorted(starts))
+
+    def test_purge_expired(self):
+        """Tests expired events are purged from the archive"""
+        start = timezone.now() - timedelta(days=EXPIRES_AFTER + 1)
+        ArchivedEvent.objects.filter(pk=self.events[0].pk).update(start=start)
+        url = reverse("cast-feed", kwargs={"pk": self.cast.pk})
+        etag = self.client.get(url)["ETag"]
+        call_command("purge_expired_events", pause=0, stdout=StringIO())
+        # Feed subscribers are sent the feed without the purged event
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        archived = ArchivedEvent.objects.values_list("pk", flat=True)
+        self.assertEqual(list(archived), [self.events[1].pk])
+        self.assertEqual(ArchivedCasting.objects.count(), 1)
+
+    def test_purge_cast(self):
+        """Tests purging a deleted cast also deletes its archived events"""
+        self.cast.soft_delete()
+        self.assertFalse(ArchivedEvent._base_manager.exists())
+        self.assertFalse(ArchivedCasting._base_manager.exists())
@@ -1,19 +1,24 @@
 # stdlib
 from datetime import datetime, timedelta
+from io import StringIO
 
 # django
 from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import call_command
 from django.test import TestCase
 from django.urls import reverse
 from django.utils import timezone
 
 # library
+import pytz
 from rest_framework import status
 from rest_framework.test import APIClient
 
 # app
 from casts.models import Cast
-from events.models import Event, get_upcoming_events
+from events.models import EXPIRES_AFTER, Casting, Event, get_upcoming_events
+from search.models import SearchEntry
 
 
 class EventModelTestCase(TestCase):
@@ -74,6 +79,44 @@ class EventModelTestCase(TestCase):
         calendar = get_upcoming_events(cast=self.cast2.pk)
         self._validate_calendar_event(calendar, self.event3)
 
+    def test_upcoming_events_local_date(self):
+        """Tests events are keyed by their date in the cast's time zone"""
+        self.cast2.timezone = "Pacific/Kiritimati"
+        self.cast2.save()
+        start = (timezone.now() + timedelta(days=1)).replace(hour=12)
+        self.event3.start = start
+        self.event3.save()
+        calendar = get_upcoming_events(cast=self.cast2.pk)
+        local = start.astimezone(pytz.timezone("Pacific/Kiritimati"))
+        self.assertNotEqual(local.date(), start.date())
+        self.assertEqual(calendar, {local.date().isoformat(): [self.event3]})
+
+    def test_purge_expired(self):
+        """Tests expired events and their castings are deleted in batches"""
+        start = timezone.now() - timedelta(days=EXPIRES_AFTER, hours=1)
+        for i in range(3):
+            event = Event.objects.create(
+                name=f"Old Event {i}",
+                cast=self.cast1,
+                description="An old event",
+                venue="A place",
+                start=start - timedelta(days=i),
+            )
+            self.assertTrue(event.is_expired)
+            Casting.objects.create(event=event, role=Casting.FRANK, writein="Test")
+        modified = Cast.objects.get(pk=self.cast1.pk).modified
+        output = StringIO()
+        call_command("purge_expired_events", batch_size=2, pause=0, stdout=output)
+        self.assertEqual(len(output.getvalue().splitlines()), 3)
+        self.assertIn("Deleted 3 expired events in", output.getvalue())
+        self.assertEqual(Event.objects.count(), 3)
+        self.assertFalse(Casting.objects.exists())
+        # The cast is touched so its feed is revalidated
+        self.assertGreater(Cast.objects.get(pk=self.cast1.pk).modified, modified)
+        # Other events keep their search entries
+        entries = SearchEntry.objects.filter(kind=SearchEntry.EVENT)
+        self.assertEqual(entries.count(), 3)
+
     def test_cast_events(self):
         """Tests future events from a Cast object"""
         self.assertEqual(list(self.cast1.future_events), [self.event1])
@@ -125,6 +168,69 @@ class EventAPITestCase(TestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(len(response.data), 3)
 
+    def test_list_filtered(self):
+        """Tests filtering the event list by time window, casts, and venue"""
+
+        def names(**params) -> [str]:
+            response = self.client.get(reverse("events"), params)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            return [event["name"] for event in response.data]
+
+        start = self.event2.start
+        window = {
+            "from": (start + timedelta(hours=1)).isoformat(),
+            "to": (start + timedelta(days=2)).isoformat(),
+        }
+        self.assertEqual(names(**window), [self.event3.name])
+        self.assertEqual(
+            names(**{"from": (start + timedelta(days=2)).date().isoformat()}),
+            [self.event1.name],
+        )
+        self.assertEqual(
+            names(cast=self.cast1.pk), [self.event2.name, self.event1.name]
+        )
+        self.assertEqual(
+            names(cast=f"{self.cast1.pk},{self.cast2.pk}", venue="a place"),
+            [self.event1.name],
+        )
+        for params in ({"from": "soon"}, {"cast": "one"}):
+            response = self.client.get(reverse("events"), params)
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_list_paginated(self):
+        """Tests paging through events by start time"""
+        response = self.client.get(reverse("events"), {"page_size": 2})
+        self.assertEqual(
+            [event["id"] for event in response.data["results"]],
+            [self.event2.pk, self.event3.pk],
+        )
+        response = self.client.get(response.data["next"])
+        self.assertEqual(
+            [event["id"] for event in response.data["results"]], [self.event1.pk]
+        )
+        self.assertIsNone(response.data["next"])
+
+    def test_calendar(self):
+        """Tests the calendar is cached until an event in its window changes"""
+        cache.clear()
+        response = self.client.get(reverse("calendar"), {"cast": self.cast1.pk})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        day = self.event1.start.date().isoformat()
+        self.assertEqual(response.data[day][0]["name"], self.event1.name)
+        with self.assertNumQueries(0):
+            self.client.get(reverse("calendar"), {"cast": self.cast1.pk})
+        self.event1.name = "Updated Event"
+        self.event1.save()
+        response = self.client.get(reverse("calendar"), {"cast": self.cast1.pk})
+        self.assertEqual(response.data[day][0]["name"], "Updated Event")
+        response = self.client.get(reverse("calendar"), {"days": 1})
+        self.assertEqual(
+            [event["id"] for events in response.data.values() for event in events],
+            [self.event3.pk],
+        )
+        response = self.client.get(reverse("calendar"), {"days": 1000})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
     def test_embedded_event(self):
         """Tests that embedded events are expanded and not just an ID"""
         response = self.client.get(reverse("cast", kwargs={"pk": self.cast1.pk}))
@@ -175,6 +281,21 @@ class EventAPITestCase(TestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertIn("name", response.data)
 
+    def test_conditional_retrieve(self):
+        """Tests event detail validators and not modified responses"""
+        url = reverse("event", kwargs={"pk": self.event1.pk})
+        response = self.client.get(url)
+        etag, modified = response["ETag"], response["Last-Modified"]
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        response = self.client.get(url, HTTP_IF_MODIFIED_SINCE=modified)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.event1.name = "Updated Event"
+        self.event1.save()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["name"], "Updated Event")
+
     def test_update(self):
         """"Tests updating event details"""
         self.assertEqual(self.event1.name, "Test Event")
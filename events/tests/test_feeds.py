@@ -0,0 +1,97 @@
+# stdlib
+from datetime import timedelta
+
+# django
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+# library
+from rest_framework import status
+
+# app
+from casts.models import Cast
+from events.feeds import content_line
+from events.models import Casting, Event
+
+
+class FeedTestCase(TestCase):
+    """
+    Tests the iCalendar feeds
+    """
+
+    def setUp(self):
+        self.profile = User.objects.create_user(
+            username="test", email="test@test.io", password="testing"
+        ).profile
+        self.cast = Cast.objects.create(name="Test Cast", timezone="America/Chicago")
+        self.event = Event.objects.create(
+            name="Test Event",
+            cast=self.cast,
+            description="Doors open at 11:30, show at midnight",
+            venue="A place",
+            start=timezone.now() + timedelta(days=1),
+        )
+        self.casting = Casting.objects.create(
+            event=self.event, profile=self.profile, role=Casting.FRANK
+        )
+
+    def fetch(self, url: str, **headers) -> "HttpResponse":
+        """Returns a feed response with its streamed content joined"""
+        response = self.client.get(url, **headers)
+        if response.status_code == status.HTTP_200_OK:
+            self.assertEqual(response["Content-Type"], "text/calendar; charset=utf-8")
+            response.text = b"".join(response.streaming_content).decode()
+        return response
+
+    def assert_conditional(self, url: str, change: "callable"):
+        """Tests a feed is not modified until a change is made"""
+        etag = self.fetch(url)["ETag"]
+        response = self.fetch(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        change()
+        response = self.fetch(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response
+
+    def test_cast_feed(self):
+        """Tests the feed of a cast's events"""
+        url = reverse("cast-feed", kwargs={"pk": self.cast.pk})
+        text = self.fetch(url).text
+        self.assertTrue(text.startswith("BEGIN:VCALENDAR\r\n"))
+        self.assertIn("X-WR-TIMEZONE:America/Chicago\r\n", text)
+        self.assertIn("SUMMARY:Test Event\r\n", text)
+        self.assertIn("DESCRIPTION:Doors open at 11:30\\, show at midnight", text)
+        start = self.event.start.astimezone(timezone.utc)
+        self.assertIn(f"DTSTART:{start:%Y%m%dT%H%M%SZ}\r\n", text)
+
+        def change():
+            self.event.venue = "Another place"
+            self.event.save()
+
+        response = self.assert_conditional(url, change)
+        self.assertIn("LOCATION:Another place\r\n", response.text)
+        self.cast.soft_delete()
+        self.assertEqual(self.fetch(url).status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_profile_feed(self):
+        """Tests the feed of a profile's castings"""
+        url = reverse("profile-feed", kwargs={"pk": self.profile.pk})
+        self.assertIn("SUMMARY:Dr. Frank-N-Furter | Test Event", self.fetch(url).text)
+
+        def change():
+            self.casting.role = Casting.RIFF
+            self.casting.save()
+
+        response = self.assert_conditional(url, change)
+        self.assertIn("SUMMARY:Riff Raff | Test Event", response.text)
+        response = self.assert_conditional(url, self.casting.delete)
+        self.assertNotIn("VEVENT", response.text)
+
+    def test_folding(self):
+        """Tests long lines are folded without splitting characters"""
+        line = content_line("DESCRIPTION", "é" * 100)
+        parts = line[:-2].split("\r\n ")
+        self.assertTrue(all(len(part.encode()) <= 75 for part in parts))
+        self.assertEqual("".join(parts), "DESCRIPTION:" + "é" * 100)
@@ -2,11 +2,13 @@ from django.urls import path
 from .views import (
     CastingListCreate,
     CastingRetrieveUpdateDestroy,
+    EventHistory,
     EventRetrieveUpdateDestroy,
 )
 
 urlpatterns = [
     path("<int:pk>", EventRetrieveUpdateDestroy.as_view(), name="event"),
+    path("history", EventHistory.as_view(), name="event-history"),
     path("<int:pk>/castings", CastingListCreate.as_view(), name="castings"),
     path("castings/<int:pk>", CastingRetrieveUpdateDestroy.as_view(), name="casting"),
 ]
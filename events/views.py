@@ -2,26 +2,109 @@
 Event API Views
 """
 
+# stdlib
+from datetime import datetime, time
+
 # django
+from django.conf import settings
+from django.core.cache import cache
 from django.shortcuts import get_object_or_404
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
 
 # library
-from rest_framework import generics
-from rest_framework.exceptions import ValidationError
+from rest_framework import generics, permissions, views
+from rest_framework.exceptions import ParseError, ValidationError
+from rest_framework.pagination import LimitOffsetPagination
+from rest_framework.response import Response
 
 # app
 from casts.models import Cast
 from casts.permissions import IsManagerOrReadOnly
+from rrc.conditional import ConditionalRetrieveMixin
+from rrc.pagination import OptionalCursorPagination
 from users.models import Profile
-from .models import Event, Casting
-from .serializers import CastingSerializer, EventSerializer
+from .models import (
+    Casting,
+    Event,
+    calendar_cache_key,
+    casting_history,
+    event_history,
+    get_upcoming_events,
+)
+from .serializers import CastingSerializer, EventHistorySerializer, EventSerializer
+
+
+def parse_time_param(params: "QueryDict", key: str) -> datetime:
+    """
+    Returns an aware datetime from an ISO date or datetime query param or None
+
+    Dates are taken as midnight in the current time zone
+    """
+    value = params.get(key)
+    if not value:
+        return None
+    try:
+        parsed = parse_datetime(value)
+        if parsed is None:
+            date = parse_date(value)
+            if date is not None:
+                parsed = datetime.combine(date, time())
+    except ValueError:
+        parsed = None
+    if parsed is None:
+        raise ParseError(f"'{key}' must be an ISO date or datetime")
+    if timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed)
+    return parsed
+
+
+class EventPagination(OptionalCursorPagination):
+    """Cursor pagination for events by start time"""
+
+    ordering = ("start", "pk")
+
+
+class EventFilterMixin:
+    """
+    Filters events by query params
+
+    "from" and "to" limit the start time to a window, where "to" is exclusive.
+    "cast" takes a comma-separated list of cast ids and "venue" matches part of
+    the venue name. Windows are read with a range scan of the start or (cast,
+    start) index.
+    """
+
+    def get_filters(self) -> dict:
+        """
+        Returns the event filter kwargs for the request's query params
+        """
+        params = self.request.query_params
+        filters = {}
+        start, end = parse_time_param(params, "from"), parse_time_param(params, "to")
+        if start is not None:
+            filters["start__gte"] = start
+        if end is not None:
+            filters["start__lt"] = end
+        if params.get("cast"):
+            try:
+                casts = [int(pk) for pk in params["cast"].split(",")]
+            except ValueError:
+                raise ParseError("'cast' must be a comma-separated list of ids")
+            filters["cast__in"] = casts
+        if params.get("venue"):
+            filters["venue__icontains"] = params["venue"]
+        return filters
+
+    def get_queryset(self):
+        return Event.objects.filter(**self.get_filters())
 
 
-class EventListCreate(generics.ListCreateAPIView):
+class EventListCreate(EventFilterMixin, generics.ListCreateAPIView):
     """List available events or create a new one"""
 
-    queryset = Event.objects.all()
     serializer_class = EventSerializer
+    pagination_class = EventPagination
     permission_classes = (IsManagerOrReadOnly,)
 
     def perform_create(self, serializer):
@@ -30,7 +113,9 @@ class EventListCreate(generics.ListCreateAPIView):
         serializer.save(cast=cast)
 
 
-class EventRetrieveUpdateDestroy(generics.RetrieveUpdateDestroyAPIView):
+class EventRetrieveUpdateDestroy(
+    ConditionalRetrieveMixin, generics.RetrieveUpdateDestroyAPIView
+):
     """Retrieve, update, or delete an event"""
 
     queryset = Event.objects.all()
@@ -45,6 +130,83 @@ class EventRetrieveUpdateDestroy(generics.RetrieveUpdateDestroyAPIView):
         serializer.save()
 
 
+class EventHistoryPagination(LimitOffsetPagination):
+    """Offset pagination since a cursor can't filter the combined tables"""
+
+    default_limit = 50
+    max_limit = 200
+
+
+class EventHistory(EventFilterMixin, generics.ListAPIView):
+    """
+    List past and archived events with their castings, newest first
+
+    Takes the same filters as the event list. Upcoming events are only
+    included if the client passes an explicit 'to' bound
+    """
+
+    serializer_class = EventHistorySerializer
+    pagination_class = EventHistoryPagination
+    permission_classes = (permissions.AllowAny,)
+
+    def get_queryset(self):
+        filters = self.get_filters()
+        filters.setdefault("start__lt", timezone.now())
+        return event_history(**filters).order_by("-start", "-id")
+
+    def paginate_queryset(self, queryset) -> [Event]:
+        events = super().paginate_queryset(queryset)
+        castings = {}
+        history = casting_history(event__in=[event.pk for event in events])
+        for casting in history.order_by("role", "id"):
+            castings.setdefault(casting.event_id, []).append(casting)
+        for event in events:
+            event.history_castings = castings.get(event.pk, [])
+        return events
+
+
+class Calendar(views.APIView):
+    """
+    Upcoming events keyed by their date in the cast's time zone
+
+    Takes "days" and "limit" query params and an optional "cast" id. Responses
+    are cached until an event in the window changes.
+    """
+
+    permission_classes = (permissions.AllowAny,)
+
+    @staticmethod
+    def get_int_param(params: "QueryDict", key: str, default: int, maximum: int):
+        """
+        Returns a positive integer query param up to a maximum
+        """
+        try:
+            value = int(params.get(key, default))
+        except ValueError:
+            raise ParseError(f"'{key}' must be an integer")
+        if not 0 < value <= maximum:
+            raise ParseError(f"'{key}' must be between 1 and {maximum}")
+        return value
+
+    def get(self, request) -> Response:
+        params = request.query_params
+        days = self.get_int_param(params, "days", 14, settings.CALENDAR_MAX_DAYS)
+        limit = self.get_int_param(params, "limit", 12, 100)
+        cast = None
+        if "cast" in params:
+            cast = self.get_int_param(params, "cast", None, 2 ** 31 - 1)
+        key = calendar_cache_key(days, limit, cast)
+        data = cache.get(key)
+        if data is None:
+            calendar = get_upcoming_events(days, limit, cast)
+            data = {
+                day: EventSerializer(events, many=True).data
+                for day, events in calendar.items()
+            }
+            cache.set(key, data, settings.CALENDAR_CACHE_SECONDS)
+        return Response(data)
+
+
 class CastingListCreate(generics.ListCreateAPIView):
     """List available events or create a new one"""
 
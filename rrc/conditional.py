@@ -0,0 +1,64 @@
+"""
+Conditional GET support for API detail views
+"""
+
+# stdlib
+from calendar import timegm
+from datetime import datetime
+
+# django
+from django.http import Http404
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
+
+
+class ConditionalRetrieveMixin:
+    """
+    Adds ETag and Last-Modified validators to a retrieve view
+
+    Conditional requests are answered with a 304 from a single version lookup
+    before the object is loaded or serialized
+    """
+
+    version_field = "modified"
+
+    def get_lookup(self) -> dict:
+        """
+        Returns the filter kwargs for the requested object
+        """
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        return {self.lookup_field: self.kwargs[lookup_url_kwarg]}
+
+    def get_version_queryset(self) -> "QuerySet":
+        """
+        Returns a queryset filtered to the requested object without prefetches
+        """
+        return self.get_queryset().prefetch_related(None).filter(**self.get_lookup())
+
+    def get_last_modified(self) -> datetime:
+        """
+        Returns the requested object's version timestamp or None if not found
+        """
+        versions = self.get_version_queryset()
+        return versions.values_list(self.version_field, flat=True).first()
+
+    def get_etag(self, last_modified: datetime) -> str:
+        """
+        Returns a strong ETag for the object version and serialized shape
+        """
+        name = self.get_serializer_class().__name__
+        return f'"{name}-{last_modified.timestamp()}"'
+
+    def retrieve(self, request, *args, **kwargs):
+        modified = self.get_last_modified()
+        if modified is None:
+            raise Http404
+        etag = self.get_etag(modified)
+        timestamp = timegm(modified.utctimetuple())
+        response = get_conditional_response(request, etag=etag, last_modified=timestamp)
+        if response is None:
+            response = super().retrieve(request, *args, **kwargs)
+        response["ETag"] = etag
+        response["Last-Modified"] = http_date(timestamp)
+        patch_cache_control(response, no_cache=True)
+        return response
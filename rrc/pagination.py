@@ -0,0 +1,39 @@
+"""
+API pagination styles
+"""
+
+from rest_framework.pagination import CursorPagination, LimitOffsetPagination
+
+
+class OptionalCursorPagination(CursorPagination):
+    """
+    Opaque cursor pagination only applied when a cursor or page size is given
+
+    Pages are positioned by a filter on the ordering key instead of an OFFSET,
+    so every page costs the same to fetch. The ordering should be unique and
+    indexed to keep positions stable.
+    """
+
+    page_size = 25
+    page_size_query_param = "page_size"
+    max_page_size = 100
+
+    def paginate_queryset(self, queryset, request, view=None):
+        params = request.query_params
+        if not (
+            self.cursor_query_param in params or self.page_size_query_param in params
+        ):
+            return None
+        return super().paginate_queryset(queryset, request, view)
+
+
+class RankedPagination(LimitOffsetPagination):
+    """
+    Limit and offset pagination for results ordered by relevance
+
+    Relevance isn't a stable key to position a cursor on, and ranked results
+    are rarely read past the first few pages
+    """
+
+    default_limit = 20
+    max_limit = 100
@@ -44,7 +44,6 @@ INSTALLED_APPS = [
     # Third-Party
     "storages",
     "sorl.thumbnail",
-    "django_cleanup.apps.CleanupConfig",
     "corsheaders",
     "rest_framework",
     "rest_framework.authtoken",
@@ -58,6 +57,8 @@ INSTALLED_APPS = [
     # Apps
     "casts",
     "events",
+    "assets.apps.AssetsConfig",
+    "search",
     "login",
     "users",
 ]
@@ -110,13 +111,67 @@ if config("ENABLE_S3_ASSETS", default=False, cast=bool):
     AWS_ACCESS_KEY_ID = config("AWS_ACCESS_KEY")
     AWS_SECRET_ACCESS_KEY = config("AWS_SECRET_KEY")
     AWS_STORAGE_BUCKET_NAME = config("AWS_ASSET_BUCKET")
-    AWS_S3_OBJECT_PARAMETERS = {"CacheControl": "max-age=86400"}
+    # Media files are named from their content so they never change
+    AWS_S3_OBJECT_PARAMETERS = {"CacheControl": "public, max-age=31536000, immutable"}
     DEFAULT_FILE_STORAGE = "rrc.storage_backends.MediaStorage"
     AWS_DEFAULT_ACL = None
 else:
     MEDIA_URL = "/media/"
     MEDIA_ROOT = BASE_DIR / "media"
 
+# Background tasks
+
+TASK_WORKERS = config("TASK_WORKERS", default=4, cast=int)
+TASK_PROCESSES = config("TASK_PROCESSES", default=2, cast=int)
+TASKS_ALWAYS_EAGER = False
+
+# Replaced and deleted files are queued and only deleted once queued for
+# FILE_DELETION_GRACE_SECONDS, longer than any transaction reusing the file.
+# A background run is scheduled after each deletion. Queued names left by a
+# stopped process are deleted by the process_deletions command.
+FILE_DELETION_GRACE_SECONDS = 300
+
+# Image uploads are rejected while streaming if the file is over
+# UPLOAD_MAX_BYTES or its header shows another format or too many pixels
+UPLOAD_MAX_BYTES = config("UPLOAD_MAX_BYTES", default=20 * 1024 * 1024, cast=int)
+UPLOAD_MAX_PIXELS = config("UPLOAD_MAX_PIXELS", default=50_000_000, cast=int)
+UPLOAD_IMAGE_FORMATS = ("JPEG", "PNG", "WEBP", "GIF")
+UPLOAD_HEADER_BYTES = 256 * 1024
+UPLOAD_FORM_BYTES = 64 * 1024
+
+# Chunked uploads accept parts up to UPLOAD_PART_BYTES and are purged if left
+# unfinished for UPLOAD_EXPIRY_HOURS
+UPLOAD_PART_BYTES = config("UPLOAD_PART_BYTES", default=1024 * 1024, cast=int)
+UPLOAD_EXPIRY_HOURS = 24
+# Seconds a presigned URL for a direct upload to S3 is valid
+UPLOAD_URL_EXPIRY = 3600
+
+# Uploaded photos are re-encoded to fit within INGEST_MAX_DIMENSION pixels.
+# Originals are copied to INGEST_ORIGINALS_STORAGE if set, otherwise discarded
+INGEST_MAX_DIMENSION = config("INGEST_MAX_DIMENSION", default=2048, cast=int)
+INGEST_JPEG_QUALITY = 85
+INGEST_WEBP_QUALITY = 80
+INGEST_ORIGINALS_STORAGE = config("INGEST_ORIGINALS_STORAGE", default="")
+# Photos whose perceptual hashes differ by this many bits or fewer are flagged
+# as duplicates of an earlier photo in the same gallery
+PHOTO_DUPLICATE_DISTANCE = 4
+
+# Thumbnail sizes generated after upload as name: (geometry, options)
+THUMBNAIL_SIZES = {
+    "small": ("150x150", {"crop": "center"}),
+    "medium": ("600x600", {}),
+    "large": ("1200x1200", {}),
+}
+
+# Calendars cover up to CALENDAR_MAX_DAYS and are cached until an event in
+# their window changes, or for CALENDAR_CACHE_SECONDS as time moves on
+CALENDAR_MAX_DAYS = 62
+CALENDAR_CACHE_SECONDS = 300
+
+# Events that started over EVENT_ARCHIVE_DAYS ago are moved to archive tables
+# read only by history views. Both tables are purged of expired events.
+EVENT_ARCHIVE_DAYS = config("EVENT_ARCHIVE_DAYS", default=180, cast=int)
+
 ROOT_URLCONF = "rrc.urls"
 
 TEMPLATES = [
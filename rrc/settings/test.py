@@ -7,3 +7,6 @@ from rrc.settings.dev import *
 MEDIA_ROOT = BASE_DIR / "test-media"
 
 REST_FRAMEWORK["TEST_REQUEST_DEFAULT_FORMAT"] = "json"
+
+TASKS_ALWAYS_EAGER = True
+FILE_DELETION_GRACE_SECONDS = 0
@@ -2,21 +2,68 @@
 File storage config
 """
 
-from django_cleanup.signals import cleanup_pre_delete
 from storages.backends.s3boto3 import S3Boto3Storage
 
 
+# Request headers matching the object parameters signed into a presigned PUT
+PUT_HEADERS = {
+    "ACL": "x-amz-acl",
+    "CacheControl": "Cache-Control",
+    "ContentEncoding": "Content-Encoding",
+    "ContentType": "Content-Type",
+    "StorageClass": "x-amz-storage-class",
+}
+
+
 class MediaStorage(S3Boto3Storage):
     location = "media"
 
+    def presigned_put(self, name: str, expire: int) -> (str, {str: str}):
+        """
+        Returns a URL and the headers a client sends to PUT a file directly to S3
 
-def sorl_delete(**kwargs):
-    """
-    Function to delete thumbnails when deleting the original photo
-    """
-    from sorl.thumbnail import delete
+        The file gets the same object parameters as one saved through Django
+        """
+        params = {
+            key: value
+            for key, value in self._get_write_parameters(name).items()
+            if key in PUT_HEADERS
+        }
+        url = self.bucket.meta.client.generate_presigned_url(
+            "put_object",
+            Params={
+                "Bucket": self.bucket.name,
+                "Key": self._normalize_name(self._clean_name(name)),
+                **params,
+            },
+            ExpiresIn=expire,
+        )
+        return url, {PUT_HEADERS[key]: value for key, value in params.items()}
 
-    delete(kwargs["file"])
+    def delete_many(self, names: [str]):
+        """
+        Deletes files with one request per thousand names
+        """
+        keys = [{"Key": self._normalize_name(self._clean_name(name))} for name in names]
+        for start in range(0, len(keys), 1000):
+            self.bucket.delete_objects(
+                Delete={"Objects": keys[start : start + 1000], "Quiet": True}
+            )
 
+    def read_head(self, name: str, length: int) -> bytes:
+        """
+        Returns the first bytes of a file without downloading all of it
+        """
+        key = self._normalize_name(self._clean_name(name))
+        response = self.bucket.Object(key).get(Range=f"bytes=0-{length - 1}")
+        return response["Body"].read()
+
+
+class OriginalsStorage(S3Boto3Storage):
+    """
+    Infrequent access storage for uploaded originals replaced during ingest
+    """
 
-cleanup_pre_delete.connect(sorl_delete)
+    location = "originals"
+    default_acl = "private"
+    object_parameters = {"StorageClass": "STANDARD_IA"}
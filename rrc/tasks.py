@@ -0,0 +1,118 @@
+"""
+Background task execution off the request path
+"""
+
+# stdlib
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+# django
+from django.conf import settings
+from django.db import connections, transaction
+
+logger = logging.getLogger(__name__)
+
+_EXECUTOR = None
+_PROCESS_EXECUTOR = None
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """
+    Returns the shared background worker pool
+    """
+    global _EXECUTOR  # pylint: disable=W0603
+    if _EXECUTOR is None:
+        _EXECUTOR = ThreadPoolExecutor(
+            max_workers=getattr(settings, "TASK_WORKERS", 4),
+            thread_name_prefix="rrc-task",
+        )
+    return _EXECUTOR
+
+
+def _setup_process():
+    """
+    Configures Django in a new worker process
+    """
+    import django  # pylint: disable=C0415
+
+    django.setup()
+
+
+def get_process_executor() -> ProcessPoolExecutor:
+    """
+    Returns the shared worker process pool for CPU-bound tasks
+
+    Workers are spawned rather than forked so they never inherit the parent's
+    threads or open database connections
+    """
+    global _PROCESS_EXECUTOR  # pylint: disable=W0603
+    if _PROCESS_EXECUTOR is None:
+        _PROCESS_EXECUTOR = ProcessPoolExecutor(
+            max_workers=getattr(settings, "TASK_PROCESSES", 2),
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_setup_process,
+        )
+    return _PROCESS_EXECUTOR
+
+
+def _run(func, args: tuple, kwargs: dict):
+    """
+    Runs a task and releases the worker's database connections
+    """
+    try:
+        func(*args, **kwargs)
+    except Exception:  # pylint: disable=W0703
+        logger.exception("Background task %s failed", func.__name__)
+    finally:
+        connections.close_all()
+
+
+def defer(func, *args, **kwargs):
+    """
+    Runs a function in a background worker after the current transaction commits
+
+    Tasks run immediately in the caller when TASKS_ALWAYS_EAGER is set
+    """
+    if getattr(settings, "TASKS_ALWAYS_EAGER", False):
+        func(*args, **kwargs)
+        return
+    transaction.on_commit(lambda: get_executor().submit(_run, func, args, kwargs))
+
+
+def defer_later(delay: float, func, *args, **kwargs):
+    """
+    Runs a function in a background worker a number of seconds after the
+    current transaction commits
+
+    Tasks run immediately in the caller when TASKS_ALWAYS_EAGER is set
+    """
+    if getattr(settings, "TASKS_ALWAYS_EAGER", False):
+        func(*args, **kwargs)
+        return
+
+    def start():
+        timer = threading.Timer(
+            delay, get_executor().submit, (_run, func, args, kwargs)
+        )
+        timer.daemon = True
+        timer.start()
+
+    transaction.on_commit(start)
+
+
+def defer_process(func, *args, **kwargs):
+    """
+    Runs a module-level function in a worker process after the current
+    transaction commits
+
+    Use for CPU-bound work like image processing. Arguments must be picklable.
+    Tasks run immediately in the caller when TASKS_ALWAYS_EAGER is set
+    """
+    if getattr(settings, "TASKS_ALWAYS_EAGER", False):
+        func(*args, **kwargs)
+        return
+    transaction.on_commit(
+        lambda: get_process_executor().submit(_run, func, args, kwargs)
+    )
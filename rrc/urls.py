@@ -23,7 +23,8 @@ import rest_framework_jwt.views as jwt_views
 
 # app
 from casts.views import CastListCreate
-from events.views import EventListCreate
+from events.views import Calendar, EventListCreate
+from search.views import Search
 
 urlpatterns = [
     path("admin", admin.site.urls),
@@ -37,6 +38,8 @@ urlpatterns = [
     path("casts/", include("casts.urls")),
     path("events", EventListCreate.as_view(), name="events"),
     path("events/", include("events.urls")),
+    path("calendar", Calendar.as_view(), name="calendar"),
+    path("search", Search.as_view(), name="search"),
 ]
 
 if settings.MEDIA_URL:
@@ -0,0 +1,123 @@
+from django.db import migrations
+
+# The FTS5 index reads its text from the entry table and is kept in sync with
+# it by triggers
+SQLITE_CREATE = (
+    """
+    CREATE VIRTUAL TABLE search_index USING fts5(
+        title, body,
+        content='search_searchentry',
+        content_rowid='id',
+        tokenize='porter unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    CREATE TRIGGER search_index_insert AFTER INSERT ON search_searchentry BEGIN
+        INSERT INTO search_index(rowid, title, body)
+        VALUES (new.id, new.title, new.body);
+    END
+    """,
+    """
+    CREATE TRIGGER search_index_delete AFTER DELETE ON search_searchentry BEGIN
+        INSERT INTO search_index(search_index, rowid, title, body)
+        VALUES ('delete', old.id, old.title, old.body);
+    END
+    """,
+    """
+    CREATE TRIGGER search_index_update AFTER UPDATE ON search_searchentry BEGIN
+        INSERT INTO search_index(search_index, rowid, title, body)
+        VALUES ('delete', old.id, old.title, old.body);
+        INSERT INTO search_index(rowid, title, body)
+        VALUES (new.id, new.title, new.body);
+    END
+    """,
+)
+
+SQLITE_DROP = (
+    "DROP TRIGGER search_index_update",
+    "DROP TRIGGER search_index_delete",
+    "DROP TRIGGER search_index_insert",
+    "DROP TABLE search_index",
+)
+
+# Requires Postgres 12 for generated columns
+POSTGRES_CREATE = (
+    """
+    ALTER TABLE search_searchentry ADD COLUMN vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', title), 'A') ||
+        setweight(to_tsvector('english', body), 'B')
+    ) STORED
+    """,
+    "CREATE INDEX search_searchentry_vector ON search_searchentry USING GIN (vector)",
+)
+
+POSTGRES_DROP = ("ALTER TABLE search_searchentry DROP COLUMN vector",)
+
+
+def run_sql(schema_editor, statements: {str: (str,)}):
+    """
+    Runs the statements for the current database backend
+    """
+    for statement in statements.get(schema_editor.connection.vendor, ()):
+        schema_editor.execute(statement)
+
+
+def create_index(apps, schema_editor):
+    """
+    Creates the full-text index and adds every existing object to it
+    """
+    run_sql(schema_editor, {"sqlite": SQLITE_CREATE, "postgresql": POSTGRES_CREATE})
+    Cast = apps.get_model("casts", "Cast")
+    PageSection = apps.get_model("casts", "PageSection")
+    Event = apps.get_model("events", "Event")
+    SearchEntry = apps.get_model("search", "SearchEntry")
+    casts = Cast.objects.filter(deleted__isnull=True)
+    entries = [
+        SearchEntry(
+            kind="cast",
+            object_id=cast.pk,
+            cast_id=cast.pk,
+            title=cast.name,
+            body=cast.description,
+        )
+        for cast in casts.iterator()
+    ]
+    entries += [
+        SearchEntry(
+            kind="section",
+            object_id=section.pk,
+            cast_id=section.cast_id,
+            title=section.title[:256],
+            body=section.text,
+        )
+        for section in PageSection.objects.filter(cast__in=casts).iterator()
+    ]
+    entries += [
+        SearchEntry(
+            kind="event",
+            object_id=event.pk,
+            cast_id=event.cast_id,
+            title=event.name,
+            body=f"{event.venue}\n{event.description}",
+        )
+        for event in Event.objects.filter(cast__in=casts).iterator()
+    ]
+    SearchEntry.objects.bulk_create(entries, batch_size=500)
+
+
+def drop_index(apps, schema_editor):
+    """
+    Removes the full-text index
+    """
+    run_sql(schema_editor, {"sqlite": SQLITE_DROP, "postgresql": POSTGRES_DROP})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("search", "0001_initial"),
+        ("events", "0002_event_modified"),
+    ]
+
+    operations = [migrations.RunPython(create_index, drop_index)]
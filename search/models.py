@@ -0,0 +1,171 @@
+"""
+Full-text search index over casts, page sections, and events
+"""
+
+# stdlib
+import re
+from functools import reduce
+from operator import and_
+
+# django
+from django.db import connection, models
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+# app
+from casts.models import Cast, PageSection
+from events.models import Event, events_purged
+
+# Title matches rank above body matches
+TITLE_WEIGHT = 10.0
+
+
+def parse_terms(text: str) -> [str]:
+    """
+    Returns the words in a search query, dropping any query syntax
+    """
+    return re.findall(r"\w+", text.lower())
+
+
+class SearchEntryQuerySet(models.QuerySet):
+    """
+    Search entry queryset with backend-specific full-text matching
+    """
+
+    def search(self, text: str) -> "SearchEntryQuerySet":
+        """
+        Returns the entries matching every word in a query, best first
+
+        The last word also matches as a prefix. Matching uses the FTS5 index
+        on SQLite and the tsvector column on Postgres. Other databases have no
+        full-text index, so words are matched anywhere in the title or body
+        and title matches rank first. Entries of deleted casts are left out.
+        """
+        terms = parse_terms(text)
+        if not terms:
+            return self.none()
+        query = self.filter(cast__deleted__isnull=True)
+        if connection.vendor == "postgresql":
+            match = " & ".join(terms[:-1] + [f"{terms[-1]}:*"])
+            vector = "search_searchentry.vector"
+            tsquery = "to_tsquery('english', %s)"
+            query = query.extra(
+                select={"rank": f"ts_rank({vector}, {tsquery})"},
+                select_params=[match],
+                where=[f"{vector} @@ {tsquery}"],
+                params=[match],
+            )
+        elif connection.vendor == "sqlite":
+            match = " ".join(f'"{term}"' for term in terms) + "*"
+            query = query.extra(
+                select={"rank": f"-bm25(search_index, {TITLE_WEIGHT}, 1.0)"},
+                tables=["search_index"],
+                where=[
+                    "search_index.rowid = search_searchentry.id",
+                    "search_index MATCH %s",
+                ],
+                params=[match],
+            )
+        else:
+            for term in terms:
+                query = query.filter(
+                    models.Q(title__icontains=term) | models.Q(body__icontains=term)
+                )
+            in_title = reduce(and_, (models.Q(title__icontains=term) for term in terms))
+            query = query.annotate(
+                rank=models.Case(
+                    models.When(in_title, then=models.Value(TITLE_WEIGHT)),
+                    default=models.Value(1.0),
+                    output_field=models.FloatField(),
+                )
+            )
+        return query.order_by("-rank", "pk")
+
+
+class SearchEntry(models.Model):
+    """
+    The searchable text of an object
+
+    The full-text index is kept in sync with this table by the database
+    """
+
+    CAST = "cast"
+    SECTION = "section"
+    EVENT = "event"
+
+    KINDS = ((CAST, "Cast"), (SECTION, "Page Section"), (EVENT, "Event"))
+
+    kind = models.CharField(max_length=16, choices=KINDS)
+    object_id = models.PositiveIntegerField()
+    cast = models.ForeignKey(Cast, on_delete=models.CASCADE, related_name="+")
+    title = models.CharField(max_length=256)
+    body = models.TextField(blank=True)
+
+    objects = SearchEntryQuerySet.as_manager()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["kind", "object_id"], name="unique_search_entry"
+            )
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.get_kind_display()} | {self.title}"
+
+
+# Entry kind, indexed fields, and a function returning the cast, title, and body
+INDEXED_MODELS = {
+    Cast: (
+        SearchEntry.CAST,
+        {"name", "description"},
+        lambda obj: (obj.pk, obj.name, obj.description),
+    ),
+    PageSection: (
+        SearchEntry.SECTION,
+        {"title", "text"},
+        lambda obj: (obj.cast_id, obj.title, obj.text),
+    ),
+    Event: (
+        SearchEntry.EVENT,
+        {"name", "venue", "description"},
+        lambda obj: (obj.cast_id, obj.name, f"{obj.venue}\n{obj.description}"),
+    ),
+}
+
+
+@receiver(post_save, sender=Cast)
+@receiver(post_save, sender=PageSection)
+@receiver(post_save, sender=Event)
+def update_entry(sender, instance, update_fields=None, **kwargs):
+    """
+    Adds or updates an object's search entry when its indexed text may change
+    """
+    kind, fields, values = INDEXED_MODELS[sender]
+    if update_fields is not None and not fields & set(update_fields):
+        return
+    cast_id, title, body = values(instance)
+    SearchEntry.objects.update_or_create(
+        kind=kind,
+        object_id=instance.pk,
+        defaults={"cast_id": cast_id, "title": title[:256], "body": body},
+    )
+
+
+@receiver(post_delete, sender=Cast)
+@receiver(post_delete, sender=PageSection)
+@receiver(post_delete, sender=Event)
+def delete_entry(sender, instance, **kwargs):
+    """
+    Removes a deleted object's search entry
+    """
+    kind = INDEXED_MODELS[sender][0]
+    SearchEntry.objects.filter(kind=kind, object_id=instance.pk).delete()
+
+
+@receiver(events_purged, sender=Event)
+def delete_event_entries(sender, pks, **kwargs):
+    """
+    Removes the search entries of events deleted in bulk
+    """
+    SearchEntry.objects.filter(kind=SearchEntry.EVENT, object_id__in=pks).delete()
@@ -0,0 +1,19 @@
+"""
+"""
+
+from rest_framework.serializers import FloatField, IntegerField, ModelSerializer
+from .models import SearchEntry
+
+
+class SearchEntrySerializer(ModelSerializer):
+    """
+    A serializer for search results, identified by kind and object id
+    """
+
+    id = IntegerField(source="object_id", read_only=True)
+    rank = FloatField(read_only=True)
+
+    class Meta:
+        model = SearchEntry
+        fields = ("kind", "id", "cast", "title", "rank")
+        read_only_fields = fields
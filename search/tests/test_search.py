@@ -0,0 +1,100 @@
+# stdlib
+from unittest.mock import patch
+
+# django
+from django.db import connection
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+# library
+from rest_framework import status
+from rest_framework.test import APIClient
+
+# app
+from casts.models import Cast, PageSection
+from events.models import Event
+from ..models import SearchEntry
+
+
+class SearchTestCase(TestCase):
+    """
+    Tests the full-text search index and API
+    """
+
+    def setUp(self):
+        self.client = APIClient()
+        self.cast = Cast.objects.create(
+            name="Midnight Madness", description="Shadow cast in Springfield"
+        )
+        self.other = Cast.objects.create(
+            name="Transylvanians", description="Madness takes its toll"
+        )
+        self.section = PageSection.objects.create(
+            cast=self.cast, title="Auditions", text="Auditions are held monthly"
+        )
+        self.event = Event.objects.create(
+            name="Halloween Show",
+            description="Costume contest before the film",
+            venue="Springfield Theater",
+            start=timezone.now(),
+            cast=self.other,
+        )
+
+    def search(self, **params) -> [(str, int)]:
+        """Returns the kind and id of each search result"""
+        response = self.client.get(reverse("search"), params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [(item["kind"], item["id"]) for item in response.data["results"]]
+
+    def test_search(self):
+        """Tests every indexed model is matched and ranked"""
+        self.assertEqual(self.search(q="audition"), [("section", self.section.pk)])
+        # Title matches rank first
+        self.assertEqual(
+            self.search(q="madness"), [("cast", self.cast.pk), ("cast", self.other.pk)],
+        )
+        self.assertEqual(
+            self.search(q="springfield", kind="event"), [("event", self.event.pk)]
+        )
+        # Every word must match and the last also matches as a prefix
+        self.assertEqual(self.search(q="springfield the"), [("event", self.event.pk)])
+        self.assertEqual(self.search(q='"madness OR'), [])
+        self.assertEqual(self.search(q="?!"), [])
+
+    def test_fallback(self):
+        """Tests databases without a full-text index match substrings"""
+        with patch.object(connection, "vendor", "mysql"):
+            self.assertEqual(
+                self.search(q="madness"),
+                [("cast", self.cast.pk), ("cast", self.other.pk)],
+            )
+            self.assertEqual(
+                self.search(q="springfield theater"), [("event", self.event.pk)]
+            )
+
+    def test_sync(self):
+        """Tests the index follows saves and deletes"""
+        self.event.venue = "Riverside Cinema"
+        self.event.save()
+        self.assertEqual(self.search(q="springfield", kind="event"), [])
+        self.assertEqual(self.search(q="riverside"), [("event", self.event.pk)])
+        self.section.delete()
+        self.assertEqual(self.search(q="auditions"), [])
+        self.cast.soft_delete()
+        self.assertEqual(self.search(q="midnight"), [])
+        self.assertFalse(SearchEntry.objects.filter(cast=self.cast.pk).exists())
+
+    def test_paginated(self):
+        """Tests results are paginated"""
+        for i in range(3):
+            Cast.objects.create(name=f"Madness {i}")
+        response = self.client.get(reverse("search"), {"q": "madness", "limit": 2})
+        self.assertEqual(response.data["count"], 5)
+        self.assertEqual(len(response.data["results"]), 2)
+        self.assertIsNotNone(response.data["next"])
+
+    def test_missing_query(self):
+        """Tests a query is required"""
+        response = self.client.get(reverse("search"))
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
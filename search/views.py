@@ -0,0 +1,34 @@
+"""
+Search API Views
+"""
+
+# library
+from rest_framework import generics, permissions
+from rest_framework.exceptions import ParseError
+
+# app
+from rrc.pagination import RankedPagination
+from .models import SearchEntry
+from .serializers import SearchEntrySerializer
+
+
+class Search(generics.ListAPIView):
+    """
+    Search casts, page sections, and events by the words in a "q" query param
+
+    Results are limited to some kinds of objects with a comma-separated "kind"
+    query param
+    """
+
+    serializer_class = SearchEntrySerializer
+    pagination_class = RankedPagination
+    permission_classes = (permissions.AllowAny,)
+
+    def get_queryset(self):
+        params = self.request.query_params
+        if "q" not in params:
+            raise ParseError("A 'q' query param is required")
+        query = SearchEntry.objects.search(params["q"])
+        if "kind" in params:
+            query = query.filter(kind__in=params["kind"].split(","))
+        return query
@@ -0,0 +1,17 @@
+# Generated by Django 3.0.14 on 2026-10-18 01:26
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [("users", "0005_auto_20190408_0023")]
+
+    operations = [
+        migrations.AddField(
+            model_name="profile",
+            name="modified",
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 3.0.14 on 2026-10-18 01:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [("users", "0006_profile_modified")]
+
+    operations = [
+        migrations.AddField(
+            model_name="profile",
+            name="image_thumbnails",
+            field=models.TextField(blank=True, editable=False),
+        ),
+        migrations.AddField(
+            model_name="userphoto",
+            name="image_thumbnails",
+            field=models.TextField(blank=True, editable=False),
+        ),
+    ]
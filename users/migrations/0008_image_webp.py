@@ -0,0 +1,19 @@
+# Generated by Django 3.0.14 on 2026-10-18 01:40
+
+from django.db import migrations
+import sorl.thumbnail.fields
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [("users", "0007_image_thumbnails")]
+
+    operations = [
+        migrations.AddField(
+            model_name="userphoto",
+            name="image_webp",
+            field=sorl.thumbnail.fields.ImageField(
+                blank=True, editable=False, upload_to=""
+            ),
+        ),
+    ]
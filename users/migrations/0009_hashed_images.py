@@ -0,0 +1,32 @@
+# Generated by Django 3.0.14 on 2026-10-18 01:54
+
+import assets.fields
+from django.db import migrations
+import users.models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [("users", "0008_image_webp")]
+
+    operations = [
+        migrations.AlterField(
+            model_name="profile",
+            name="image",
+            field=assets.fields.HashedImageField(
+                blank=True, upload_to=users.models.profile_image
+            ),
+        ),
+        migrations.AlterField(
+            model_name="userphoto",
+            name="image",
+            field=assets.fields.HashedImageField(upload_to=users.models.user_photo),
+        ),
+        migrations.AlterField(
+            model_name="userphoto",
+            name="image_webp",
+            field=assets.fields.HashedImageField(
+                blank=True, editable=False, upload_to=users.models.user_photo
+            ),
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 3.0.14 on 2026-10-18 01:56
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [("users", "0009_hashed_images")]
+
+    operations = [
+        migrations.AddField(
+            model_name="userphoto",
+            name="duplicate_of",
+            field=models.ForeignKey(
+                editable=False,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="duplicates",
+                to="users.UserPhoto",
+            ),
+        ),
+        migrations.AddField(
+            model_name="userphoto",
+            name="image_hash",
+            field=models.BigIntegerField(editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name="userphoto",
+            index=models.Index(
+                fields=["profile", "image_hash"], name="users_userp_profile_eae929_idx"
+            ),
+        ),
+    ]
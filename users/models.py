@@ -8,24 +8,26 @@ from datetime import date
 # django
 from django.db import models
 from django.contrib.auth.models import User
-from django.db.models.signals import post_save
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 from django.utils import timezone
-from sorl.thumbnail import ImageField
+from assets.fields import HashedImageField, fan_out
+from assets.ingest import queue_ingest
+from assets.thumbnails import queue_thumbnails
 
 
 def profile_image(instance, filename: str) -> str:
     """
-    Generate user profile photo filename from username
+    Generate user profile photo filename from username and content hash
     """
-    return f"users/{instance.user.username}/profile_image.{filename.split('.')[-1]}"
+    return f"users/{instance.user.username}/profile_image/{filename}"
 
 
 def user_photo(instance, filename: str) -> str:
     """
-    Generate user photo filename from username
+    Generate user photo filename from username and content hash
     """
-    return f"users/{instance.profile.user.username}/photos/{filename}"
+    return f"users/{instance.profile.user.username}/photos/{fan_out(filename)}"
 
 
 def age(born: date) -> int:
@@ -47,7 +49,8 @@ class Profile(models.Model):
     # facebook_id = models.CharField(max_length=200, blank=True, unique=True)
 
     # Public Profile
-    image = ImageField(blank=True, upload_to=profile_image)
+    image = HashedImageField(blank=True, upload_to=profile_image)
+    image_thumbnails = models.TextField(blank=True, editable=False)
     name = models.CharField(max_length=128, blank=True)
     alt = models.CharField(max_length=128, blank=True)
     bio = models.TextField(max_length=500, blank=True)
@@ -66,6 +69,7 @@ class Profile(models.Model):
     # Config
     email_confirmed = models.BooleanField(default=False)
     birth_date = models.DateField(null=True, blank=True)
+    modified = models.DateTimeField(default=timezone.now)
 
     @property
     def display_name(self) -> str:
@@ -81,6 +85,10 @@ class Profile(models.Model):
         """
         return age(self.birth_date)
 
+    def save(self, *args, **kwargs):
+        self.modified = timezone.now()
+        super().save(*args, **kwargs)
+
     def __str__(self) -> str:
         return self.name
 
@@ -106,9 +114,48 @@ class UserPhoto(models.Model):
     profile = models.ForeignKey(
         Profile, on_delete=models.CASCADE, related_name="photos"
     )
-    image = ImageField(upload_to=user_photo)
+    image = HashedImageField(upload_to=user_photo)
+    image_webp = HashedImageField(blank=True, editable=False, upload_to=user_photo)
+    image_thumbnails = models.TextField(blank=True, editable=False)
+    image_hash = models.BigIntegerField(null=True, editable=False)
+    duplicate_of = models.ForeignKey(
+        "self",
+        null=True,
+        editable=False,
+        on_delete=models.SET_NULL,
+        related_name="duplicates",
+    )
     description = models.TextField(blank=True)
     created = models.DateTimeField(default=timezone.now, editable=False)
 
+    # Near-duplicates are looked for among photos of the same profile
+    DUPLICATE_SCOPE = "profile"
+
     class Meta:
         ordering = ["-pk"]
+        indexes = [models.Index(fields=["profile", "image_hash"])]
+
+
+@receiver(post_save, sender=UserPhoto)
+@receiver(post_delete, sender=UserPhoto)
+def touch_profile(sender, instance, **kwargs):
+    """
+    Bumps the owning profile's modified time when its photos change
+    """
+    Profile.objects.filter(pk=instance.profile_id).update(modified=timezone.now())
+
+
+@receiver(post_save, sender=Profile)
+def generate_image_thumbnails(sender, instance, **kwargs):
+    """
+    Queues thumbnail generation for a new or changed profile image
+    """
+    queue_thumbnails(instance, "image")
+
+
+@receiver(post_save, sender=UserPhoto)
+def ingest_photo(sender, instance, **kwargs):
+    """
+    Queues a new user photo for ingest and thumbnail generation
+    """
+    queue_ingest(instance, "image")
@@ -5,6 +5,7 @@ Serializers to convert API data to and from the database
 from django.contrib.auth.hashers import make_password
 from django.contrib.auth.models import User
 from rest_framework.serializers import ModelSerializer
+from assets.serializers import ThumbnailsField
 from .models import Profile, UserPhoto
 
 
@@ -42,6 +43,8 @@ class ProfileSerializer(ModelSerializer):
     A serializer for the users.Profile model
     """
 
+    thumbnails = ThumbnailsField(source="image")
+
     class Meta:
         model = Profile
         fields = (
@@ -52,6 +55,7 @@ class ProfileSerializer(ModelSerializer):
             "display_name",
             "age",
             "image",
+            "thumbnails",
             "bio",
             "location",
             "external_url",
@@ -72,6 +76,8 @@ class PublicProfileSerializer(ModelSerializer):
     A serializer for a user's public profile
     """
 
+    thumbnails = ThumbnailsField(source="image")
+
     class Meta:
         model = Profile
         fields = (
@@ -79,6 +85,7 @@ class PublicProfileSerializer(ModelSerializer):
             "display_name",
             "age",
             "image",
+            "thumbnails",
             "bio",
             "location",
             "external_url",
@@ -94,7 +101,25 @@ class UserPhotoSerializer(ModelSerializer):
     A serializer for the users.UserPhoto model
     """
 
+    thumbnails = ThumbnailsField(source="image")
+
     class Meta:
         model = UserPhoto
-        fields = ("id", "profile", "image", "description", "created")
-        read_only_fields = ("id", "profile", "image", "created")
+        fields = (
+            "id",
+            "profile",
+            "image",
+            "image_webp",
+            "thumbnails",
+            "duplicate_of",
+            "description",
+            "created",
+        )
+        read_only_fields = (
+            "id",
+            "profile",
+            "image",
+            "image_webp",
+            "duplicate_of",
+            "created",
+        )
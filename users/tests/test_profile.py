@@ -72,6 +72,18 @@ class ProfileAPITestCase(TestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertNotIn("show_email", response.data)
 
+    def test_conditional_retrieve(self):
+        """Tests profile validators differ for owners and other users"""
+        url = reverse("profile", kwargs={"pk": self.profile1.pk})
+        etag = self.client.get(url)["ETag"]
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        other = reverse("profile", kwargs={"pk": self.profile2.pk})
+        self.assertNotEqual(self.client.get(other)["ETag"], etag)
+        self.client.patch(url, data={"bio": "This is a test"})
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
     def test_update(self):
         """"Tests that a user can update their own profile but not others"""
         self.assertEqual(self.profile1.bio, "")
@@ -98,9 +98,9 @@ class UserPhotoAPITestCase(TestCase):
             )
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
         photo = UserPhoto.objects.get(pk=response.data["id"])
-        fname = tmpim.name.split("/")[-1]
-        self.assertIn(fname, photo.image.path)
-        self.assertIn(self.profile1.user.username, photo.image.path)
+        self.assertRegex(
+            photo.image.name, r"^users/test/photos/(\w\w)/(\w\w)/\1\2\w{28}\.jpg$"
+        )
 
     def test_forbidden_create(self):
         """Prohibit creating photos for other users"""
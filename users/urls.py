@@ -1,4 +1,5 @@
 from django.urls import path
+from events.feeds import ProfileCastingFeed
 from .views import (
     UserList,
     UserCreate,
@@ -6,6 +7,8 @@ from .views import (
     ProfileList,
     ProfileRetrieveUpdate,
     UserPhotoListCreate,
+    UserPhotoUploadCreate,
+    UserPhotoUpload,
     UserPhotoRetrieveUpdateDestroy,
 )
 
@@ -15,9 +18,24 @@ urlpatterns = [
     path("<int:pk>", UserRetrieveUpdateDestroy.as_view(), name="user"),
     path("profiles", ProfileList.as_view(), name="profiles"),
     path("profiles/<int:pk>", ProfileRetrieveUpdate.as_view(), name="profile"),
+    path(
+        "profiles/<int:pk>/castings.ics",
+        ProfileCastingFeed.as_view(),
+        name="profile-feed",
+    ),
     path(
         "profiles/<int:pk>/photos", UserPhotoListCreate.as_view(), name="profile-photos"
     ),
+    path(
+        "profiles/<int:pk>/photos/uploads",
+        UserPhotoUploadCreate.as_view(),
+        name="profile-photo-uploads",
+    ),
+    path(
+        "profiles/<int:pk>/photos/uploads/<uuid:upload>",
+        UserPhotoUpload.as_view(),
+        name="profile-photo-upload",
+    ),
     path(
         "photos/<int:pk>",
         UserPhotoRetrieveUpdateDestroy.as_view(),
@@ -3,8 +3,12 @@ User API Views
 """
 
 from django.contrib.auth.models import User
+from django.shortcuts import get_object_or_404
 from rest_framework import generics, permissions
 from rest_framework.exceptions import ParseError, PermissionDenied
+from assets.uploads import ImageUploadMixin
+from assets.views import UploadCreateView, UploadView
+from rrc.conditional import ConditionalRetrieveMixin
 from .permissions import IsOwnerOrReadOnly, IsUser
 from .models import Profile, UserPhoto
 from .serializers import (
@@ -55,7 +59,9 @@ class ProfileList(generics.ListAPIView):
     permission_classes = (permissions.IsAuthenticated,)
 
 
-class ProfileRetrieveUpdate(generics.RetrieveUpdateAPIView):
+class ProfileRetrieveUpdate(
+    ImageUploadMixin, ConditionalRetrieveMixin, generics.RetrieveUpdateAPIView
+):
     """Retrieve a user profile or update its information"""
 
     queryset = Profile.objects.all()
@@ -67,7 +73,7 @@ class ProfileRetrieveUpdate(generics.RetrieveUpdateAPIView):
         return PublicProfileSerializer
 
 
-class UserPhotoListCreate(generics.ListCreateAPIView):
+class UserPhotoListCreate(ImageUploadMixin, generics.ListCreateAPIView):
     """List all user photos or create a new one"""
 
     serializer_class = UserPhotoSerializer
@@ -87,6 +93,39 @@ class UserPhotoListCreate(generics.ListCreateAPIView):
         serializer.save(image=image, profile=profile)
 
 
+class UserPhotoUploadMixin:
+    """Creates user photos from chunked uploads"""
+
+    kind = "user-photo"
+    permission_classes = (IsUser,)
+
+    def get_target(self) -> Profile:
+        profile = get_object_or_404(Profile, pk=self.kwargs["pk"])
+        if profile.user != self.request.user:
+            raise PermissionDenied()
+        return profile
+
+    def get_upload_name(self, target: Profile, filename: str) -> str:
+        photo = UserPhoto(profile=target)
+        return photo.image.field.generate_filename(photo, filename)
+
+    def create_object(self, target: Profile, image: "File") -> dict:
+        serializer = UserPhotoSerializer(
+            data=self.request.data, context={"request": self.request, "view": self}
+        )
+        serializer.is_valid(raise_exception=True)
+        serializer.save(image=image, profile=target)
+        return serializer.data
+
+
+class UserPhotoUploadCreate(UserPhotoUploadMixin, UploadCreateView):
+    """Start a chunked user photo upload"""
+
+
+class UserPhotoUpload(UserPhotoUploadMixin, UploadView):
+    """Continue, finish, or cancel a chunked user photo upload"""
+
+
 class UserPhotoRetrieveUpdateDestroy(generics.RetrieveUpdateDestroyAPIView):
     """Retrieve, update, or delete a user photo"""
 